@@ -0,0 +1,133 @@
+# audio_player.py
+"""
+Cooperative MP3 player for asyncio (CircuitPython's asyncio library on the board,
+the standard library on a computer).
+
+Tracks are queued by file name and played one after another through a single
+MP3Decoder. While a track plays, the next file is opened (the directory lookup is
+done ahead), and the player awaits between polls instead of spinning, so display
+updates and other tasks keep running. Playback is not gapless: the next track starts
+at the first poll after the current one ends, once the decoder has read its header,
+so expect a short pause of up to poll_interval plus that read between tracks. Each
+file is closed once the decoder has moved on from it. Given a spi_arbiter bus
+client, file opens take the shared bus through it.
+
+    player = AudioPlayer(audio, "/sd/robot_sounds/", on_tick=update_screen)
+    player.enqueue("0.mp3", "1.mp3", "2.mp3")
+    asyncio.run(player.play())
+"""
+import asyncio
+import time
+from audiomp3 import MP3Decoder
+
+
+class AudioPlayer:
+    """Plays a queue of MP3 files from `directory` on an AudioOut / PWMAudioOut"""
+
+    def __init__(self, audio, directory="", poll_interval=0.02, on_tick=None, on_track=None, decoder_buffer=None,
+                 bus=None):
+        self.audio = audio
+        self.bus = bus
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.on_tick = on_tick  # on_tick(player) every poll while a track plays
+        self.on_track = on_track  # on_track(name) when a track starts, on_track(None) when the queue is done
+        self.queue = []
+        self.decoder = None
+        self.decoder_buffer = decoder_buffer
+        self.current = None  # (name, file) playing
+        self.track_started = 0.0
+        self.played = 0
+        self.errors = 0
+        self._next = None  # (name, file) opened ahead
+        self._stopped = False
+
+    def enqueue(self, *names):
+        self.queue.extend(names)
+
+    @property
+    def elapsed(self):
+        """Seconds into the current track"""
+        return time.monotonic() - self.track_started if self.current else 0.0
+
+    def _open_next(self):
+        """Open the next queued file; skips files that fail to open"""
+        while self._next is None and self.queue:
+            name = self.queue.pop(0)
+            try:
+                file = open(self.directory + name, "rb")
+            except OSError as e:
+                print(f"❌ Could not open {name}:", e)
+                self.errors += 1
+                continue
+            self._next = (name, file)
+
+    def _close_current(self):
+        if self.current is not None:
+            self.current[1].close()
+            self.current = None
+
+    def _start_next(self):
+        """Start the track opened ahead (or the next queued one); returns False when nothing is left"""
+        while True:
+            self._open_next()
+            if self._next is None:
+                self._close_current()
+                return False
+            name, file = self._next
+            self._next = None
+            try:
+                if self.decoder is None:
+                    self.decoder = MP3Decoder(file, self.decoder_buffer) if self.decoder_buffer else MP3Decoder(file)
+                else:
+                    self.decoder.file = file
+            except Exception as e:
+                print(f"❌ Error playing {name}:", e)
+                file.close()
+                self.errors += 1
+                continue
+            # The decoder has let go of the previous file now
+            self._close_current()
+            self.current = (name, file)
+            self.audio.play(self.decoder)
+            self.track_started = time.monotonic()
+            print(f"🎵 Playing {name}")
+            if self.on_track:
+                self.on_track(name)
+            return True
+
+    async def _on_bus(self, function):
+        """function() while holding the bus client, if the player has one"""
+        if self.bus is None:
+            return function()
+        async with self.bus:
+            return function()
+
+    async def play(self):
+        """Play until the queue is empty (or stop() is called), yielding to other tasks between polls"""
+        self._stopped = False
+        try:
+            while not self._stopped and await self._on_bus(self._start_next):
+                await self._on_bus(self._open_next)  # open the next file while this track plays
+                while self.audio.playing and not self._stopped:
+                    if self.on_tick:
+                        self.on_tick(self)
+                    await asyncio.sleep(self.poll_interval)
+                if not self._stopped:
+                    self.played += 1
+        finally:
+            self.close()
+        if self.on_track:
+            self.on_track(None)
+
+    def stop(self):
+        """Stop playback; play() returns at its next poll"""
+        self._stopped = True
+        self.audio.stop()
+
+    def close(self):
+        """Close every file the player holds"""
+        self._close_current()
+        if self._next is not None:
+            self._next[1].close()
+            self._next = None
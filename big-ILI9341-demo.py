@@ -3,14 +3,12 @@
 CircuitPython demo for ILI9341 320x240 display in landscape mode.
 Demonstrates fonts, icons, colors, turtle graphics, game-style animation, and image display.
 """
+from boot_timer import boot
 import board
 import busio
 import time
 import displayio, fourwire
 import pwmio
-import terminalio
-from adafruit_display_text import label
-from adafruit_bitmap_font import bitmap_font
 import adafruit_ili9341
 
 # --- Display Setup ---
@@ -22,107 +20,178 @@ backlight = pwmio.PWMOut(board.GP22, frequency=5000, duty_cycle=65535)
 
 display = adafruit_ili9341.ILI9341(display_bus, width=320, height=240, rotation=0, backlight_pin=None)
 print("✅ ILI9341 Display initialized (320x240 landscape)")
+boot.mark("display")
+
+# Fast boot: the splash, pre-rendered by tools/compile_screens.py, goes straight from flash
+# to the panel before the imports and fonts below are loaded (None waits for the first screen).
+# Copy scenes/ to the board and set this to "/scenes/splash.565" to use it.
+BOOT_SPLASH = None  # e.g. "/scenes/splash.565"
+if BOOT_SPLASH:
+    boot.splash(display, display_bus, BOOT_SPLASH)
+
+import terminalio
+from adafruit_display_text import label
+from gradient import gradient_tilegrid
+from text_cache import texts
+from primitives import shapes
+from refresh_profiler import RefreshProfiler
+from compositor import Compositor
+from demo_scheduler import DemoScheduler
+from heap_profiler import HeapProfiler
+from frame_stats import FrameStats
+import image_stream
+import icon_atlas
+import scene_file
+boot.mark("imports")
+
+# Records time, dirty area and SPI bytes of each screen's first refresh
+PROFILE_REFRESH = False  # True prints a per-demo bus summary after every cycle
+# Rendered static text persists here when the drive is writable (see text_cache.py)
+TEXT_BUNDLE = "/text_cache.bin"
+SAVE_TEXT_BUNDLE = False  # True writes the bundle after the first cycle
+# Static screens compiled by tools/compile_screens.py are loaded from here instead of built (None always builds)
+SCENE_DIR = "/scenes/"
+# Icon atlases made by tools/compile_icons.py draw each icon from one 1-bit sprite sheet (None uses the font)
+ICON_DIR = "/icons/"
+# True draws the turtle demo with turtle_batch (whole lines, one refresh per pattern), False with adafruit_turtle
+TURTLE_BATCHED = True
+# Heap the next screen may take while the current one is still shown (0 builds every screen when it starts)
+PRELOAD_BUDGET = 32 * 1024
+LOG_TRANSITIONS = True  # print first-frame latency and lowest free heap of every demo
+PROFILE_HEAP = False  # True prints heap use per demo and helper after every cycle
+profiler = RefreshProfiler(display, display_bus, capacity=128)
+# One retained root for every demo; refreshes are by hand and only send what changed
+compositor = Compositor(display, profiler)
+# Heap use of each demo and of the helpers below that build screens (calls straight through when off)
+heap = HeapProfiler(enabled=PROFILE_HEAP)
+gradient_tilegrid = heap.profile(gradient_tilegrid)
+texts.fonts.loader = heap.profile(texts.fonts.loader, "load_font")  # cache misses only, not every lookup
+# Runs the demos; run_demo() fills in the list
+scheduler = DemoScheduler([], budget_bytes=PRELOAD_BUDGET, log=LOG_TRANSITIONS, release=shapes.release)
+boot.mark("setup")
 
 
 # --- Helper Functions ---
+@heap.profile
 def create_gradient(group, start_color, end_color, height=240):
     """Create a vertical gradient background"""
-    for y in range(height):
-        strip_bitmap = displayio.Bitmap(320, 1, 1)
-        strip_palette = displayio.Palette(1)
-        ratio = y / height
-        r_start, g_start, b_start = (start_color >> 16) & 0xFF, (start_color >> 8) & 0xFF, start_color & 0xFF
-        r_end, g_end, b_end = (end_color >> 16) & 0xFF, (end_color >> 8) & 0xFF, end_color & 0xFF
-        r = int(r_start + (r_end - r_start) * ratio)
-        g = int(g_start + (g_end - g_start) * ratio)
-        b = int(b_start + (b_end - b_start) * ratio)
-        strip_palette[0] = (r << 16) | (g << 8) | b
-        group.append(displayio.TileGrid(strip_bitmap, pixel_shader=strip_palette, x=0, y=y))
-
-
-def load_fonts(font_list):
-    """Load fonts with simple error handling"""
-    fonts = {}
-    for font_name, font_path in font_list:
+    group.append(gradient_tilegrid(start_color, end_color, width=320, height=height))
+
+
+def present(group):
+    """Make group the compositor's screen, giving the pooled rects of the screen it replaces back"""
+    old = compositor.screen
+    compositor.present(group)
+    if old is not group:
+        shapes.release(old)
+    shapes.report(log=LOG_TRANSITIONS)
+
+
+def show(group, seconds):
+    """Put a finished screen on the display, refreshing it right away so it gets profiled"""
+    present(group)
+    compositor.refresh()
+    boot.finish("first screen")
+    scheduler.shown()
+    scheduler.idle(seconds)
+
+
+def show_screen(screen):
+    """show() a (group, seconds) screen from a build_* function; None shows nothing"""
+    if screen:
+        show(*screen)
+
+
+@heap.profile
+def text_label(font_path, text, color, scale=1, fallback_scale=None, **position):
+    """
+    Static text from the shared text cache. If the font cannot be loaded, the terminal
+    font at fallback_scale is used, or None is returned when no fallback_scale is given.
+    """
+    if font_path:
         try:
-            fonts[font_name] = bitmap_font.load_font(font_path)
-            print(f"✅ Loaded {font_name}")
-        except:
-            print(f"❌ Could not load {font_name}")
-            fonts[font_name] = None
-    return fonts
+            return texts.label(font_path, text, color=color, scale=scale, **position)
+        except Exception:
+            if fallback_scale is None:
+                return None
+    return texts.label(terminalio.FONT, text, color=color, scale=fallback_scale or scale, font_key="terminalio",
+                       **position)
+
+
+@heap.profile
+def load_scene(name):
+    """(group, seconds) of a screen's compiled scene, or None when the screen has to be built"""
+    if not SCENE_DIR:
+        return None
+    try:
+        return scene_file.load(f"{SCENE_DIR}{name}.scn", pool=shapes)
+    except OSError:
+        return None
+    except ValueError as e:  # truncated, or written by another version of scene_file: build the screen instead
+        print(f"❌ {name}.scn: {e}")
+        return None
 
 
 # --- Demo Functions ---
-def demo_splash_screen():
+@heap.profile
+def build_splash_screen():
+    """Specification splash screen: (group, seconds)"""
+    scene = load_scene("demo_splash_screen")
+    if scene:
+        return scene
+    group = displayio.Group()
+
+    # Black to gray gradient, one gray step every 4 rows
+    group.append(gradient_tilegrid(0x000000, 0x3B3B3B, bands=60))
+
+    # Title lines, rendered once and reused from the text cache on later cycles
+    for font_path, text, color, fallback_scale, y in (
+            ("/fonts/Collegiate-50.bdf", "ILI9341", 0xFFFF00, 3, 40),
+            ("/fonts/Collegiate-50.bdf", "2.2\" Display", 0xFFFF00, 3, 90),
+            ("/fonts/helvB18.bdf", "320 x 240 Resolution", 0x00FFFF, 2, 140),
+            ("/fonts/helvB18.bdf", "65K Colors & SPI Interface", 0xFFFFFF, 1, 180),
+            ("/fonts/helvB18.bdf", "CircuitPython", 0xFFFFFF, 1, 210)):
+        group.append(text_label(font_path, text, color, fallback_scale=fallback_scale, anchor_point=(0.5, 0.5),
+                                anchored_position=(160, y)))
+
+    return group, 1
+
+
+def demo_splash_screen(prepared=None):
     """Display specification splash screen"""
     print("🚀 Splash Screen")
-    group = displayio.Group()
+    show_screen(prepared or build_splash_screen())
 
-    # Black to gray gradient
-    for y in range(240):
-        strip_bitmap = displayio.Bitmap(320, 1, 1)
-        strip_palette = displayio.Palette(1)
-        gray_val = min(64, y // 4)
-        color = gray_val | (gray_val << 8) | (gray_val << 16)
-        strip_palette[0] = color
-        group.append(displayio.TileGrid(strip_bitmap, pixel_shader=strip_palette, x=0, y=y))
-
-    fonts = load_fonts([("Collegiate-50", "/fonts/Collegiate-50.bdf"), ("helvB18", "/fonts/helvB18.bdf")])
-
-    # Title lines
-    group.append(label.Label(fonts["Collegiate-50"] or terminalio.FONT, text="ILI9341", color=0xFFFF00,
-                             scale=1 if fonts["Collegiate-50"] else 3, anchor_point=(0.5, 0.5),
-                             anchored_position=(160, 40)))
-    group.append(label.Label(fonts["Collegiate-50"] or terminalio.FONT, text="2.2\" Display", color=0xFFFF00,
-                             scale=1 if fonts["Collegiate-50"] else 3, anchor_point=(0.5, 0.5),
-                             anchored_position=(160, 90)))
-    group.append(label.Label(fonts["helvB18"] or terminalio.FONT, text="320 x 240 Resolution", color=0x00FFFF,
-                             scale=1 if fonts["helvB18"] else 2, anchor_point=(0.5, 0.5), anchored_position=(160, 140)))
-    group.append(label.Label(fonts["helvB18"] or terminalio.FONT, text="65K Colors & SPI Interface", color=0xFFFFFF,
-                             scale=1 if fonts["helvB18"] else 1, anchor_point=(0.5, 0.5), anchored_position=(160, 180)))
-    group.append(label.Label(fonts["helvB18"] or terminalio.FONT, text="CircuitPython", color=0xFFFFFF,
-                             scale=1 if fonts["helvB18"] else 1, anchor_point=(0.5, 0.5), anchored_position=(160, 210)))
-
-    display.root_group = group
-    time.sleep(1)
-
-
-def demo_fonts_and_text():
-    """Demonstrate different font sizes and text styles"""
-    print("📝 Font Demo")
-    group = displayio.Group()
 
-    # Dark blue gradient background
-    for y in range(240):
-        strip_bitmap = displayio.Bitmap(320, 1, 1)
-        strip_palette = displayio.Palette(1)
-        strip_palette[0] = 0x000020 + (y // 8)
-        group.append(displayio.TileGrid(strip_bitmap, pixel_shader=strip_palette, x=0, y=y))
+@heap.profile
+def build_fonts_and_text():
+    """Font sizes and text styles: (group, seconds)"""
+    scene = load_scene("demo_fonts_and_text")
+    if scene:
+        return scene
+    group = displayio.Group()
 
-    fonts = load_fonts([
-        ("helvB24", "/fonts/helvB24.bdf"), ("Collegiate-50", "/fonts/Collegiate-50.bdf"),
-        ("helvB18", "/fonts/helvB18.bdf"), ("helvB14", "/fonts/helvB14.bdf"),
-        ("helvB12", "/fonts/helvB12.bdf"), ("helvB08", "/fonts/helvB08.bdf")
-    ])
+    # Dark blue gradient background, one blue step every 8 rows
+    group.append(gradient_tilegrid(0x000020, 0x00003D, bands=30))
 
     y_pos = 10
 
     # Title
-    group.append(label.Label(fonts["helvB24"] or terminalio.FONT, text="Font Showcase", color=0xFFFF00,
-                             scale=1 if fonts["helvB24"] else 3, anchor_point=(0.5, 0.0),
-                             anchored_position=(160, y_pos)))
-    y_pos += 35 if fonts["helvB24"] else 30
+    title = text_label("/fonts/helvB24.bdf", "Font Showcase", 0xFFFF00, anchor_point=(0.5, 0.0),
+                       anchored_position=(160, y_pos))
+    group.append(title or text_label(None, "Font Showcase", 0xFFFF00, scale=3, anchor_point=(0.5, 0.0),
+                                     anchored_position=(160, y_pos)))
+    y_pos += 35 if title else 30
 
     # Terminal font examples
-    group.append(label.Label(terminalio.FONT, text="Built-in Terminal Font", color=0x00FFFF, scale=1, x=10, y=y_pos))
+    group.append(text_label(None, "Built-in Terminal Font", 0x00FFFF, x=10, y=y_pos))
     y_pos += 18
-    group.append(label.Label(terminalio.FONT, text="Terminal x2 Scale", color=0x00FFFF, scale=2, x=10, y=y_pos))
+    group.append(text_label(None, "Terminal x2 Scale", 0x00FFFF, scale=2, x=10, y=y_pos))
     y_pos += 28
 
     # Custom fonts
-    if fonts["helvB24"]:
-        group.append(label.Label(fonts["helvB24"], text="helvB24", color=0xFFFFFF, x=10, y=y_pos))
+    if title:
+        group.append(text_label("/fonts/helvB24.bdf", "helvB24", 0xFFFFFF, x=10, y=y_pos))
         y_pos += 30
 
     font_demos = [("helvB18", 0xFFAAAA), ("helvB14", 0xFF8888), ("Collegiate-50", 0x88FF88), ("helvB12", 0xFFAAAA),
@@ -130,94 +199,129 @@ def demo_fonts_and_text():
 
     for font_key, color in font_demos:
         if font_key == "helvB14": y_pos += 5
-        if fonts[font_key] and y_pos < 180:
+        if y_pos < 180:
             label_y = y_pos + 3 if font_key == "Collegiate-50" else y_pos
-            group.append(label.Label(fonts[font_key], text=font_key, color=color, x=10, y=label_y))
-            y_pos += 50 if font_key == "Collegiate-50" else 22
+            sample = text_label(f"/fonts/{font_key}.bdf", font_key, color, x=10, y=label_y)
+            if sample:
+                group.append(sample)
+                y_pos += 50 if font_key == "Collegiate-50" else 22
 
     # Bottom info
-    if fonts["helvB12"]:
-        group.append(label.Label(fonts["helvB12"], text="320x240 • 65K Colors • SPI", color=0x00FF00,
-                                 anchor_point=(0.5, 0.0), anchored_position=(160, 215)))
+    info = text_label("/fonts/helvB12.bdf", "320x240 • 65K Colors • SPI", 0x00FF00, anchor_point=(0.5, 0.0),
+                      anchored_position=(160, 215))
+    if info:
+        group.append(info)
 
-    display.root_group = group
-    time.sleep(4)
+    return group, 4
 
 
-def demo_forkawesome_icons():
-    """ForkAwesome Icons showcase"""
-    print("🎨 ForkAwesome Icons Demo")
+def demo_fonts_and_text(prepared=None):
+    """Demonstrate different font sizes and text styles"""
+    print("📝 Font Demo")
+    show_screen(prepared or build_fonts_and_text())
+
+
+FORKAWESOME_ICONS = [
+    ("\uf193", 0xFF1493), ("\uf164", 0x32CD32), ("\uf062", 0x4169E1), ("\uf063", 0x4169E1),
+    ("\uf060", 0x4169E1), ("\uf061", 0x4169E1), ("\uf004", 0xFF0000), ("\uf35f", 0xFF69B4),
+    ("\uf1b9", 0xFF0000), ("\uf118", 0x9932CC), ("\uf005", 0xFFD700), ("\uf329", 0xFF8C00),
+    ("\uf0c2", 0x4682B4), ("\uf017", 0x8B4513), ("\uf001", 0xFF1493), ("\uf06c", 0x228B22)
+]
 
-    # Load ForkAwesome fonts
-    forkawesome_fonts = {}
+
+@heap.profile
+def load_icon_atlas():
+    """Largest ForkAwesome icon atlas available, or None"""
+    if not ICON_DIR:
+        return None
     for size in ["42", "32", "24"]:
         try:
-            forkawesome_fonts[size] = bitmap_font.load_font(f"/fonts/forkawesome-{size}.pcf")
-            print(f"✅ Loaded ForkAwesome-{size}")
-        except:
-            forkawesome_fonts[size] = None
+            return icon_atlas.load(f"{ICON_DIR}forkawesome-{size}.icn")
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+@heap.profile
+def build_forkawesome_icons():
+    """ForkAwesome icons showcase: (group, seconds), None without the icon fonts"""
+    scene = load_scene("demo_forkawesome_icons")
+    if scene:
+        return scene
+    icons = FORKAWESOME_ICONS
 
-    # Find the largest available font
+    # Icons from a sprite sheet when an icon atlas is there
+    atlas = load_icon_atlas()
+
+    # Otherwise the largest ForkAwesome font available; it is only loaded for icons not in the text cache
     icon_font = None
-    for size in ["42", "32", "24"]:
-        if forkawesome_fonts[size]:
-            icon_font = forkawesome_fonts[size]
+    if not atlas:
+        for size in ["42", "32", "24"]:
+            try:
+                texts.get(f"/fonts/forkawesome-{size}.pcf", icons[0][0])
+            except Exception:
+                continue
+            icon_font = f"/fonts/forkawesome-{size}.pcf"
             break
 
-    if not icon_font:
+    if not atlas and not icon_font:
         print("❌ No ForkAwesome fonts available, skipping")
-        return
+        return None
 
     group = displayio.Group()
 
     # White background
-    bg_bitmap = displayio.Bitmap(320, 240, 1)
-    bg_palette = displayio.Palette(1)
-    bg_palette[0] = 0xFFFFFF
-    group.append(displayio.TileGrid(bg_bitmap, pixel_shader=bg_palette))
-
-    group.append(label.Label(terminalio.FONT, text="ForkAwesome Icon Library", color=0xFF1493, scale=2,
-                             anchor_point=(0.5, 0.0), anchored_position=(160, 0)))
+    group.append(shapes.fill(0xFFFFFF))
 
-    icons = [
-        ("\uf193", 0xFF1493), ("\uf164", 0x32CD32), ("\uf062", 0x4169E1), ("\uf063", 0x4169E1),
-        ("\uf060", 0x4169E1), ("\uf061", 0x4169E1), ("\uf004", 0xFF0000), ("\uf35f", 0xFF69B4),
-        ("\uf1b9", 0xFF0000), ("\uf118", 0x9932CC), ("\uf005", 0xFFD700), ("\uf329", 0xFF8C00),
-        ("\uf0c2", 0x4682B4), ("\uf017", 0x8B4513), ("\uf001", 0xFF1493), ("\uf06c", 0x228B22)
-    ]
+    group.append(text_label(None, "ForkAwesome Icon Library", 0xFF1493, scale=2, anchor_point=(0.5, 0.0),
+                            anchored_position=(160, 0)))
 
     for i, (icon_char, color) in enumerate(icons):
         row, col = i // 4, i % 4
         x_pos = 20 + (col * 75)
         y_pos = 48 + (row * 47) + (6 * row if row > 0 else 0)
-        group.append(label.Label(icon_font, text=icon_char, color=color, x=x_pos, y=y_pos))
+        if atlas:
+            group.append(atlas.icon(icon_char, color, x=x_pos, y=y_pos))
+        else:
+            group.append(text_label(icon_font, icon_char, color, x=x_pos, y=y_pos))
 
-    display.root_group = group
-    time.sleep(4)
+    return group, 4
 
 
-def demo_color_bars():
-    """Display color bars"""
-    print("🌈 Color Test Pattern")
+def demo_forkawesome_icons(prepared=None):
+    """ForkAwesome Icons showcase"""
+    print("🎨 ForkAwesome Icons Demo")
+    show_screen(prepared or build_forkawesome_icons())
+
+
+@heap.profile
+def build_color_bars():
+    """Color bars test pattern: (group, seconds)"""
+    scene = load_scene("demo_color_bars")
+    if scene:
+        return scene
     group = displayio.Group()
 
     colors = [0xFF0000, 0xFF8000, 0xFFFF00, 0x80FF00, 0x00FF00, 0x00FF80,
               0x00FFFF, 0x0080FF, 0x0000FF, 0x8000FF, 0xFF00FF, 0xFF0080]
     bar_width = 320 // len(colors)
 
+    # The bars share one pooled bitmap, each with its color's palette
     for i, color in enumerate(colors):
-        bar_bitmap = displayio.Bitmap(bar_width, 180, 1)
-        bar_palette = displayio.Palette(1)
-        bar_palette[0] = color
-        group.append(displayio.TileGrid(bar_bitmap, pixel_shader=bar_palette, x=i * bar_width, y=30))
+        group.append(shapes.rect(i * bar_width, 30, bar_width, 180, color))
+
+    group.append(text_label(None, "65,536 Color Test Pattern", 0xFFFFFF, scale=2, anchor_point=(0.5, 0.0),
+                            anchored_position=(160, 5)))
+    group.append(text_label(None, "Smooth gradients and vibrant colors", 0xFFFFFF, anchor_point=(0.5, 0.0),
+                            anchored_position=(160, 220)))
 
-    group.append(label.Label(terminalio.FONT, text="65,536 Color Test Pattern", color=0xFFFFFF, scale=2,
-                             anchor_point=(0.5, 0.0), anchored_position=(160, 5)))
-    group.append(label.Label(terminalio.FONT, text="Smooth gradients and vibrant colors", color=0xFFFFFF, scale=1,
-                             anchor_point=(0.5, 0.0), anchored_position=(160, 220)))
+    return group, 4
 
-    display.root_group = group
-    time.sleep(4)
+
+def demo_color_bars(prepared=None):
+    """Display color bars"""
+    print("🌈 Color Test Pattern")
+    show_screen(prepared or build_color_bars())
 
 
 def demo_turtle_graphics():
@@ -225,7 +329,11 @@ def demo_turtle_graphics():
     print("🐢 Turtle Graphics Demo")
 
     try:
-        from adafruit_turtle import turtle, Color
+        if TURTLE_BATCHED:
+            from turtle_batch import BatchTurtle as turtle, Color
+        else:
+            from adafruit_turtle import turtle, Color
+            display.auto_refresh = True  # adafruit_turtle shows its drawing through auto refresh
 
         my_turtle = turtle(display)
         my_turtle.bgcolor(Color.BLACK)
@@ -234,37 +342,47 @@ def demo_turtle_graphics():
  
         colors = [Color.RED, Color.ORANGE, Color.YELLOW, Color.GREEN, Color.BLUE, Color.PURPLE, Color.PINK]
         patterns = [(0, 0, 50), (-80, -50, 30), (80, 50, 40), (0, -80, 25)]
+        # One frame per pattern, until it is on the panel: adafruit_turtle refreshes while it draws,
+        # so its "refresh" stage stays at 0; the batched turtle draws into the bitmap, then refreshes once
+        stats = FrameStats(("draw", "refresh"), window=len(patterns), label="turtle")
 
         for pattern_x, pattern_y, pattern_size in patterns:
             my_turtle.penup()
             my_turtle.goto(pattern_x, pattern_y)
             my_turtle.pendown()
+            stats.start()
 
+            draw_start = time.monotonic_ns()
             for i in range(21):
                 my_turtle.pencolor(colors[i % len(colors)])
                 for _ in range(6):
                     my_turtle.forward(pattern_size)
                     my_turtle.right(61)
                 my_turtle.right(11.1111)
+            refresh_start = time.monotonic_ns()
+            stats.add("draw", refresh_start - draw_start)
+            if TURTLE_BATCHED:
+                my_turtle.flush()
+            stats.add("refresh", time.monotonic_ns() - refresh_start)
+            stats.end_frame()
+            scheduler.shown()
             time.sleep(0.5)
+        display.auto_refresh = False  # both put their own root_group up; the next show() repaints
+        stats.report()
         # time.sleep(2)
 
     except ImportError:
         group = displayio.Group()
-        bg_bitmap = displayio.Bitmap(320, 240, 1)
-        bg_palette = displayio.Palette(1)
-        bg_palette[0] = 0x000000
-        group.append(displayio.TileGrid(bg_bitmap, pixel_shader=bg_palette))
-        group.append(label.Label(terminalio.FONT, text="Turtle Graphics Not Available", color=0xFFFF00, scale=2,
-                                 anchor_point=(0.5, 0.5), anchored_position=(160, 100)))
-        group.append(label.Label(terminalio.FONT, text="Install adafruit_turtle library", color=0xFFFFFF, scale=1,
-                                 anchor_point=(0.5, 0.5), anchored_position=(160, 130)))
-        display.root_group = group
-        time.sleep(2)
+        group.append(shapes.fill(0x000000))
+        group.append(text_label(None, "Turtle Graphics Not Available", 0xFFFF00, scale=2, anchor_point=(0.5, 0.5),
+                                anchored_position=(160, 100)))
+        group.append(text_label(None, "Install adafruit_turtle library", 0xFFFFFF, anchor_point=(0.5, 0.5),
+                                anchored_position=(160, 130)))
+        show(group, 2)
 
 
 def demo_pong_game():
-    """Classic Pong game demo"""
+    """Classic Pong game demo on a retained scene: objects are built once, then only moved"""
     print("🏓 Pong Game Demo")
 
     ball_x, ball_y = 160.0, 120.0
@@ -274,125 +392,174 @@ def demo_pong_game():
     paddle_speed = 5.0
     left_paddle_y, right_paddle_y = 100.0, 100.0
     score_left, score_right = 0, 0
+    total_steps = 80  # the original's 80 frames
+    step_time = 0.058  # fixed physics timestep: one original frame (a full-screen redraw), ~4.6 s of play
 
-    for frame in range(80):
-        group = displayio.Group()
+    # Scene, built once
+    group = displayio.Group()
 
-        # Black background
-        bg_bitmap = displayio.Bitmap(320, 240, 1)
-        bg_palette = displayio.Palette(1)
-        bg_palette[0] = 0x000000
-        group.append(displayio.TileGrid(bg_bitmap, pixel_shader=bg_palette))
-
-        # Center line
-        for i in range(0, 240, 40):
-            line_bitmap = displayio.Bitmap(2, 20, 1)
-            line_palette = displayio.Palette(1)
-            line_palette[0] = 0x888888
-            group.append(displayio.TileGrid(line_bitmap, pixel_shader=line_palette, x=159, y=i))
-
-        # Paddles
-        left_paddle_bitmap = displayio.Bitmap(paddle_width, paddle_height, 1)
-        left_paddle_palette = displayio.Palette(1)
-        left_paddle_palette[0] = 0xFFFFFF
-        group.append(
-            displayio.TileGrid(left_paddle_bitmap, pixel_shader=left_paddle_palette, x=10, y=int(left_paddle_y)))
-
-        right_paddle_bitmap = displayio.Bitmap(paddle_width, paddle_height, 1)
-        right_paddle_palette = displayio.Palette(1)
-        right_paddle_palette[0] = 0xFFFFFF
-        group.append(
-            displayio.TileGrid(right_paddle_bitmap, pixel_shader=right_paddle_palette, x=302, y=int(right_paddle_y)))
-
-        # Ball
-        ball_bitmap = displayio.Bitmap(ball_size, ball_size, 1)
-        ball_palette = displayio.Palette(1)
-        ball_palette[0] = 0xFFFF00
-        group.append(displayio.TileGrid(ball_bitmap, pixel_shader=ball_palette, x=int(ball_x), y=int(ball_y)))
-
-        # Score
-        group.append(
-            label.Label(terminalio.FONT, text=f"{score_left}    SMART PONG    {score_right}", color=0x00FF00, scale=1,
-                        anchor_point=(0.5, 0.0), anchored_position=(160, 10)))
-
-        display.root_group = group
-
-        # AI paddle movement
-        ball_center_y = ball_y + ball_size // 2
-        if ball_vel_x < 0:
-            left_paddle_center = left_paddle_y + paddle_height // 2
-            if ball_center_y > left_paddle_center + 8:
-                left_paddle_y += paddle_speed
-            elif ball_center_y < left_paddle_center - 8:
-                left_paddle_y -= paddle_speed
-        if ball_vel_x > 0:
-            right_paddle_center = right_paddle_y + paddle_height // 2
-            if ball_center_y > right_paddle_center + 8:
-                right_paddle_y += paddle_speed
-            elif ball_center_y < right_paddle_center - 8:
-                right_paddle_y -= paddle_speed
-
-        left_paddle_y = max(0, min(240 - paddle_height, left_paddle_y))
-        right_paddle_y = max(0, min(240 - paddle_height, right_paddle_y))
-
-        # Ball collision with paddles
-        if (ball_vel_x < 0 and ball_x <= 18 and ball_x >= 8 and
-                ball_y + ball_size >= left_paddle_y - 2 and ball_y <= left_paddle_y + paddle_height + 2):
-            ball_vel_x = abs(ball_vel_x) * 1.02
-            ball_x = 19
-            hit_pos = (ball_y + ball_size // 2 - left_paddle_y) / paddle_height
-            ball_vel_y += (hit_pos - 0.5) * 2
-
-        if (ball_vel_x > 0 and ball_x + ball_size >= 302 and ball_x + ball_size <= 312 and
-                ball_y + ball_size >= right_paddle_y - 2 and ball_y <= right_paddle_y + paddle_height + 2):
-            ball_vel_x = -abs(ball_vel_x) * 1.02
-            ball_x = 301 - ball_size
-            hit_pos = (ball_y + ball_size // 2 - right_paddle_y) / paddle_height
-            ball_vel_y += (hit_pos - 0.5) * 2
-
-        ball_x += ball_vel_x
-        ball_y += ball_vel_y
-
-        # Ball collision with walls
-        if ball_y <= 0 or ball_y >= 240 - ball_size:
-            ball_vel_y = -ball_vel_y
-            ball_y = max(0, min(240 - ball_size, ball_y))
-
-        ball_vel_y = max(-7, min(7, ball_vel_y))
-        ball_vel_x = max(-8, min(8, ball_vel_x))
-
-        # Scoring
-        if ball_x < -ball_size:
-            score_right += 1
-            ball_x, ball_y = 160, 120
-            ball_vel_x, ball_vel_y = 5.0, 4.0 if frame % 2 else -4.0
-        if ball_x > 320:
-            score_left += 1
-            ball_x, ball_y = 160, 120
-            ball_vel_x, ball_vel_y = -5.0, 4.0 if frame % 2 else -4.0
+    # Black background (pooled, so only the first screen of this size allocates it)
+    group.append(shapes.rect(0, 0, 320, 240, 0x000000))
+
+    # Center line: one 2x40 tile (20 px dash, 20 px gap) repeated 6 times down the screen
+    line_bitmap = displayio.Bitmap(2, 40, 2)
+    line_bitmap.fill(0)
+    for y in range(20):
+        line_bitmap[0, y] = line_bitmap[1, y] = 1
+    line_palette = displayio.Palette(2)
+    line_palette[0] = 0x000000
+    line_palette.make_transparent(0)
+    line_palette[1] = 0x888888
+    group.append(displayio.TileGrid(line_bitmap, pixel_shader=line_palette, width=1, height=6,
+                                    tile_width=2, tile_height=40, x=159, y=0))
+
+    # Paddles and ball are pooled rects; the two paddles share one bitmap and palette
+    left_paddle = shapes.rect(10, int(left_paddle_y), paddle_width, paddle_height, 0xFFFFFF)
+    right_paddle = shapes.rect(302, int(right_paddle_y), paddle_width, paddle_height, 0xFFFFFF)
+    group.append(left_paddle)
+    group.append(right_paddle)
+
+    ball = shapes.rect(int(ball_x), int(ball_y), ball_size, ball_size, 0xFFFF00)
+    group.append(ball)
+
+    score_label = label.Label(terminalio.FONT, text=f"{score_left}    SMART PONG    {score_right}", color=0x00FF00,
+                              scale=1, anchor_point=(0.5, 0.0), anchored_position=(160, 10))
+    group.append(score_label)
+
+    # Each frame the compositor only pushes the areas the moved objects dirtied
+    present(group)
+    compositor.refresh()
+    scheduler.shown()
+
+    stats = FrameStats(("physics", "render"), window=total_steps, label="pong")
+    step = 0
+    accumulator = 0.0
+    last_time = time.monotonic()
+    stats.start()
+
+    while step < total_steps:
+        now = time.monotonic()
+        accumulator += now - last_time
+        last_time = now
+        if accumulator < step_time:
+            time.sleep(step_time - accumulator)
+            continue
+
+        physics_start = time.monotonic_ns()
+        while accumulator >= step_time and step < total_steps:
+            accumulator -= step_time
+            frame = step
+            step += 1
+
+            # AI paddle movement
+            ball_center_y = ball_y + ball_size // 2
+            if ball_vel_x < 0:
+                left_paddle_center = left_paddle_y + paddle_height // 2
+                if ball_center_y > left_paddle_center + 8:
+                    left_paddle_y += paddle_speed
+                elif ball_center_y < left_paddle_center - 8:
+                    left_paddle_y -= paddle_speed
+            if ball_vel_x > 0:
+                right_paddle_center = right_paddle_y + paddle_height // 2
+                if ball_center_y > right_paddle_center + 8:
+                    right_paddle_y += paddle_speed
+                elif ball_center_y < right_paddle_center - 8:
+                    right_paddle_y -= paddle_speed
+
+            left_paddle_y = max(0, min(240 - paddle_height, left_paddle_y))
+            right_paddle_y = max(0, min(240 - paddle_height, right_paddle_y))
+
+            # Ball collision with paddles
+            if (ball_vel_x < 0 and ball_x <= 18 and ball_x >= 8 and
+                    ball_y + ball_size >= left_paddle_y - 2 and ball_y <= left_paddle_y + paddle_height + 2):
+                ball_vel_x = abs(ball_vel_x) * 1.02
+                ball_x = 19
+                hit_pos = (ball_y + ball_size // 2 - left_paddle_y) / paddle_height
+                ball_vel_y += (hit_pos - 0.5) * 2
+
+            if (ball_vel_x > 0 and ball_x + ball_size >= 302 and ball_x + ball_size <= 312 and
+                    ball_y + ball_size >= right_paddle_y - 2 and ball_y <= right_paddle_y + paddle_height + 2):
+                ball_vel_x = -abs(ball_vel_x) * 1.02
+                ball_x = 301 - ball_size
+                hit_pos = (ball_y + ball_size // 2 - right_paddle_y) / paddle_height
+                ball_vel_y += (hit_pos - 0.5) * 2
+
+            ball_x += ball_vel_x
+            ball_y += ball_vel_y
+
+            # Ball collision with walls
+            if ball_y <= 0 or ball_y >= 240 - ball_size:
+                ball_vel_y = -ball_vel_y
+                ball_y = max(0, min(240 - ball_size, ball_y))
+
+            ball_vel_y = max(-7, min(7, ball_vel_y))
+            ball_vel_x = max(-8, min(8, ball_vel_x))
+
+            # Scoring
+            if ball_x < -ball_size:
+                score_right += 1
+                ball_x, ball_y = 160, 120
+                ball_vel_x, ball_vel_y = 5.0, 4.0 if frame % 2 else -4.0
+            if ball_x > 320:
+                score_left += 1
+                ball_x, ball_y = 160, 120
+                ball_vel_x, ball_vel_y = -5.0, 4.0 if frame % 2 else -4.0
+
+        # Mutate the retained objects; only changed values are assigned so nothing else gets dirtied
+        render_start = time.monotonic_ns()
+        stats.add("physics", render_start - physics_start)
+        if left_paddle.y != int(left_paddle_y):
+            left_paddle.y = int(left_paddle_y)
+        if right_paddle.y != int(right_paddle_y):
+            right_paddle.y = int(right_paddle_y)
+        if ball.x != int(ball_x) or ball.y != int(ball_y):
+            ball.x, ball.y = int(ball_x), int(ball_y)
+        score_text = f"{score_left}    SMART PONG    {score_right}"
+        if score_label.text != score_text:
+            score_label.text = score_text
+        compositor.refresh()
+        stats.add("render", time.monotonic_ns() - render_start)
+        stats.end_frame()
+
+    stats.report()
 
 
 def demo_image_display():
-    """Display the campus image"""
+    """Display the campus image: stream /campus.565 if present, else show /campus.bmp through OnDiskBitmap"""
     print("🖼️ Image Display Demo")
 
+    try:
+        # Let go of the previous screen without drawing it again; the blit paints over it
+        present(displayio.Group())
+        stats = image_stream.blit(display, display_bus, "/campus.565", band_rows=8)
+    except OSError:
+        pass
+    except ValueError as e:
+        print(f"❌ /campus.565: {e}")
+    else:
+        profiler.record(profiler.label, stats["ms"], stats["width"] * stats["height"], stats["bus_bytes"],
+                        stats["commands"])
+        compositor.invalidate()  # the panel no longer shows what displayio last drew
+        scheduler.shown()
+        print(f"🖼️ /campus.565: streamed in {stats['ms']:.0f} ms with a {stats['buffer_bytes']} byte buffer")
+        scheduler.idle(5)
+        return
+
     try:
         campus_bitmap = displayio.OnDiskBitmap("/campus.bmp")
         group = displayio.Group()
         group.append(displayio.TileGrid(campus_bitmap, pixel_shader=campus_bitmap.pixel_shader))
-        display.root_group = group
-        time.sleep(5)
-    except:
+        show(group, 5)
+    except (OSError, ValueError):
         group = displayio.Group()
         create_gradient(group, 0x000080, 0xFF8000)
-        group.append(label.Label(terminalio.FONT, text="Image Not Found", color=0xFFFFFF, scale=3,
-                                 anchor_point=(0.5, 0.5), anchored_position=(160, 100)))
-        group.append(label.Label(terminalio.FONT, text="Convert image to 320x240 BMP", color=0xFFFFFF, scale=1,
-                                 anchor_point=(0.5, 0.5), anchored_position=(160, 130)))
-        group.append(label.Label(terminalio.FONT, text="Save as /campus.bmp", color=0xFFFFFF, scale=1,
-                                 anchor_point=(0.5, 0.5), anchored_position=(160, 150)))
-        display.root_group = group
-        time.sleep(4)
+        group.append(text_label(None, "Image Not Found", 0xFFFFFF, scale=3, anchor_point=(0.5, 0.5),
+                                anchored_position=(160, 100)))
+        group.append(text_label(None, "Convert image to 320x240 BMP", 0xFFFFFF, anchor_point=(0.5, 0.5),
+                                anchored_position=(160, 130)))
+        group.append(text_label(None, "Save as /campus.bmp", 0xFFFFFF, anchor_point=(0.5, 0.5),
+                                anchored_position=(160, 150)))
+        show(group, 4)
 
 
 # --- Main Demo Loop ---
@@ -400,15 +567,31 @@ def run_demo():
     """Run the complete demo sequence"""
     print("🚀 Starting ILI9341 Complete Display Demo")
 
-    demos = [demo_splash_screen, demo_fonts_and_text, demo_forkawesome_icons, demo_color_bars,
-             demo_turtle_graphics, demo_pong_game, demo_image_display]
-    demo_index = 0
+    # (run, prepare): static screens are built ahead while the previous demo is shown
+    scheduler.demos = [(demo_splash_screen, build_splash_screen), (demo_fonts_and_text, build_fonts_and_text),
+                       (demo_forkawesome_icons, build_forkawesome_icons), (demo_color_bars, build_color_bars),
+                       (demo_turtle_graphics, None), (demo_pong_game, None), (demo_image_display, None)]
+    try:
+        print(f"✅ Loaded {texts.load(TEXT_BUNDLE)} cached texts")
+    except OSError:
+        pass
 
     while True:
         try:
-            demos[demo_index]()
-            demo_index = (demo_index + 1) % len(demos)
-            time.sleep(1)
+            profiler.label = scheduler.name
+            with heap.measure(scheduler.name):
+                scheduler.run_next()
+            if scheduler.index == 0 and SAVE_TEXT_BUNDLE:
+                try:
+                    print(f"💾 Saved {texts.save(TEXT_BUNDLE)} cached texts to {TEXT_BUNDLE}")
+                except OSError as e:
+                    print(f"❌ Could not save {TEXT_BUNDLE} (is the drive writable?):", e)
+            if PROFILE_REFRESH and scheduler.index == 0:
+                profiler.print_summary()
+                print("🔤 Text cache:", texts.stats())
+            if PROFILE_HEAP and scheduler.index == 0:
+                heap.print_table()
+            scheduler.idle(1)
         except KeyboardInterrupt:
             print("Demo stopped")
             break
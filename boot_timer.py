@@ -0,0 +1,80 @@
+# boot_timer.py
+"""
+Boot phase timestamps, to track time-to-first-pixel.
+
+Import it first in code.py: its import is the earliest moment Python can time (the
+supervisor's start-up before code.py is not included). mark() stamps the end of a
+phase, splash() streams a pre-rendered raw RGB565 frame (image_stream.py) onto the
+panel and stamps the first pixel, and finish() stamps the last phase and prints the
+boot once, so the scripts can call it from their loops.
+
+    from boot_timer import boot
+    ...                                   # display setup only
+    boot.mark("display")
+    boot.splash(display, display_bus, "/scenes/splash.565")
+    ...                                   # heavy imports, fonts, the first screen
+    boot.finish("first screen")           # ⏱️ one line per phase
+
+Prints "⏱️ boot: display 212 ms, splash 318 ms (+106, first pixel), imports 1,405 ms (+1,087), ...".
+"""
+import time
+
+
+class BootTimer:
+    """Milliseconds from import to the end of each named boot phase"""
+
+    def __init__(self):
+        self.start_ns = time.monotonic_ns()
+        self.phases = []  # (name, ms since start)
+        self.first_pixel_ms = None
+        self.done = False
+
+    def mark(self, phase, first_pixel=False):
+        """Stamp the end of phase; first_pixel when it put the first pixels on the panel"""
+        if self.done:
+            return
+        ms = (time.monotonic_ns() - self.start_ns) / 1e6
+        self.phases.append((phase, ms))
+        if first_pixel and self.first_pixel_ms is None:
+            self.first_pixel_ms = ms
+
+    def splash(self, display, display_bus, path, phase="splash"):
+        """Stream a raw splash frame straight from flash onto the panel; False when there is none"""
+        import image_stream
+        try:
+            image_stream.blit(display, display_bus, path)
+        except (OSError, ValueError) as e:
+            print(f"⏱️ No boot splash {path}: {e}")
+            return False
+        self.mark(phase, first_pixel=True)
+        return True
+
+    def finish(self, phase, first_pixel=True, log=True):
+        """Stamp the last phase (the first screen counts as the first pixel if no splash did) and report once"""
+        if self.done:
+            return
+        self.mark(phase, first_pixel)
+        self.done = True
+        if log:
+            self.report()
+
+    def report(self):
+        parts = []
+        previous = 0
+        for name, ms in self.phases:
+            note = f"+{ms - previous:,.0f}" if parts else ""
+            if ms == self.first_pixel_ms:
+                note = f"{note}, first pixel" if note else "first pixel"
+            parts.append(f"{name} {ms:,.0f} ms" + (f" ({note})" if note else ""))
+            previous = ms
+        print("⏱️ boot: " + ", ".join(parts))
+
+    def stats(self):
+        """Phase times as a dict, handy for printing over serial"""
+        stats = {name: ms for name, ms in self.phases}
+        stats["first_pixel_ms"] = self.first_pixel_ms
+        return stats
+
+
+# Shared timer, started when code.py imports it
+boot = BootTimer()
@@ -0,0 +1,227 @@
+# camera_pipeline.py
+"""
+Camera-to-display pipeline for the OV5640 camera and an ILI9341 (or any displayio) display.
+
+Modes:
+  "single"  capture, mark the frame dirty, refresh: one step after the other (the original loop)
+  "double"  continuous capture into two frame buffers: the sensor fills one while the
+            other is sent over SPI. Needs RAM for two frames and a camera driver with
+            continuous_capture_*; otherwise it falls back to "single".
+  "diff"    capture into a second buffer, sample each tile against the frame on screen,
+            copy only the tiles that changed and refresh only those.
+
+Downscale by picking a smaller OV5640 size and a Group scale to fill the screen, and
+limit updates to part of the frame with crop=(x1, y1, x2, y2) (single and diff modes;
+double mode swaps whole buffers, so it always refreshes the full frame).
+Grayscale frames (OV5640_COLOR_GRAYSCALE, one byte per pixel) use colorspace=Colorspace.L8.
+With compositor=Compositor(display), the frame is presented in the compositor's root and
+each frame's area is refreshed through it instead of replacing display.root_group.
+With recorder=FrameRecorder(path) (frame_recorder.py), every frame shown is also appended
+to the recording (only the rows refreshed, in single and diff modes), and play(FramePlayer(path))
+shows a recording of the same frame size.
+With processor=FrameProcessor(stages) (frame_processing.py), every captured frame is
+processed in place before it is compared or refreshed.
+"""
+import time
+import displayio
+
+try:
+    import bitmaptools
+except ImportError:
+    bitmaptools = None
+
+
+def _green(value):
+    """6-bit green of a byte-swapped RGB565 pixel"""
+    return ((value & 0x07) << 3) | (value >> 13)
+
+
+def _luma(value):
+    """6-bit level of an L8 pixel, on the same scale as _green"""
+    return value >> 2
+
+
+class CameraPipeline:
+    def __init__(self, cam, display, mode="double", size=None, scale=1, crop=None, tile_size=(32, 24),
+                 samples=(4, 3), threshold=2, refresh=None,
+                 colorspace=displayio.Colorspace.RGB565_SWAPPED, allocator=None, compositor=None, recorder=None,
+                 processor=None):
+        if size is not None:
+            cam.size = size
+        self.cam = cam
+        self.display = display
+        self.width, self.height = cam.width, cam.height
+        self.crop = crop or (0, 0, self.width, self.height)
+        self.threshold = threshold
+        self.compositor = compositor
+        self.recorder = recorder
+        self.processor = processor
+        if refresh is None:
+            refresh = compositor.refresh if compositor else lambda area: display.refresh(minimum_frames_per_second=0)
+        self._refresh = refresh
+
+        allocator = allocator or displayio.Bitmap
+        gray = colorspace == displayio.Colorspace.L8
+        value_count = 256 if gray else 65535
+        self._level = _luma if gray else _green
+        self.front = allocator(self.width, self.height, value_count)
+        self.back = None
+        if mode == "double" and not hasattr(cam, "continuous_capture_start"):
+            print("Camera driver has no continuous capture, using single buffer")
+            mode = "single"
+        if mode in ("double", "diff"):
+            try:
+                self.back = allocator(self.width, self.height, value_count)
+            except MemoryError:
+                print(f"MemoryError: no room for a second {self.width}x{self.height} buffer, using single")
+                mode = "single"
+        self.mode = mode
+
+        self.scale = scale
+        self.group = displayio.Group(scale=scale, x=(display.width - self.width * scale) // 2,
+                                     y=(display.height - self.height * scale) // 2)
+        self.tilegrid = displayio.TileGrid(self.front,
+                                           pixel_shader=displayio.ColorConverter(input_colorspace=colorspace))
+        self.group.append(self.tilegrid)
+
+        self._tiles = self._build_tiles(tile_size, samples) if mode == "diff" else []
+        self.frames = 0
+        self.capture_ns = 0  # last frame's capture (or wait for frame) time
+        self.process_ns = 0  # last frame's processing time, if any
+        self.refresh_ns = 0  # last frame's diff + refresh time
+        self.record_ns = 0  # last frame's copy into the recorder and SD write, if any
+        self.dirty_tiles = 0
+        self.last_area = None
+        self._started = False
+
+    def _build_tiles(self, tile_size, samples):
+        """(x1, y1, x2, y2, sample points) for every tile inside the crop region"""
+        cx1, cy1, cx2, cy2 = self.crop
+        tile_w, tile_h = tile_size
+        tiles = []
+        for y1 in range(cy1, cy2, tile_h):
+            for x1 in range(cx1, cx2, tile_w):
+                x2, y2 = min(cx2, x1 + tile_w), min(cy2, y1 + tile_h)
+                points = [(x1 + (2 * i + 1) * (x2 - x1) // (2 * samples[0]),
+                           y1 + (2 * j + 1) * (y2 - y1) // (2 * samples[1]))
+                          for j in range(samples[1]) for i in range(samples[0])]
+                tiles.append((x1, y1, x2, y2, points))
+        return tiles
+
+    def screen_area(self, area):
+        """Frame rectangle to display coordinates"""
+        x1, y1, x2, y2 = area
+        s = self.scale
+        return (self.group.x + x1 * s, self.group.y + y1 * s, self.group.x + x2 * s, self.group.y + y2 * s)
+
+    def _present(self):
+        if self.compositor is not None:
+            self.compositor.present(self.group)
+        else:
+            self.display.auto_refresh = False
+            self.display.root_group = self.group
+
+    def start(self):
+        """Show the camera group and start capturing"""
+        self._present()
+        if self.mode == "double":
+            self.cam.continuous_capture_start(self.front, self.back)
+        self._started = True
+
+    def stop(self):
+        if self.mode == "double" and self._started:
+            self.cam.continuous_capture_stop()
+        self._started = False
+
+    def step(self):
+        """Capture and show one frame"""
+        if not self._started:
+            self.start()
+        t0 = time.monotonic_ns()
+        if self.mode == "double":
+            frame = self.cam.continuous_capture_get_frame()
+            t1 = time.monotonic_ns()
+            self._process(frame)
+            if self.tilegrid.bitmap is not frame:
+                self.tilegrid.bitmap = frame  # swapping marks the whole TileGrid dirty
+            else:
+                frame.dirty()
+            area = (0, 0, self.width, self.height)
+        elif self.mode == "diff":
+            self.cam.capture(self.back)
+            t1 = time.monotonic_ns()
+            self._process(self.back)
+            area = self._copy_changed_tiles()
+        else:
+            self.cam.capture(self.front)
+            t1 = time.monotonic_ns()
+            self._process(self.front)
+            self.front.dirty(*self.crop)
+            area = self.crop
+        self.last_area = self.screen_area(area) if area else None
+        self._refresh(self.last_area)
+        t2 = time.monotonic_ns()
+        self.capture_ns = t1 - t0
+        self.refresh_ns = t2 - t1 - self.process_ns
+        self.record_ns = 0
+        if self.recorder is not None:
+            if self.mode == "double":
+                self.recorder.add(frame)
+            else:
+                self.recorder.add(self.front, rows=(area[1], area[3]) if area else ())
+            self.recorder.pump()
+            self.record_ns = time.monotonic_ns() - t2
+        self.frames += 1
+
+    def _process(self, frame):
+        """Run the processor, if any, over a captured frame"""
+        if self.processor is not None:
+            self.processor.process(frame)
+            self.process_ns = self.processor.process_ns
+
+    def _copy_changed_tiles(self):
+        """Copy tiles whose samples changed from back to front buffer; returns their bounding box"""
+        front, back, threshold, level = self.front, self.back, self.threshold, self._level
+        area = None
+        dirty = 0
+        for x1, y1, x2, y2, points in self._tiles:
+            for x, y in points:
+                if abs(level(back[x, y]) - level(front[x, y])) > threshold:
+                    break
+            else:
+                continue
+            dirty += 1
+            if bitmaptools is not None:
+                bitmaptools.blit(front, back, x1, y1, x1=x1, y1=y1, x2=x2, y2=y2)
+            else:
+                front.blit(x1, y1, back, x1=x1, y1=y1, x2=x2, y2=y2)
+            if area is None:
+                area = [x1, y1, x2, y2]
+            else:
+                area = [min(area[0], x1), min(area[1], y1), max(area[2], x2), max(area[3], y2)]
+        self.dirty_tiles = dirty
+        return tuple(area) if area else None
+
+    def play(self, player, speed=1.0):
+        """Stop capturing and show a recording (frame_recorder.FramePlayer) at its recorded pace"""
+        if (player.width, player.height) != (self.width, self.height):
+            raise ValueError(f"recording is {player.width}x{player.height}, frames are {self.width}x{self.height}")
+        self.stop()
+        self._present()
+        self.tilegrid.bitmap = self.front
+        for y1, y2 in player.play(self.front, speed):
+            if y1 < y2:
+                self.front.dirty(0, y1, self.width, y2)
+                self._refresh(self.screen_area((0, y1, self.width, y2)))
+
+    def run(self, frames=None, on_frame=None):
+        """Run frames (forever if None), calling on_frame(pipeline) after each"""
+        count = 0
+        try:
+            while frames is None or count < frames:
+                self.step()
+                count += 1
+                if on_frame:
+                    on_frame(self)
+        finally:
+            self.stop()
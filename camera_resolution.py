@@ -0,0 +1,159 @@
+# camera_resolution.py
+"""
+Pick the largest camera resolution that fits in RAM and keeps up with a target FPS.
+
+ResolutionManager walks a ladder of OV5640 sizes and colour depths from the top:
+a rung is skipped when gc.mem_free() says its frame buffers cannot fit (plus a
+reserve for everything else), or when allocating them raises MemoryError. If no
+rung fits with the requested pipeline mode, the ladder is walked again in single
+buffer mode. While running, update(fps) steps one rung down after `patience`
+reports in a row under target_fps.
+
+The chosen frame is scaled by the largest whole factor that fits the display and
+centered by CameraPipeline's group offset. A crop is given in the coordinates of
+the top rung and scaled to each rung.
+"""
+import gc
+import displayio
+import adafruit_ov5640
+from camera_pipeline import CameraPipeline
+
+# (name, OV5640 size, width, height, OV5640 colorspace, displayio input colorspace, bytes per pixel), best first
+LADDER = (
+    ("QVGA", adafruit_ov5640.OV5640_SIZE_QVGA, 320, 240, adafruit_ov5640.OV5640_COLOR_RGB,
+     displayio.Colorspace.RGB565_SWAPPED, 2),
+    ("HQVGA", adafruit_ov5640.OV5640_SIZE_HQVGA, 240, 176, adafruit_ov5640.OV5640_COLOR_RGB,
+     displayio.Colorspace.RGB565_SWAPPED, 2),
+    ("QVGA gray", adafruit_ov5640.OV5640_SIZE_QVGA, 320, 240, adafruit_ov5640.OV5640_COLOR_GRAYSCALE,
+     displayio.Colorspace.L8, 1),
+    ("QCIF", adafruit_ov5640.OV5640_SIZE_QCIF, 176, 144, adafruit_ov5640.OV5640_COLOR_RGB,
+     displayio.Colorspace.RGB565_SWAPPED, 2),
+    ("QQVGA", adafruit_ov5640.OV5640_SIZE_QQVGA, 160, 120, adafruit_ov5640.OV5640_COLOR_RGB,
+     displayio.Colorspace.RGB565_SWAPPED, 2),
+    ("QCIF gray", adafruit_ov5640.OV5640_SIZE_QCIF, 176, 144, adafruit_ov5640.OV5640_COLOR_GRAYSCALE,
+     displayio.Colorspace.L8, 1),
+    ("QQVGA gray", adafruit_ov5640.OV5640_SIZE_QQVGA, 160, 120, adafruit_ov5640.OV5640_COLOR_GRAYSCALE,
+     displayio.Colorspace.L8, 1),
+    ("96x96 gray", adafruit_ov5640.OV5640_SIZE_96X96, 96, 96, adafruit_ov5640.OV5640_COLOR_GRAYSCALE,
+     displayio.Colorspace.L8, 1),
+)
+
+
+def _mem_free():
+    gc.collect()
+    return gc.mem_free() if hasattr(gc, "mem_free") else None
+
+
+class ResolutionManager:
+    """Builds a CameraPipeline on the best ladder rung that fits, stepping down when too slow"""
+
+    def __init__(self, cam, display, mode="double", ladder=LADDER, target_fps=None, patience=2,
+                 reserve=16 * 1024, crop=None, refresh=None, allocator=None, mem_free=_mem_free, **pipeline_kwargs):
+        self.cam = cam
+        self.display = display
+        self.mode = mode
+        self.ladder = ladder
+        self.target_fps = target_fps
+        self.patience = patience
+        self.reserve = reserve
+        self.crop = crop
+        self.refresh = refresh
+        self.allocator = allocator
+        self.mem_free = mem_free
+        self.pipeline_kwargs = pipeline_kwargs
+        self.rung = None  # index into ladder of the running pipeline
+        self.pipeline = None
+        self._slow_reports = 0
+
+    def frame_bytes(self, index):
+        """Bytes the sensor delivers per frame on ladder[index]"""
+        _, _, width, height, _, _, depth = self.ladder[index]
+        return width * height * depth
+
+    def buffer_bytes(self, index, mode):
+        """RAM for the frame buffers of ladder[index] in mode"""
+        return self.frame_bytes(index) * (2 if mode in ("double", "diff") else 1)
+
+    def _scaled_crop(self, width, height):
+        if self.crop is None:
+            return None
+        top_width, top_height = self.ladder[0][2:4]
+        x1, y1, x2, y2 = self.crop
+        return (x1 * width // top_width, y1 * height // top_height,
+                x2 * width // top_width, y2 * height // top_height)
+
+    def _try_rung(self, index, mode):
+        """CameraPipeline for ladder[index] in mode, or None if it does not fit"""
+        free = self.mem_free() if self.mem_free else None
+        if free is not None and self.buffer_bytes(index, mode) + self.reserve > free:
+            return None
+        _, size, width, height, cam_colorspace, colorspace, _ = self.ladder[index]
+        self.cam.colorspace = cam_colorspace
+        scale = max(1, min(self.display.width // width, self.display.height // height))
+        try:
+            pipeline = CameraPipeline(self.cam, self.display, mode=mode, size=size, scale=scale,
+                                      crop=self._scaled_crop(width, height), refresh=self.refresh,
+                                      colorspace=colorspace, allocator=self.allocator, **self.pipeline_kwargs)
+        except MemoryError:
+            gc.collect()
+            return None
+        if pipeline.mode != mode:
+            # Second buffer did not fit: a smaller rung may still run in the requested mode
+            pipeline = None
+            gc.collect()
+            return None
+        return pipeline
+
+    def _release(self):
+        """Stop the running pipeline and free its frame buffers"""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            # Drop the last reference to the old frames
+            if self.pipeline.compositor is not None:
+                self.pipeline.compositor.present(displayio.Group())
+            else:
+                self.display.root_group = displayio.Group()
+            self.pipeline = None
+            gc.collect()
+
+    def choose(self, start=0):
+        """Build the pipeline on the first rung from `start` that fits; raises MemoryError if none does"""
+        self._release()
+        modes = (self.mode, "single") if self.mode != "single" else ("single",)
+        for mode in modes:
+            for index in range(start, len(self.ladder)):
+                pipeline = self._try_rung(index, mode)
+                if pipeline is not None:
+                    self.pipeline, self.rung = pipeline, index
+                    self._slow_reports = 0
+                    print(f"📷 Camera: {self.ladder[index][0]} {pipeline.width}x{pipeline.height} "
+                          f"x{pipeline.scale}, {pipeline.mode}")
+                    return pipeline
+        raise MemoryError("no camera resolution fits in free memory")
+
+    def step_down(self, reason=""):
+        """Move to the next rung with smaller frames that fits; returns False at the bottom of the ladder"""
+        if self.rung is None:
+            return False
+        current = self.frame_bytes(self.rung)
+        for index in range(self.rung + 1, len(self.ladder)):
+            if self.frame_bytes(index) < current:
+                print(f"📷 {reason}stepping down from {self.ladder[self.rung][0]}")
+                self.choose(index)
+                self.pipeline.start()
+                return True
+        return False
+
+    def update(self, fps):
+        """
+        Feed a measured FPS; returns True when the pipeline was replaced.
+        Callers should step self.pipeline rather than keep their own reference, so the
+        old frame buffers can be freed before the next rung is allocated.
+        """
+        if not self.target_fps or fps >= self.target_fps:
+            self._slow_reports = 0
+            return False
+        self._slow_reports += 1
+        if self._slow_reports < self.patience:
+            return False
+        return self.step_down(f"{fps:.1f} FPS is under the {self.target_fps} FPS target, ")
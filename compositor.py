@@ -0,0 +1,193 @@
+# compositor.py
+"""
+Dirty-rectangle compositor on top of displayio: one retained root for a whole program,
+refreshed by hand, so screen changes only push the pixels that changed.
+
+Assigning a new display.root_group makes displayio redraw all 320x240 pixels. The
+Compositor puts its own root Group on the display once and swaps screens inside it
+with present(), so displayio keeps tracking changes per TileGrid across transitions.
+Before each refresh() it compares every visible TileGrid with the last refresh
+(screen rectangle, bitmap, pixel shader, flips) to find the damaged rectangles,
+adds the areas reported with damage(), merges overlapping rectangles, and then:
+
+  - skips the refresh when nothing is damaged,
+  - calls display.refresh() when the damage is smaller than the screen, so displayio
+    sends only the damaged areas,
+  - repaints the whole screen in one window when the damaged areas would cost at
+    least as many bytes (moving the screen into a second root makes displayio do that).
+
+auto_refresh stays off while a Compositor drives the display. Changes inside a Bitmap
+or Palette (pixels drawn into a canvas, a palette color set) are not visible in the
+TileGrid comparison: report them with damage(), or they wait for the next refresh
+that has other damage. Anything that draws past displayio (image_stream.blit) calls
+invalidate(); a root_group assigned by other code is noticed and fully repainted.
+
+    compositor = Compositor(display, profiler)
+    compositor.present(group)
+    compositor.refresh()
+"""
+import displayio
+from refresh_profiler import WINDOW_OVERHEAD, area_bytes
+
+# Sending two windows instead of one costs a second set of window commands
+WINDOW_PIXELS = WINDOW_OVERHEAD // 2
+
+
+def _size(rect):
+    return (rect[2] - rect[0]) * (rect[3] - rect[1])
+
+
+def _union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _intersect(a, b):
+    """Overlap of two rects, or None"""
+    x1, y1, x2, y2 = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return (x1, y1, x2, y2)
+
+
+def merge(rects, slack=WINDOW_PIXELS):
+    """
+    Merge rects whose bounding box costs at most `slack` pixels more than sending both
+    (overlapping or touching rects almost always qualify); returns a new list
+    """
+    merged = []
+    for rect in rects:
+        i = 0
+        while i < len(merged):
+            other = merged[i]
+            joined = _union(rect, other)
+            if _size(joined) <= _size(rect) + _size(other) + slack:
+                rect = joined
+                merged.pop(i)
+                i = 0  # the bigger rect may now reach ones already passed
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+def _collect(group, layers, x=0, y=0, scale=1):
+    """Add {id(tilegrid): (screen rect, bitmap id, shader id, flip_x, flip_y)} for the visible TileGrids under group"""
+    if group.hidden:
+        return
+    x += group.x * scale
+    y += group.y * scale
+    scale *= group.scale
+    for layer in group:
+        if isinstance(layer, displayio.TileGrid):
+            if layer.hidden:
+                continue
+            width, height = layer.width * layer.tile_width, layer.height * layer.tile_height
+            if layer.transpose_xy:
+                width, height = height, width
+            left, top = x + layer.x * scale, y + layer.y * scale
+            rect = (left, top, left + width * scale, top + height * scale)
+            # ids only: holding the objects would keep the last screen's bitmaps alive
+            layers[id(layer)] = (rect, id(layer.bitmap), id(layer.pixel_shader), layer.flip_x, layer.flip_y)
+        else:
+            _collect(layer, layers, x, y, scale)
+
+
+class Compositor:
+    """Retained root for a display: present() screens into it, refresh() pushes only the damage"""
+
+    def __init__(self, display, profiler=None):
+        self.display = display
+        self.profiler = profiler
+        self.screen = None
+        self._roots = (displayio.Group(), displayio.Group())
+        self._root = self._roots[0]
+        self._screen_rect = (0, 0, display.width, display.height)
+        self._previous = None  # layers at the last refresh, None repaints everything
+        self._damage = []
+        self.refreshes = 0
+        self.full_refreshes = 0
+        self.skipped = 0
+        display.auto_refresh = False
+        display.root_group = self._root
+
+    def present(self, screen):
+        """Make screen (a Group) what is shown; nothing is sent until refresh()"""
+        if screen is self.screen:
+            return
+        if self.screen is not None:
+            self._root.remove(self.screen)
+        self.screen = screen
+        self._root.append(screen)
+
+    def damage(self, rect):
+        """Report (x1, y1, x2, y2) as changed, for pixels drawn into a Bitmap or palette edits"""
+        rect = _intersect(rect, self._screen_rect)
+        if rect:
+            self._damage.append(rect)
+
+    def invalidate(self):
+        """Repaint everything on the next refresh (the panel was drawn without displayio)"""
+        self._previous = None
+
+    def _damaged(self):
+        """(rects displayio would send for the changes since the last refresh, current layers)"""
+        layers = {}
+        if self.screen is not None:
+            _collect(self.screen, layers)
+        if self._previous is None or self.display.root_group is not self._root:
+            return [self._screen_rect], layers
+        previous = self._previous
+        rects = self._damage[:]
+        for key, state in layers.items():
+            old = previous.get(key)
+            if old is None:
+                rects.append(state[0])
+            elif old != state:
+                rects.append(state[0])
+                rects.append(old[0])
+        for key, old in previous.items():
+            if key not in layers:
+                rects.append(old[0])
+        clipped = []
+        for rect in rects:
+            rect = _intersect(rect, self._screen_rect)
+            if rect and rect not in clipped:
+                clipped.append(rect)
+        return clipped, layers
+
+    def refresh(self, area=None):
+        """
+        Send what changed since the last refresh; returns the merged damaged rects, [] if nothing was sent.
+        area: (x1, y1, x2, y2) drawn into a Bitmap since, same as damage(area)
+        """
+        if area:
+            self.damage(area)
+        rects, layers = self._damaged()
+        self._previous = layers
+        self._damage = []
+        if not rects:
+            self.skipped += 1
+            return rects
+        full = self.display.root_group is not self._root or area_bytes(rects) >= area_bytes([self._screen_rect])
+        if full:
+            # A root_group change is the one way to make displayio send the screen as a single window
+            rects = [self._screen_rect]
+            if self.display.root_group is self._root:
+                old, self._root = self._root, self._roots[1] if self._root is self._roots[0] else self._roots[0]
+                if self.screen is not None:
+                    old.remove(self.screen)
+                    self._root.append(self.screen)
+            self.display.root_group = self._root
+            self.full_refreshes += 1
+        else:
+            rects = merge(rects)
+        if self.profiler is not None:
+            self.profiler.refresh(area=rects, minimum_frames_per_second=0)
+        else:
+            self.display.refresh(minimum_frames_per_second=0)
+        self.refreshes += 1
+        return rects
+
+    def stats(self):
+        """Counters as a dict, handy for printing over serial"""
+        return {"refreshes": self.refreshes, "full_refreshes": self.full_refreshes, "skipped": self.skipped}
@@ -0,0 +1,143 @@
+# demo_scheduler.py
+"""
+Demo scheduler: runs demos in turn and builds the next demo's screen while the
+current one is still on display, within a heap budget.
+
+Each demo is a (run, prepare) pair. prepare() builds the demo's screen ahead of time
+and returns it (None when there is nothing to show); run(prepared) shows it, building
+it itself when prepared is None. Demos without a prepare step are (run, None) and run
+as before. While a screen is up the demo calls idle(seconds) instead of time.sleep(),
+and idle() spends the start of that time preparing the next demo:
+
+  - only with at least budget_bytes + reserve_bytes of heap free,
+  - never again for a demo whose prepared screen held more than budget_bytes
+    (it is built when it starts, after the previous screen is gone).
+
+Memory is collected at fixed points: before preparing, right after a demo's first
+frame (the previous screen was just let go of, see shown()) and when a demo ends.
+A prepared screen that is thrown away (over budget) is passed to release(screen) first
+when a release function is given, so pooled objects it holds are given back.
+For every transition the scheduler logs the time from run_next() to the demo's first
+frame, whether its screen was prepared, and the lowest free heap seen.
+
+    scheduler = DemoScheduler([(demo_splash, build_splash), (demo_pong, None)])
+    while True:
+        scheduler.run_next()
+        scheduler.idle(1)
+"""
+import gc
+import time
+
+
+def _mem_free():
+    return gc.mem_free() if hasattr(gc, "mem_free") else None
+
+
+class DemoScheduler:
+    """Runs (run, prepare) demos in a loop, preparing the next screen during the current one"""
+
+    def __init__(self, demos, budget_bytes=32 * 1024, reserve_bytes=24 * 1024, mem_free=_mem_free, log=True,
+                 release=None):
+        self.demos = demos
+        self.budget_bytes = budget_bytes
+        self.reserve_bytes = reserve_bytes
+        self.mem_free = mem_free
+        self.log = log
+        self.release = release
+        self.index = 0
+        self.last = None  # record of the last finished demo, see run_next()
+        self._prepared = None  # (demo index, screen)
+        self._over_budget = set()  # demo indexes whose screens are built when they start
+        self._started = False
+        self._running = False
+        self._first_frame_ns = None
+        self._lowest_free = None
+
+    @property
+    def name(self):
+        """Name of the demo run_next() runs"""
+        return self.demos[self.index][0].__name__
+
+    def _sample(self):
+        free = self.mem_free() if self.mem_free else None
+        if free is not None and (self._lowest_free is None or free < self._lowest_free):
+            self._lowest_free = free
+        return free
+
+    def run_next(self):
+        """Run the current demo, with its prepared screen if there is one; returns its record"""
+        index = self.index
+        run, prepare = self.demos[index]
+        prepared = self._prepared[1] if self._prepared and self._prepared[0] == index else None
+        self._prepared = None
+        self._started = self._running = True
+        self._first_frame_ns = None
+        self._lowest_free = None
+        self._sample()
+        start = time.monotonic_ns()
+        try:
+            if prepare is None:
+                run()
+            else:
+                run(prepared)
+        finally:
+            self._running = False
+        first = self._first_frame_ns
+        gc.collect()
+        self._sample()
+        self.index = (index + 1) % len(self.demos)
+        self.last = {"demo": run.__name__, "first_frame_ms": (first - start) / 1e6 if first else None,
+                     "prepared": prepared is not None, "lowest_free": self._lowest_free}
+        if self.log:
+            latency = f"{self.last['first_frame_ms']:.0f} ms" if first else "-"
+            if prepared is not None:
+                latency += " (prepared)"
+            lowest = f"{self._lowest_free:,} bytes" if self._lowest_free is not None else "-"
+            print(f"🔀 {run.__name__}: first frame {latency}, lowest free {lowest}")
+        return self.last
+
+    def shown(self):
+        """Mark the running demo's first frame; collects the screen it replaced"""
+        if self._first_frame_ns is None and self._running:
+            self._first_frame_ns = time.monotonic_ns()
+            self._sample()  # the old screen is unreachable but not collected yet: the transition's low point
+            gc.collect()
+
+    def idle(self, seconds):
+        """Sleep while the current screen is shown, preparing the next demo's screen first"""
+        end = time.monotonic() + seconds
+        self.prepare_next()
+        remaining = end - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def prepare_next(self):
+        """Build the screen of the demo that runs next, if it has a prepare step and fits the budget"""
+        if not self._started or not self.budget_bytes:
+            return  # preloading is off, or demos are called directly (benchmarks, screen compiler)
+        index = (self.index + 1) % len(self.demos) if self._running else self.index
+        prepare = self.demos[index][1]
+        if prepare is None or index in self._over_budget or (self._prepared and self._prepared[0] == index):
+            return
+        gc.collect()
+        free = self._sample()
+        if free is not None and free < self.budget_bytes + self.reserve_bytes:
+            return
+        start = time.monotonic_ns()
+        screen = prepare()
+        gc.collect()
+        after = self._sample()
+        held = free - after if free is not None else None
+        name = self.demos[index][0].__name__
+        if held is not None and held > self.budget_bytes:
+            self._over_budget.add(index)
+            if self.release is not None:
+                self.release(screen)
+            screen = None
+            gc.collect()
+            if self.log:
+                print(f"📦 {name}: {held:,} bytes is over the {self.budget_bytes:,} byte budget, built when it starts")
+        elif self.log:
+            size = f", {held:,} bytes" if held is not None else ""
+            print(f"📦 {name} prepared in {(time.monotonic_ns() - start) / 1e6:.0f} ms{size}")
+        self._prepared = (index, screen) if screen is not None else None
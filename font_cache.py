@@ -0,0 +1,110 @@
+# font_cache.py
+"""
+Process-wide font registry for adafruit_bitmap_font.
+Each font file is parsed once and kept in an LRU limited by a byte budget.
+Glyphs are loaded lazily: only the characters a screen actually draws are
+pre-loaded, and hit/miss and bytes-resident counters are kept for tuning.
+"""
+from adafruit_bitmap_font import bitmap_font
+
+# Rough per-glyph bookkeeping (Glyph tuple + Bitmap object) on top of pixel data
+_GLYPH_OVERHEAD = 48
+
+
+def glyph_bytes(glyph):
+    """Approximate RAM held by one loaded glyph (1-bit Bitmap rows are 32-bit aligned)"""
+    bitmap = getattr(glyph, "bitmap", None)
+    if bitmap is None:
+        return _GLYPH_OVERHEAD
+    words_per_row = (bitmap.width + 31) // 32
+    return words_per_row * 4 * bitmap.height + _GLYPH_OVERHEAD
+
+
+class FontCache:
+    """LRU of loaded fonts keyed by path, bounded by an approximate glyph byte budget"""
+
+    def __init__(self, budget_bytes=48 * 1024, loader=None):
+        self.budget_bytes = budget_bytes
+        self.loader = loader or bitmap_font.load_font  # called on a miss, once per font file
+        # Recency is a use count per entry, since MicroPython dicts do not keep insertion order
+        self._fonts = {}  # path -> [font, loaded codepoints, bytes, last use]
+        self._uses = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.glyphs_loaded = 0
+
+    @property
+    def bytes_resident(self):
+        """Approximate bytes held by glyphs of all cached fonts"""
+        return sum(entry[2] for entry in self._fonts.values())
+
+    def get(self, path, text=None):
+        """Return the font at path (loading it once), pre-loading glyphs for text"""
+        entry = self._fonts.get(path)
+        if entry is None:
+            self.misses += 1
+            entry = [self.loader(path), set(), 0, 0]
+            self._fonts[path] = entry
+        else:
+            self.hits += 1
+        self._touch(entry)
+        if text:
+            self._preload(entry, text)
+            self._evict(keep=path)
+        return entry[0]
+
+    def preload(self, path, text):
+        """Make sure the glyphs for text are loaded for an already-registered font"""
+        return self.get(path, text)
+
+    def _touch(self, entry):
+        self._uses += 1
+        entry[3] = self._uses
+
+    def _preload(self, entry, text):
+        font, loaded = entry[0], entry[1]
+        missing = [ch for ch in set(text) if ord(ch) not in loaded]
+        if not missing:
+            return
+        font.load_glyphs("".join(missing))
+        for ch in missing:
+            codepoint = ord(ch)
+            loaded.add(codepoint)
+            glyph = font.get_glyph(codepoint)
+            if glyph is not None:
+                entry[2] += glyph_bytes(glyph)
+                self.glyphs_loaded += 1
+
+    def _evict(self, keep=None):
+        """Drop least recently used fonts until under budget (never the one in use)"""
+        while self.bytes_resident > self.budget_bytes and len(self._fonts) > 1:
+            oldest = min(self._fonts, key=lambda path: self._fonts[path][3])
+            if oldest == keep:
+                break
+            del self._fonts[oldest]
+            self.evictions += 1
+
+    def forget(self, path):
+        """Remove one font from the cache"""
+        self._fonts.pop(path, None)
+
+    def clear(self):
+        """Remove every cached font"""
+        self._fonts.clear()
+
+    def __contains__(self, path):
+        return path in self._fonts
+
+    def __len__(self):
+        return len(self._fonts)
+
+    def stats(self):
+        """Counters as a dict, handy for printing over serial"""
+        return {"fonts": len(self._fonts), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "glyphs": self.glyphs_loaded,
+                "bytes_resident": self.bytes_resident, "budget_bytes": self.budget_bytes}
+
+
+# Shared registry used by the demo scripts
+fonts = FontCache()
@@ -0,0 +1,147 @@
+# frame_processing.py
+"""
+Array post-processing for camera frames, between capture and refresh.
+
+A FrameProcessor works on the frame Bitmap's own buffer with ulab (CircuitPython's
+NumPy subset) on the board and NumPy on the host: the frame is read as an array,
+turned into an 8-bit gray level plane, run through the stages with whole-array
+operations and written back into the same Bitmap, so no per-pixel Python loop runs.
+
+Stages, in the order given:
+  "gray"       just the gray level (implied by the others)
+  "blur"       3x3 box blur
+  "edges"      Sobel edge strength (|gx| + |gy|) / 4
+  "threshold"  255 where the level is above threshold, else 0
+  "motion"     255 where the level moved more than motion_threshold since the last frame, else 0
+
+RGB565_SWAPPED frames come back as gray RGB565_SWAPPED pixels and L8 frames as levels,
+so the display side does not change. The one-pixel border is left out of blur and edges.
+Two frame-sized int16 planes, plus one each for "edges" and "motion", are allocated at
+the first frame (each expression also makes a temporary array of that size), so on the
+board this suits the smaller camera sizes; without room, processing is turned off.
+
+    processor = FrameProcessor(("blur", "edges"))
+    processor.process(frame)              # in place, e.g. CameraPipeline(..., processor=processor)
+"""
+import time
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    import numpy as np
+
+STAGES = ("gray", "blur", "edges", "threshold", "motion")
+
+
+class FrameProcessor:
+    """Runs array stages over frame Bitmaps (RGB565_SWAPPED or L8) in place"""
+
+    def __init__(self, stages=("gray",), threshold=96, motion_threshold=24):
+        for stage in stages:
+            if stage not in STAGES:
+                raise ValueError(f"unknown stage {stage!r}, expected one of {', '.join(STAGES)}")
+        self.stages = tuple(stages)
+        self.threshold = threshold
+        self.motion_threshold = motion_threshold
+        self.enabled = True
+        self.size = None
+        self.frames = 0
+        self.process_ns = 0  # last frame's processing time
+        self.total_ns = 0
+
+    def _allocate(self, width, height):
+        shape = (height, width)
+        self._level = self._a = self._b = self._previous = None  # free the old size's planes first
+        try:
+            self._level = np.zeros(shape, dtype=np.int16)
+            self._a = np.zeros(shape, dtype=np.int16)
+            self._b = np.zeros(shape, dtype=np.int16) if "edges" in self.stages else None
+            self._previous = np.zeros(shape, dtype=np.int16) if "motion" in self.stages else None
+        except MemoryError:
+            print(f"MemoryError: no room for {width}x{height} processing planes, frames are shown unprocessed")
+            self.enabled = False
+            return
+        self.size = (width, height)
+        self._first = True
+
+    def process(self, bitmap):
+        """Run the stages over bitmap and write the result back into it"""
+        self.process_ns = 0
+        if not self.enabled:
+            return
+        start = time.monotonic_ns()
+        if self.size != (bitmap.width, bitmap.height):
+            self._allocate(bitmap.width, bitmap.height)
+            if not self.enabled:
+                return
+        rgb = memoryview(bitmap).itemsize == 2
+        frame = np.frombuffer(bitmap, dtype=np.uint16 if rgb else np.uint8).reshape((bitmap.height, bitmap.width))
+        if rgb:
+            self._rgb565_to_level(frame)
+        else:
+            self._level[:, :] = frame
+        for stage in self.stages:
+            if stage == "blur":
+                self._blur()
+            elif stage == "edges":
+                self._edges()
+            elif stage == "threshold":
+                self._level[:, :] = (self._level > self.threshold) * 255
+            elif stage == "motion":
+                self._motion()
+        if rgb:
+            self._level_to_rgb565(frame)
+        else:
+            frame[:, :] = self._level
+        self.process_ns = time.monotonic_ns() - start
+        self.total_ns += self.process_ns
+        self.frames += 1
+
+    def _rgb565_to_level(self, frame):
+        """Gray level 0..250 of byte-swapped RGB565 pixels: (77 r5 + 75 g6 + 29 b5) / 32"""
+        level, part = self._level, self._a
+        level[:, :] = (frame >> 3) & 0x1F  # r5
+        level *= 77
+        part[:, :] = ((frame & 0x07) << 3) | (frame >> 13)  # g6
+        part *= 75
+        level += part
+        part[:, :] = (frame >> 8) & 0x1F  # b5
+        part *= 29
+        level += part
+        level[:, :] = level >> 5
+
+    def _level_to_rgb565(self, frame):
+        """Gray byte-swapped RGB565 pixels for levels 0..255"""
+        gray = self._a
+        gray[:, :] = np.clip(self._level, 0, 255)
+        # r5 = b5 = level >> 3, g6 = level >> 2; swapped: low byte r5 g6[5:3], high byte g6[2:0] b5.
+        # The high byte's top bit makes the int16 negative; storing it in the uint16 frame keeps the bits.
+        frame[:, :] = (gray & 0xF8) | (gray >> 5) | ((gray & 0x1C) << 11) | ((gray >> 3) << 8)
+
+    def _blur(self):
+        level, rows = self._level, self._a
+        rows[:, 1:-1] = level[:, :-2] + level[:, 1:-1] + level[:, 2:]
+        level[1:-1, 1:-1] = (rows[:-2, 1:-1] + rows[1:-1, 1:-1] + rows[2:, 1:-1]) // 9
+
+    def _edges(self):
+        level, gx, gy = self._level, self._a, self._b
+        # Vertical [1, 2, 1] sums per column for gx, horizontal ones per row for gy
+        gx[1:-1, :] = level[:-2, :] + 2 * level[1:-1, :] + level[2:, :]
+        gy[:, 1:-1] = level[:, :-2] + 2 * level[:, 1:-1] + level[:, 2:]
+        gx[1:-1, 1:-1] = abs(gx[1:-1, 2:] - gx[1:-1, :-2])
+        gy[1:-1, 1:-1] = abs(gy[2:, 1:-1] - gy[:-2, 1:-1])
+        level[1:-1, 1:-1] = np.clip((gx[1:-1, 1:-1] + gy[1:-1, 1:-1]) >> 2, 0, 255)
+
+    def _motion(self):
+        level, previous = self._level, self._previous
+        if self._first:
+            previous[:, :] = level
+            self._first = False
+        self._a[:, :] = abs(level - previous)
+        previous[:, :] = level
+        level[:, :] = (self._a > self.motion_threshold) * 255
+
+    def stats(self):
+        """Counters as a dict, handy for printing over serial"""
+        return {"stages": self.stages, "frames": self.frames, "enabled": self.enabled,
+                "mean_ms": self.total_ns / self.frames / 1e6 if self.frames else 0}
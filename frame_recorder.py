@@ -0,0 +1,317 @@
+# frame_recorder.py
+"""
+Camera recording to the SD card: frames are appended to a file through a ring buffer
+that only ever writes whole, block-aligned chunks, and a frame index at the end of the
+file gives seeking and paced playback.
+
+FrameRecorder.add() copies a frame into the ring (blocking on a chunk write only when
+the ring is full) and pump() writes at most one chunk per call, so a live preview loop
+spreads the SD writes over its frames. Frames are stored as:
+
+  - key frames: every pixel (the first frame, every keyframe_every frames, and whenever
+    the caller cannot say what changed),
+  - delta frames: only rows y1..y2, when the caller knows nothing else changed since the
+    previous frame (CameraPipeline's diff mode knows from its changed tiles),
+  - repeats: nothing changed.
+
+Pixels are stored as the Bitmap holds them (RGB565 byte-swapped, or L8), straight from
+its buffer. FramePlayer reads a recording back into a Bitmap: read(n) seeks from the
+nearest key frame, play() yields each frame's changed rows at the recorded pace. A
+recording cut short (no index) is indexed by walking its frames.
+
+    recorder = FrameRecorder("/sd/camera.rec")
+    recorder.add(frame)               # or add(frame, rows=(y1, y2)), add(frame, rows=())
+    recorder.pump()
+    recorder.close()                  # writes the index, prints the write throughput
+
+Layout (little-endian, 16-bit words): b"CAM1", width, height, bytes per pixel, keyframe_every,
+then frames: kind (0 key, 1 delta, 2 repeat), [y1, y2 for delta], pixel rows; then the index,
+b"CIDX" and per frame: file offset (I), ms since the first frame (I), kind (B); and last the
+index offset (I), frame count (I) and b"CEND".
+"""
+import struct
+import time
+from array import array
+
+MAGIC = b"CAM1"
+INDEX_MAGIC = b"CIDX"
+END_MAGIC = b"CEND"
+KEY, DELTA, REPEAT = 0, 1, 2
+_HEADER = "<4sHHHH"
+_ENTRY = "<IIB"
+_TRAILER = "<II4s"
+
+
+class FrameRecorder:
+    """Appends frames to a recording through a ring buffer written in whole chunks"""
+
+    def __init__(self, path, ring_bytes=16 * 1024, write_bytes=4096, keyframe_every=30, log=True):
+        if write_bytes % 512 or ring_bytes % write_bytes:
+            raise ValueError("write_bytes must be a multiple of 512 and ring_bytes a multiple of write_bytes")
+        self.path = path
+        self.ring_bytes = ring_bytes
+        self.write_bytes = write_bytes
+        self.keyframe_every = keyframe_every
+        self.log = log
+        self.file = None
+        self.closed = False
+        self.width = self.height = None
+        self.frames = 0
+        self.key_frames = 0
+        self.bytes_written = 0
+        self.write_ns = 0
+        self.writes = 0
+        self._offsets = array("I")
+        self._times = array("I")
+        self._kinds = bytearray()
+        self._since_key = 0
+        self._start_ns = 0
+
+    def _open(self, bitmap):
+        self.width, self.height = bitmap.width, bitmap.height
+        view = memoryview(bitmap)
+        self._itemsize = view.itemsize
+        self._typecode = "H" if view.itemsize == 2 else "B"
+        self._ring = array(self._typecode, bytes(self.ring_bytes))
+        self._view = memoryview(self._ring)
+        self._chunk = self.write_bytes // self._itemsize
+        self._head = 0  # items written to the file
+        self._tail = 0  # items put into the ring
+        self.file = open(self.path, "wb")
+        self._start_ns = time.monotonic_ns()
+        self._put(memoryview(MAGIC) if self._itemsize == 1 else memoryview(array("H", MAGIC)))
+        self._put_words(self.width, self.height, self._itemsize, self.keyframe_every)
+
+    def _write(self, start, end):
+        started = time.monotonic_ns()
+        self.file.write(self._view[start:end])
+        self.write_ns += time.monotonic_ns() - started
+        self.bytes_written += (end - start) * self._itemsize
+        self.writes += 1
+
+    def _write_chunk(self):
+        start = self._head % len(self._ring)
+        self._write(start, start + self._chunk)
+        self._head += self._chunk
+
+    def _put(self, data):
+        """Copy items into the ring, writing chunks out first whenever it is full"""
+        size = len(self._ring)
+        done = 0
+        while done < len(data):
+            if self._tail - self._head == size:
+                self._write_chunk()
+            start = self._tail % size
+            count = min(len(data) - done, size - (self._tail - self._head), size - start)
+            self._view[start:start + count] = data[done:done + count]
+            self._tail += count
+            done += count
+
+    def _put_words(self, *words):
+        if self._itemsize == 2:
+            self._put(memoryview(array("H", words)))
+        else:
+            self._put(memoryview(struct.pack(f"<{len(words)}H", *words)))
+
+    def add(self, bitmap, rows=None):
+        """
+        Append a frame; returns False once the recorder is closed.
+        rows: (y1, y2) when only those rows changed since the previous frame added, () when none did
+        """
+        if self.closed:
+            return False
+        if self.file is None:
+            self._open(bitmap)
+        elif (bitmap.width, bitmap.height) != (self.width, self.height):
+            print(f"📼 Frame size changed to {bitmap.width}x{bitmap.height}, recording stopped")
+            self.close()
+            return False
+        if rows is None or not self.frames or self._since_key + 1 >= self.keyframe_every:
+            kind, rows = KEY, (0, self.height)
+        elif not rows or rows[0] >= rows[1]:
+            kind = REPEAT
+        else:
+            kind = DELTA
+        self._offsets.append(self._tail * self._itemsize)
+        self._times.append((time.monotonic_ns() - self._start_ns) // 1000000)
+        self._kinds.append(kind)
+        if kind == DELTA:
+            self._put_words(kind, rows[0], rows[1])
+        else:
+            self._put_words(kind)
+        if kind != REPEAT:
+            self._put(memoryview(bitmap)[rows[0] * self.width:rows[1] * self.width])
+        self.frames += 1
+        if kind == KEY:
+            self.key_frames += 1
+            self._since_key = 0
+        else:
+            self._since_key += 1
+        return True
+
+    def pump(self, chunks=1):
+        """Write up to `chunks` full chunks from the ring; returns how many were written"""
+        written = 0
+        while written < chunks and self.file is not None and self._tail - self._head >= self._chunk:
+            self._write_chunk()
+            written += 1
+        return written
+
+    def close(self):
+        """Write what is left in the ring and the index, close the file and report the throughput"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.file is None:
+            return
+        size = len(self._ring)
+        while self._tail > self._head:
+            start = self._head % size
+            count = min(self._tail - self._head, size - start)
+            self._write(start, start + count)
+            self._head += count
+        index_offset = self._tail * self._itemsize
+        entries = bytearray(INDEX_MAGIC)
+        for offset, ms, kind in zip(self._offsets, self._times, self._kinds):
+            entries += struct.pack(_ENTRY, offset, ms, kind)
+        entries += struct.pack(_TRAILER, index_offset, self.frames, END_MAGIC)
+        self.file.write(entries)
+        self.file.close()
+        self.file = None
+        self._ring = self._view = None
+        if self.log:
+            self.report()
+
+    def duration(self):
+        """Seconds from the first frame recorded to the last"""
+        return self._times[-1] / 1000 if self.frames else 0
+
+    def stats(self):
+        """Counters as a dict, handy for printing over serial"""
+        seconds = self.duration()
+        return {"frames": self.frames, "key_frames": self.key_frames, "bytes_written": self.bytes_written,
+                "writes": self.writes, "seconds": seconds,
+                "sustained_bytes_per_second": self.bytes_written / seconds if seconds else 0,
+                "write_bytes_per_second": self.bytes_written * 1e9 / self.write_ns if self.write_ns else 0}
+
+    def report(self):
+        stats = self.stats()
+        print(f"📼 {self.path}: {stats['frames']} frames ({stats['key_frames']} key), {stats['bytes_written']:,} bytes "
+              f"in {stats['seconds']:.1f} s, {stats['sustained_bytes_per_second'] / 1024:.1f} KB/s sustained, "
+              f"{stats['write_bytes_per_second'] / 1024:.1f} KB/s while writing ({self.write_bytes}-byte writes)")
+
+
+class FramePlayer:
+    """Reads a recording back into a Bitmap of the recorded size"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        magic, self.width, self.height, self.bytes_per_pixel, self.keyframe_every = struct.unpack(
+            _HEADER, self.file.read(struct.calcsize(_HEADER)))
+        if magic != MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a camera recording")
+        self._offsets = array("I")
+        self._times = array("I")
+        self._kinds = bytearray()
+        if not self._read_index():
+            self._walk()
+        self._current = -1  # frame the last read() left in the bitmap
+
+    def _read_index(self):
+        self.file.seek(0, 2)
+        end = self.file.tell()
+        trailer_size = struct.calcsize(_TRAILER)
+        if end < trailer_size:
+            return False
+        self.file.seek(end - trailer_size)
+        index_offset, count, magic = struct.unpack(_TRAILER, self.file.read(trailer_size))
+        if magic != END_MAGIC:
+            return False
+        self.file.seek(index_offset)
+        if self.file.read(4) != INDEX_MAGIC:
+            return False
+        entry_size = struct.calcsize(_ENTRY)
+        data = self.file.read(entry_size * count)
+        for i in range(count):
+            offset, ms, kind = struct.unpack_from(_ENTRY, data, i * entry_size)
+            self._offsets.append(offset)
+            self._times.append(ms)
+            self._kinds.append(kind)
+        return True
+
+    def _walk(self):
+        """Index a recording without one (cut short) by reading each frame's header"""
+        row_bytes = self.width * self.bytes_per_pixel
+        offset = struct.calcsize(_HEADER)
+        while True:
+            self.file.seek(offset)
+            header = self.file.read(2)
+            if len(header) < 2:
+                break
+            kind = struct.unpack("<H", header)[0]
+            if kind == DELTA:
+                y1, y2 = struct.unpack("<HH", self.file.read(4))
+                size = 6 + (y2 - y1) * row_bytes
+            else:
+                size = 2 + (self.height * row_bytes if kind == KEY else 0)
+            self.file.seek(0, 2)
+            if offset + size > self.file.tell():
+                break  # last frame only partly written
+            self._offsets.append(offset)
+            self._times.append(0)
+            self._kinds.append(kind)
+            offset += size
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def time_ms(self, index):
+        """Milliseconds from the first frame to frame index (0 for recordings without an index)"""
+        return self._times[index]
+
+    def _decode(self, index, bitmap):
+        """Read frame index over the frame before it; returns its changed rows (y1, y2)"""
+        self.file.seek(self._offsets[index] + 2)
+        kind = self._kinds[index]
+        if kind == REPEAT:
+            return 0, 0
+        y1, y2 = struct.unpack("<HH", self.file.read(4)) if kind == DELTA else (0, self.height)
+        self.file.readinto(memoryview(bitmap)[y1 * self.width:y2 * self.width])
+        return y1, y2
+
+    def read(self, index, bitmap):
+        """Put frame index into bitmap; returns the rows (y1, y2) that differ from what was there"""
+        if (bitmap.width, bitmap.height) != (self.width, self.height):
+            raise ValueError(f"recording is {self.width}x{self.height}, bitmap is {bitmap.width}x{bitmap.height}")
+        if index == self._current + 1:
+            rows = self._decode(index, bitmap)
+        else:
+            start = index
+            while self._kinds[start] != KEY:
+                start -= 1
+            for frame in range(start, index + 1):
+                self._decode(frame, bitmap)
+            rows = (0, self.height)
+        self._current = index
+        return rows
+
+    def play(self, bitmap, speed=1.0, fps=10):
+        """Generator: put each frame into bitmap at the recorded pace (fps without an index), yielding its rows"""
+        start = time.monotonic()
+        for index in range(len(self)):
+            due = (self._times[index] / 1000 if self._times[-1] else index / fps) / speed
+            wait = start + due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            yield self.read(index, bitmap)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,84 @@
+# frame_stats.py
+"""
+Rolling frame-timing statistics for animation and camera loops.
+
+Each frame records the time of its named stages (e.g. "capture", "refresh") plus the
+total frame time (end of one frame to the end of the next) into fixed-size windows.
+Every `report_every` frames one line per stage is printed with min/mean/p95/max in ms
+and the effective FPS over the window, instead of printing on every frame.
+
+    stats = FrameStats(("capture", "refresh"), window=60, report_every=60, label="camera")
+    while True:
+        ...
+        stats.add("capture", capture_ns)
+        stats.add("refresh", refresh_ns)
+        stats.end_frame()
+"""
+import time
+from array import array
+
+
+class FrameStats:
+    """Keeps the last `window` frame and stage times (ms) and reports them every `report_every` frames"""
+
+    def __init__(self, stages=(), window=60, report_every=None, label=""):
+        self.stages = tuple(stages)
+        self.window = window
+        self.report_every = report_every
+        self.label = label
+        self._times = {name: array("f", bytes(4 * window)) for name in self.stages + ("frame",)}
+        self._pending = {name: 0 for name in self.stages}
+        self.frames = 0
+        self._last_ns = time.monotonic_ns()
+
+    def start(self):
+        """Start timing the next frame from now (e.g. after setup or a pause)"""
+        self._last_ns = time.monotonic_ns()
+
+    def add(self, stage, duration_ns):
+        """Add time spent in a stage during the current frame"""
+        self._pending[stage] += duration_ns
+
+    def end_frame(self):
+        """Close the current frame; prints a report every report_every frames and returns True when it did"""
+        now = time.monotonic_ns()
+        slot = self.frames % self.window
+        self._times["frame"][slot] = (now - self._last_ns) / 1e6
+        for name in self.stages:
+            self._times[name][slot] = self._pending[name] / 1e6
+            self._pending[name] = 0
+        self._last_ns = now
+        self.frames += 1
+        if self.report_every and self.frames % self.report_every == 0:
+            self.report()
+            # Keep the time spent printing out of the next frame
+            self._last_ns = time.monotonic_ns()
+            return True
+        return False
+
+    def _values(self, name):
+        count = min(self.frames, self.window)
+        return self._times[name][:count]
+
+    def stats(self, name="frame"):
+        """(min, mean, p95, max) in ms over the window, or None before the first frame"""
+        values = sorted(self._values(name))
+        if not values:
+            return None
+        p95 = values[min(len(values) - 1, (len(values) * 95) // 100)]
+        return values[0], sum(values) / len(values), p95, values[-1]
+
+    def fps(self):
+        """Effective frames per second over the window"""
+        total_ms = sum(self._values("frame"))
+        return len(self._values("frame")) * 1000 / total_ms if total_ms else 0.0
+
+    def report(self):
+        """Print min/mean/p95/max per stage and the effective FPS"""
+        count = min(self.frames, self.window)
+        if not count:
+            return
+        print(f"📊 {self.label or 'frames'}: {self.fps():.1f} FPS over {count} frames (min/mean/p95/max ms)")
+        for name in self.stages + ("frame",):
+            low, mean, p95, high = self.stats(name)
+            print(f"   {name:10} {low:7.1f} {mean:7.1f} {p95:7.1f} {high:7.1f}")
@@ -0,0 +1,133 @@
+# gradient.py
+"""
+Single-bitmap gradient backgrounds for displayio.
+A gradient is one small indexed Bitmap holding a single line of color bands,
+tiled across the screen by one TileGrid, with one N-entry Palette.
+Replaces building a Bitmap + Palette + TileGrid for every row of the screen.
+"""
+import displayio
+
+# 4x4 ordered (Bayer) dither thresholds, 0..15
+_BAYER4 = (
+    (0, 8, 2, 10),
+    (12, 4, 14, 6),
+    (3, 11, 1, 9),
+    (15, 7, 13, 5),
+)
+
+_cache = {}
+
+
+def _normalize_stops(start_color, end_color, stops):
+    """Return stops as a tuple of (position, color) pairs sorted by position"""
+    if stops is None:
+        stops = (start_color, end_color)
+    if not stops:
+        raise ValueError("gradient needs at least one color stop")
+    if isinstance(stops[0], int):
+        last = max(1, len(stops) - 1)
+        stops = [(i / last, color) for i, color in enumerate(stops)]
+    return tuple(sorted((float(pos), color) for pos, color in stops))
+
+
+def _mix(color_a, color_b, ratio):
+    """Blend two 0xRRGGBB colors, ratio 0.0 -> color_a, 1.0 -> color_b"""
+    r_a, g_a, b_a = (color_a >> 16) & 0xFF, (color_a >> 8) & 0xFF, color_a & 0xFF
+    r_b, g_b, b_b = (color_b >> 16) & 0xFF, (color_b >> 8) & 0xFF, color_b & 0xFF
+    r = int(r_a + (r_b - r_a) * ratio + 0.5)
+    g = int(g_a + (g_b - g_a) * ratio + 0.5)
+    b = int(b_a + (b_b - b_a) * ratio + 0.5)
+    return (r << 16) | (g << 8) | b
+
+
+def color_at(stops, position):
+    """Color of a normalized stop list at position 0.0..1.0"""
+    if position <= stops[0][0]:
+        return stops[0][1]
+    for (pos_a, color_a), (pos_b, color_b) in zip(stops, stops[1:]):
+        if position <= pos_b:
+            span = pos_b - pos_a
+            return _mix(color_a, color_b, (position - pos_a) / span if span else 1.0)
+    return stops[-1][1]
+
+
+def band_colors(stops, bands):
+    """List of `bands` colors evenly sampled from first to last stop"""
+    if bands == 1:
+        return [stops[0][1]]
+    return [color_at(stops, i / (bands - 1)) for i in range(bands)]
+
+
+def make_gradient(start_color=0x000000, end_color=0xFFFFFF, width=320, height=240, stops=None,
+                  vertical=True, bands=None, dither=False):
+    """
+    Render a gradient into one indexed Bitmap + Palette, cached by its parameters.
+    stops: list of colors (evenly spaced) or (position, color) pairs, overrides start/end
+    vertical: True changes color top to bottom, False left to right
+    bands: number of palette entries (default one per line, at most 256)
+    dither: ordered 4x4 dithering between neighbouring bands
+    Returns (bitmap, palette, tiles_across, tiles_down) ready for a tiled TileGrid.
+    """
+    stops = _normalize_stops(start_color, end_color, stops)
+    length = height if vertical else width
+    if bands is None:
+        bands = length
+    bands = max(1, min(256, length, bands))
+    if bands == 1:
+        dither = False
+
+    key = (stops, width, height, vertical, bands, dither)
+    cached = _cache.get(key)
+    if cached:
+        return cached
+
+    palette = displayio.Palette(bands)
+    for i, color in enumerate(band_colors(stops, bands)):
+        palette[i] = color
+
+    # Undithered gradients only vary along one axis, so a 1-pixel-thick line is
+    # enough; dithered ones repeat every 4 pixels across the gradient.
+    period = 4 if dither else 1
+    if vertical:
+        bitmap = displayio.Bitmap(period, length, bands)
+    else:
+        bitmap = displayio.Bitmap(length, period, bands)
+
+    for along in range(length):
+        if dither:
+            level = along * (bands - 1) / max(1, length - 1)
+            base = int(level)
+            frac16 = int((level - base) * 16)
+        else:
+            index = along * bands // length
+        for across in range(period):
+            if dither:
+                threshold = _BAYER4[along % 4][across] if vertical else _BAYER4[across][along % 4]
+                index = min(bands - 1, base + (1 if frac16 > threshold else 0))
+            if vertical:
+                bitmap[across, along] = index
+            else:
+                bitmap[along, across] = index
+
+    if vertical:
+        result = (bitmap, palette, (width + period - 1) // period, 1)
+    else:
+        result = (bitmap, palette, 1, (height + period - 1) // period)
+    _cache[key] = result
+    return result
+
+
+def gradient_tilegrid(start_color=0x000000, end_color=0xFFFFFF, width=320, height=240, x=0, y=0, **kwargs):
+    """
+    Return a TileGrid showing a cached gradient (see make_gradient for options).
+    The bitmap and palette are shared; each call only creates the TileGrid,
+    since a TileGrid can belong to one Group at a time.
+    """
+    bitmap, palette, across, down = make_gradient(start_color, end_color, width, height, **kwargs)
+    return displayio.TileGrid(bitmap, pixel_shader=palette, width=across, height=down,
+                              tile_width=bitmap.width, tile_height=bitmap.height, x=x, y=y)
+
+
+def clear_cache():
+    """Drop cached gradient bitmaps so their memory can be collected"""
+    _cache.clear()
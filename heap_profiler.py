@@ -0,0 +1,186 @@
+# heap_profiler.py
+"""
+Heap and allocation profiler for demo functions and helpers.
+Wrap functions with @heap.profile and blocks with `with heap.measure(name):`; every
+call records its time, the bytes it allocated, the bytes still held after it returned
+(after gc.collect()), the displayio objects it created and the lowest free heap, and
+print_table() prints one line per name, biggest holders first.
+
+    heap = HeapProfiler()
+
+    @heap.profile
+    def create_gradient(group, start_color, end_color):
+        ...
+
+    texts.fonts.loader = heap.profile(texts.fonts.loader, "load_font")  # cache misses only, not every lookup
+
+    with heap.measure("demo_pong_game"):
+        demo_pong_game()
+    heap.print_table()
+
+On the board the numbers come from gc.mem_alloc()/gc.mem_free(). "Allocated" is the
+rise in mem_alloc() up to the end of the call, before collecting, so a garbage
+collection during the call makes it a lower bound. displayio has no creation hook on
+the board, so it counts the displayio objects reachable from the return value.
+On the host (sim/) tracemalloc replaces gc: allocated is the traced peak, including
+the simulated Bitmap buffers, and displayio.created counts every object constructed.
+
+Calls nest: a function's numbers include the profiled calls it makes. collect=True
+(the default) collects before and after each call so held bytes are repeatable; it
+also collects the caller's garbage, so use collect=False around timing-critical code.
+Disabled profilers (enabled=False) call straight through.
+"""
+import gc
+import time
+import displayio
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+_HOST = not hasattr(gc, "mem_alloc") and tracemalloc is not None
+
+
+def _created():
+    """Objects constructed so far (simulated displayio only), else None"""
+    created = getattr(displayio, "created", None)
+    return sum(created.values()) if created is not None else None
+
+
+def _reachable(value, seen):
+    """Add the ids of displayio objects reachable from value (Groups, TileGrids, their bitmaps and shaders)"""
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            _reachable(item, seen)
+    elif isinstance(value, displayio.Group):
+        seen.add(id(value))
+        for layer in value:
+            _reachable(layer, seen)
+    elif isinstance(value, displayio.TileGrid):
+        seen.add(id(value))
+        seen.add(id(value.bitmap))
+        seen.add(id(value.pixel_shader))
+
+
+class _Measure:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.frame = None
+        self.result = None  # set to count the displayio objects reachable from it on the board
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.frame = self.profiler._enter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.frame is not None:
+            self.profiler._exit(self.name, self.frame, self.result)
+        return False
+
+
+class HeapProfiler:
+    """Per-name heap use of profiled calls: calls, ms, allocated, held, displayio objects, lowest free"""
+
+    def __init__(self, enabled=True, collect=True):
+        self.enabled = enabled
+        self.collect = collect
+        self._stats = {}  # name -> [calls, total ms, max allocated, total held, total objects, lowest free]
+        self._stack = []  # frames of the calls in progress: [start bytes, peak bytes, start ns, created]
+
+    def _used(self):
+        """(bytes in use, peak since the last reset or None)"""
+        if _HOST:
+            return tracemalloc.get_traced_memory()
+        return gc.mem_alloc(), None
+
+    def _enter(self):
+        if _HOST and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.collect:
+            gc.collect()
+        used, peak = self._used()
+        if _HOST:
+            # reset_peak() restarts the peak for this call; callers keep the highest one seen so far
+            for frame in self._stack:
+                frame[1] = max(frame[1], peak)
+            tracemalloc.reset_peak()
+        frame = [used, used, time.monotonic_ns(), _created()]
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, name, frame, result):
+        elapsed_ms = (time.monotonic_ns() - frame[2]) / 1e6
+        used, peak = self._used()
+        frame[1] = max(frame[1], used if peak is None else peak)
+        if self.collect:
+            gc.collect()
+            used = self._used()[0]
+        free = gc.mem_free() if hasattr(gc, "mem_free") else None
+        created = _created()
+        if created is not None:
+            objects = created - frame[3]
+        else:
+            seen = set()
+            _reachable(result, seen)
+            objects = len(seen)
+        if self._stack and self._stack[-1] is frame:
+            self._stack.pop()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+        entry = self._stats.get(name)
+        if entry is None:
+            entry = self._stats[name] = [0, 0.0, 0, 0, 0, None]
+        entry[0] += 1
+        entry[1] += elapsed_ms
+        entry[2] = max(entry[2], frame[1] - frame[0])
+        entry[3] += used - frame[0]
+        entry[4] += objects
+        if free is not None and (entry[5] is None or free < entry[5]):
+            entry[5] = free
+
+    def profile(self, function, name=None):
+        """Decorator: record every call of function under name (default: its __name__)"""
+        name = name or function.__name__
+
+        def profiled(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            frame = self._enter()
+            result = None
+            try:
+                result = function(*args, **kwargs)
+                return result
+            finally:
+                self._exit(name, frame, result)
+
+        try:
+            profiled.__name__ = function.__name__
+        except AttributeError:
+            pass  # MicroPython functions take no attributes
+        return profiled
+
+    def measure(self, name):
+        """Context manager recording the block under name"""
+        return _Measure(self, name)
+
+    def stats(self):
+        """{name: (calls, ms per call, max bytes allocated, bytes held per call, displayio objects per call,
+        lowest free or None)}"""
+        return {name: (calls, total_ms / calls, allocated, held // calls, objects / calls, free)
+                for name, (calls, total_ms, allocated, held, objects, free) in self._stats.items()}
+
+    def clear(self):
+        self._stats = {}
+
+    def print_table(self):
+        """Print one line per profiled name, biggest bytes held first"""
+        source = "tracemalloc" if _HOST else "gc"
+        print(f"🧠 Heap profile ({source}: name, calls, ms/call, max allocated, held/call, displayio/call, lowest free)")
+        stats = self.stats()
+        for name in sorted(stats, key=lambda key: -stats[key][3]):
+            calls, ms, allocated, held, objects, free = stats[name]
+            lowest = f"{free:,}" if free is not None else "-"
+            print(f"   {name:26} {calls:5} {ms:9.1f} {allocated:10,} {held:9,} {objects:7.1f} {lowest:>9}")
@@ -0,0 +1,116 @@
+# icon_atlas.py
+"""
+Icon atlases: icon glyphs pre-rendered into one 1-bit sprite-sheet Bitmap.
+Every icon is one tile of the sheet, drawn at the spot a Label of it would put its
+ink, so an icon is a 1x1 TileGrid on the sheet with its color's 2-entry Palette and
+showing a screen of icons needs no font, glyph lookups or per-icon Bitmaps. Tile 0
+is blank. The sheet holds each icon once, in whichever colors it is shown.
+
+tools/compile_icons.py builds the atlases from the ForkAwesome .pcf files on the host
+(build() and save()); the board only calls load() and icon().
+
+    atlas = icon_atlas.load("/icons/forkawesome-32.icn")
+    group.append(atlas.icon("\\uf004", 0xFF0000, x=20, y=48))   # where label(font, "\\uf004", x=20, y=48) draws
+
+Layout (little-endian): b"ICN2", tile width, tile height, tile count (HHH), the tile's
+offset from a label's (x, y) (hh), one codepoint per tile after the blank one (I each),
+then the sheet (tile count * tile width wide, tile height tall) as rows of whole bytes,
+one bit per pixel, most significant bit first.
+"""
+import struct
+import displayio
+import bitmaptools
+from scene_file import pack_rows
+
+MAGIC = b"ICN2"
+
+
+class IconAtlas:
+    """Sprite sheet of icons: a 1-bit tile per icon in one Bitmap, colored by a Palette per color"""
+
+    def __init__(self, bitmap, tile_width, tile_height, left, top, tiles):
+        self.bitmap = bitmap
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.left = left  # tile position relative to a label's (x, y)
+        self.top = top
+        self.tiles = tiles  # icon character -> tile index
+        self._palettes = {}  # color -> Palette with index 0 transparent
+
+    def _palette(self, color):
+        palette = self._palettes.get(color)
+        if palette is None:
+            palette = displayio.Palette(2)
+            palette.make_transparent(0)
+            palette[1] = color
+            self._palettes[color] = palette
+        return palette
+
+    def icon(self, char, color, x=0, y=0):
+        """1x1 TileGrid showing char in color where a label of it at (x, y) would"""
+        tile = self.tiles.get(char)
+        if tile is None:
+            raise ValueError(f"icon {ord(char):04x} is not in the atlas")
+        return displayio.TileGrid(self.bitmap, pixel_shader=self._palette(color), width=1, height=1,
+                                  tile_width=self.tile_width, tile_height=self.tile_height, default_tile=tile,
+                                  x=x + self.left, y=y + self.top)
+
+
+def build(font, chars):
+    """Render icon characters from a bitmap font into an atlas, each placed as text_cache.render() places it"""
+    keys = []
+    for char in chars:
+        if char not in keys:
+            keys.append(char)
+    if hasattr(font, "load_glyphs"):
+        font.load_glyphs("".join(keys))
+    glyphs = [font.get_glyph(ord(char)) for char in keys]
+    for char, glyph in zip(keys, glyphs):
+        if glyph is None:
+            raise ValueError(f"the font has no glyph {ord(char):04x}")
+    # A label puts the baseline half the ascent below its y (text_cache.render)
+    if hasattr(font, "ascent"):
+        ascent = font.ascent
+    else:
+        _, height, _, y_offset = font.get_bounding_box()
+        ascent = height + y_offset
+    tops = [ascent // 2 - glyph.dy - glyph.height for glyph in glyphs]
+    left = min(glyph.dx for glyph in glyphs)
+    top = min(tops)
+    tile_width = max(glyph.dx + glyph.width for glyph in glyphs) - left
+    tile_height = max(t + glyph.height for t, glyph in zip(tops, glyphs)) - top
+    bitmap = displayio.Bitmap(tile_width * (len(keys) + 1), tile_height, 2)
+    for tile, (glyph, glyph_top) in enumerate(zip(glyphs, tops), 1):
+        x0 = tile * tile_width + glyph.dx - left
+        y0 = glyph_top - top
+        x1 = glyph.tile_index * glyph.width  # built-in fonts keep every glyph in one bitmap
+        for y in range(glyph.height):
+            for x in range(glyph.width):
+                if glyph.bitmap[x1 + x, y]:
+                    bitmap[x0 + x, y0 + y] = 1
+    return IconAtlas(bitmap, tile_width, tile_height, left, top, {char: tile for tile, char in enumerate(keys, 1)})
+
+
+def save(path, atlas):
+    """Write an atlas to path; returns the number of icon tiles"""
+    bitmap = atlas.bitmap
+    count = bitmap.width // atlas.tile_width
+    keys = sorted(atlas.tiles, key=atlas.tiles.get)
+    with open(path, "wb") as file:
+        file.write(MAGIC + struct.pack("<HHHhh", atlas.tile_width, atlas.tile_height, count, atlas.left, atlas.top))
+        file.write(struct.pack(f"<{len(keys)}I", *(ord(char) for char in keys)))
+        file.write(pack_rows(bitmap, 1))
+    return len(keys)
+
+
+def load(path):
+    """Read an atlas written by save()"""
+    with open(path, "rb") as file:
+        if file.read(4) != MAGIC:
+            raise ValueError(f"{path} is not an icon atlas")
+        tile_width, tile_height, count, left, top = struct.unpack("<HHHhh", file.read(10))
+        codepoints = struct.unpack(f"<{count - 1}I", file.read(4 * (count - 1)))
+        bitmap = displayio.Bitmap(tile_width * count, tile_height, 2)
+        bitmaptools.readinto(bitmap, file, 1, element_size=1)
+    return IconAtlas(bitmap, tile_width, tile_height, left, top,
+                     {chr(codepoint): tile for tile, codepoint in enumerate(codepoints, 1)})
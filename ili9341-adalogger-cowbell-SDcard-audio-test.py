@@ -3,26 +3,26 @@
 CircuitPython test for ILI9341 SPI display + Adalogger Cowbell (SD card) + audio.
 - Displays a message with a styled frame
 - Mounts SD card with MP3s in /sd/robot_sounds/
-- Plays 3 MP3s using audiomp3 and AudioOut
+- Plays 3 MP3s using audiomp3 and AudioOut, without blocking the display
 """
+from boot_timer import boot
 import board
 import busio
-import sdcardio
-import storage
 import time
-import digitalio
 import displayio
 import pwmio
-import terminalio
-from audiomp3 import MP3Decoder
-from adafruit_display_text import label
 import adafruit_ili9341
+from spi_arbiter import BusArbiter, DisplayRefresher
 
 # --- Display Setup ---
 displayio.release_displays()
 
-# Shared SPI bus for display and SD card
+# Shared SPI bus for display and SD card. Python-side bus work goes through the
+# arbiter, SD reads for audio ahead of display refreshes.
 spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=board.GP16)
+bus = BusArbiter(spi)
+sd_client = bus.client("sd", priority=0)
+display_client = bus.client("display", priority=1)
 
 # Display control pins
 tft_cs = board.GP20
@@ -49,22 +49,35 @@ display = adafruit_ili9341.ILI9341(
     backlight_pin=None  # we control it manually
 )
 
+boot.mark("display")
+
+# Fast boot: a raw splash frame goes straight from flash to the panel while the label, SD card
+# and audio modules load. Make one for this app: python tools/convert_images.py splash.png --format raw565
+BOOT_SPLASH = None  # e.g. "/splash.565"
+if BOOT_SPLASH:
+    boot.splash(display, display_bus, BOOT_SPLASH)
+
+import asyncio
+import sdcardio
+import storage
+import digitalio
+import terminalio
+from adafruit_display_text import label
+from refresh_profiler import RefreshProfiler
+from compositor import Compositor
+from primitives import shapes
+from audio_player import AudioPlayer
+boot.mark("imports")
+
 # Create display group
 splash = displayio.Group()
-display.root_group = splash
 
 # Frame (purple)
-frame_bitmap = displayio.Bitmap(320, 240, 1)
-frame_palette = displayio.Palette(1)
-frame_palette[0] = 0x800080  # Purple
-frame = displayio.TileGrid(frame_bitmap, pixel_shader=frame_palette)
+frame = shapes.fill(0x800080)  # Purple
 splash.append(frame)
 
 # Background (blue inset)
-bg_bitmap = displayio.Bitmap(290, 210, 1)
-bg_palette = displayio.Palette(1)
-bg_palette[0] = 0x0033FF  # Blue
-bg = displayio.TileGrid(bg_bitmap, pixel_shader=bg_palette, x=15, y=15)
+bg = shapes.rect(15, 15, 290, 210, 0x0033FF)  # Blue
 splash.append(bg)
 
 # Centered label
@@ -78,15 +91,32 @@ text = label.Label(
 )
 splash.append(text)
 
+# Now playing line, updated while audio plays
+status = label.Label(terminalio.FONT, text="", color=0xFFFFFF, scale=1, anchor_point=(0.5, 0.5),
+                     anchored_position=(display.width // 2, display.height // 2 + 40))
+splash.append(status)
+
+# Time the first full-screen refresh and the SPI bytes it costs
+profiler = RefreshProfiler(display, display_bus)
+profiler.label = "splash"
+# Retained root: later refreshes only send what the labels changed
+compositor = Compositor(display, profiler)
+compositor.present(splash)
+with display_client:
+    compositor.refresh()
+boot.finish("first screen")
+profiler.print_summary()
+
 print("✅ ILI9341 Display initialized")
 
 # --- SD Card Setup ---
 SD_CS = board.GP17
 
 try:
-    sdcard = sdcardio.SDCard(spi, SD_CS)
-    vfs = storage.VfsFat(sdcard)
-    storage.mount(vfs, "/sd")
+    with sd_client:
+        sdcard = sdcardio.SDCard(spi, SD_CS)
+        vfs = storage.VfsFat(sdcard)
+        storage.mount(vfs, "/sd")
     print("😎 SD card mounted")
 except Exception as e:
     print("❌ SD card mount failed:", e)
@@ -108,29 +138,39 @@ audio = AudioOut(board.GP3)  # Speaker on GP3
 
 # --- MP3 Playback ---
 path = "/sd/robot_sounds/"
-filename = "0.mp3"
-try:
-    mp3_file = open(path + filename, "rb")
-    decoder = MP3Decoder(mp3_file)
-except Exception as e:
-    print("❌ Failed to open initial MP3 file:", e)
-    while True:
-        pass
 
-def play_mp3(filename):
-    try:
-        decoder.file = open(path + filename, "rb")
-        audio.play(decoder)
-        print(f"🎵 Playing {filename}")
-        while audio.playing:
-            pass
-    except Exception as e:
-        print(f"❌ Error playing {filename}:", e)
+# Label changes only mark the screen; the refresher sends them in one burst every 0.25 s
+refresher = DisplayRefresher(display, display_client, interval=0.25, refresh=compositor.refresh)
+
+
+def show_track(name):
+    status.text = f"Playing {name}" if name else "Done"
+    refresher.request()
+
+
+def show_progress(player):
+    """Runs between audio polls; only touches the label when the shown second changes"""
+    text = f"Playing {player.current[0]}  {int(player.elapsed)} s"
+    if status.text != text:
+        status.text = text
+        refresher.request()
+
+
+player = AudioPlayer(audio, path, on_tick=show_progress, on_track=show_track, bus=sd_client)
+player.enqueue("0.mp3", "1.mp3", "2.mp3")
+
+
+async def main():
+    refresh_task = asyncio.create_task(refresher.run())
+    await player.play()
+    refresher.stop()
+    await refresh_task
+
 
 print("🐮 Cowbell Adalogger SD Test")
-play_mp3("0.mp3")
-play_mp3("1.mp3")
-play_mp3("2.mp3")
+asyncio.run(main())
+print(f"✅ Played {player.played} tracks, {player.errors} errors, {refresher.refreshes} display refreshes")
+bus.print_stats()
 
 while True:
-    pass
+    time.sleep(1)
@@ -7,8 +7,9 @@ Wiring of display should not conflict with either Adalogger Cowbell
 or the Camerra Cowbell used here
 """
 
-import time, board, busio, digitalio, displayio, pwmio
-import adafruit_ov5640, adafruit_ili9341
+from boot_timer import boot
+import board, busio, digitalio, displayio, pwmio
+import adafruit_ili9341
 
 displayio.release_displays()
 # Shared SPI bus for display and SD card
@@ -36,6 +37,22 @@ display = adafruit_ili9341.ILI9341(display_bus,
                                    rowstart=0,
                                    backlight_pin=None  # we're using pwmio manually
                                    )
+boot.mark("display")
+
+# Fast boot: a raw splash frame goes straight from flash to the panel while the camera driver
+# and the pipeline modules load. Make one for this app turned for rotation 180, so it streams
+# without conversion: python tools/convert_images.py splash.png --format raw565 --rotation 180
+BOOT_SPLASH = None  # e.g. "/splash.565"
+if BOOT_SPLASH:
+    boot.splash(display, display_bus, BOOT_SPLASH)
+
+import adafruit_ov5640
+from refresh_profiler import RefreshProfiler
+from compositor import Compositor
+from camera_resolution import ResolutionManager
+from frame_stats import FrameStats
+from frame_recorder import FrameRecorder, FramePlayer
+boot.mark("imports")
 
 # === I2C + Camera Setup ===
 i2c = busio.I2C(scl=board.GP5, sda=board.GP4)
@@ -64,6 +81,7 @@ cam = adafruit_ov5640.OV5640(
 )
 
 print("Camera ID:", cam.chip_id)
+boot.mark("camera")
 
 # === Camera Settings ===
 cam.colorspace = adafruit_ov5640.OV5640_COLOR_RGB
@@ -71,33 +89,75 @@ cam.flip_y = True
 cam.flip_x = False
 cam.test_pattern = False
 
-# === Create Bitmap Buffer to Hold Camera Output ===
-try:
-    bitmap = displayio.Bitmap(cam.width, cam.height, 65535)
-except MemoryError:
-    print("MemoryError: falling back to smaller camera size")
-    cam.size = adafruit_ov5640.OV5640_SIZE_QCIF  # 176x144
-    bitmap = displayio.Bitmap(cam.width, cam.height, 65535)
-
-# === Prepare Display Group ===
-g = displayio.Group(scale=1, x=(display.width - cam.width) // 2, y=(display.height - cam.height) // 2)
-tg = displayio.TileGrid(
-    bitmap,
-    pixel_shader=displayio.ColorConverter(input_colorspace=displayio.Colorspace.RGB565_SWAPPED)
-)
-g.append(tg)
-display.root_group = g
+# === Pipeline Settings ===
+# "single": capture then refresh (original behaviour)
+# "double": sensor fills one buffer while the other goes out over SPI (needs RAM for 2 frames)
+# "diff":   only tiles that changed since the last frame are copied and refreshed
+PIPELINE_MODE = "single"
+CAMERA_CROP = None  # (x1, y1, x2, y2) of a QVGA frame to update, None = whole frame
+TARGET_FPS = None  # e.g. 10: step down the resolution ladder when slower than this, None = never
+PROFILE_REFRESH = False  # True prints the refresh/SPI profile every 100 frames
+STATS_EVERY = 60  # print capture/refresh/frame timing every N frames
+PROCESSING = ()  # e.g. ("blur", "edges"): ulab stages run on every frame (frame_processing.py)
+RECORD_PATH = None  # e.g. "/sd/camera.rec" records the preview to the Adalogger Cowbell's SD card
+RECORD_SECONDS = 10  # then the recording is closed, played back once and the live preview resumes
+RECORD_RING_BYTES = 16 * 1024  # RAM buffering frames between SD writes of 4 KB
+
+profiler = RefreshProfiler(display, display_bus, capacity=100)
+profiler.label = "camera"
+# Frames are refreshed through the compositor: only each frame's changed area is sent
+compositor = Compositor(display, profiler)
+
+# === Frame Processing (ulab), only when PROCESSING lists stages ===
+processor = None
+if PROCESSING:
+    from frame_processing import FrameProcessor
+    processor = FrameProcessor(PROCESSING)
+
+# === SD Card (Adalogger Cowbell), only when recording ===
+recorder = None
+if RECORD_PATH:
+    import sdcardio, storage
+    sdcard = sdcardio.SDCard(spi, board.GP17)
+    storage.mount(storage.VfsFat(sdcard), "/sd")
+    recorder = FrameRecorder(RECORD_PATH, ring_bytes=RECORD_RING_BYTES)
+    # diff mode records only the rows that changed, double mode every pixel of every frame
+    print(f"📼 Recording {RECORD_SECONDS} s to {RECORD_PATH}")
+
+# === Pick the Largest Camera Size that Fits in RAM ===
+# Walks QVGA, HQVGA, QVGA gray, QCIF, ... and scales/centers the frame on the display
+# The loop only goes through resolution.pipeline so a step down can free the old frame buffers
+resolution = ResolutionManager(cam, display, mode=PIPELINE_MODE, target_fps=TARGET_FPS, crop=CAMERA_CROP,
+                               compositor=compositor, recorder=recorder, processor=processor,
+                               reserve=16 * 1024 + (RECORD_RING_BYTES if recorder else 0))
+resolution.choose()
+boot.mark("pipeline")
 
 # === Main Camera Loop ===
-display.auto_refresh = False
-t0 = time.monotonic_ns()
+stats = FrameStats(("capture", "process", "refresh", "record"), window=STATS_EVERY, report_every=STATS_EVERY,
+                   label="camera")
+resolution.pipeline.start()
 
 print("Camera code running!")
+stats.start()
 
 while True:
-    cam.capture(bitmap)
-    bitmap.dirty()
-    display.refresh(minimum_frames_per_second=0)
-    t1 = time.monotonic_ns()
-    print("FPS:", round(1e9 / (t1 - t0), 2))
-    t0 = t1
+    resolution.pipeline.step()
+    boot.finish("first frame")
+    stats.add("capture", resolution.pipeline.capture_ns)
+    stats.add("process", resolution.pipeline.process_ns)
+    stats.add("refresh", resolution.pipeline.refresh_ns)
+    stats.add("record", resolution.pipeline.record_ns)
+    # Keep the frame size while recording: a step down would end the recording
+    if stats.end_frame() and not recorder and resolution.update(stats.fps()):
+        stats.start()
+    if recorder and recorder.duration() >= RECORD_SECONDS:
+        recorder.close()
+        recorder = resolution.pipeline.recorder = resolution.pipeline_kwargs["recorder"] = None
+        print("📼 Playing back")
+        with FramePlayer(RECORD_PATH) as player:
+            resolution.pipeline.play(player)
+        stats.start()
+    if PROFILE_REFRESH and len(profiler) == profiler.capacity:
+        profiler.print_summary()
+        profiler.clear()
@@ -0,0 +1,302 @@
+# image_stream.py
+"""
+Stream full-screen images straight into the display's RAM, a band of rows at a time.
+
+OnDiskBitmap keeps the file open and re-reads it on every refresh that touches the
+image. blit() instead reads the file once, converts each band of rows to RGB565
+in a buffer of band_rows lines and sends it into the panel's address window
+(RAMWR for the first band, Write Memory Continue for the rest), bypassing displayio.
+
+Formats:
+  .bmp   1/4/8-bit palettized, 16-bit (565 or 555) and 24/32-bit BMP files, converted per row,
+         and 8-bit RLE BMP files (decoded in file order, each band sent to its own window)
+  raw    b"R565" + width, height (<HH) + big-endian RGB565 rows, top row first: the
+         panel's own byte order (RGB565_SWAPPED in displayio), sent without conversion
+         b"R180" + the same header: the image turned 180 degrees (bottom row first, each
+         row right to left), so a display at rotation 180 gets it without conversion too
+
+BMP rows go through a per-pixel Python conversion (and so do raw rows saved for the
+other rotation), which is slow on the board: stream raw files made for the display's
+rotation with save_raw() or tools/convert_images.py, and show BMPs with
+displayio.OnDiskBitmap.
+
+Because displayio does not know about the pixels, blit() turns auto_refresh off and
+leaves it off, and leaves the current root_group alone. Nothing redraws over the
+image until the script refreshes again; with compositor.py, call invalidate() after
+a blit so that refresh repaints the whole screen. Rotation 0 and 180 are supported.
+"""
+import struct
+import time
+
+CASET = 0x2A
+PASET = 0x2B
+RAMWR = 0x2C
+RAMWR_CONTINUE = 0x3C
+RAW_MAGIC = b"R565"
+RAW_ROTATED_MAGIC = b"R180"
+RAW_HEADER = 8
+
+
+class ImageInfo:
+    """Header of an image file: size, format and where its rows are"""
+
+    def __init__(self, width, height, kind, offset, stride, bpp=16, bottom_up=False, palette=None, masks=None,
+                 rle=False, rotation=0):
+        self.width = width
+        self.height = height
+        self.kind = kind  # "raw" or "bmp"
+        self.offset = offset
+        self.stride = stride
+        self.bpp = bpp
+        self.bottom_up = bottom_up
+        self.palette = palette  # bytes of big-endian RGB565 per index, for palettized BMPs
+        self.masks = masks  # 16-bit BMP: True for 565, False for 555
+        self.rle = rle  # 8-bit BMP with RLE8 compression
+        self.rotation = rotation  # raw: 180 when the pixels are stored turned around
+
+
+def read_info(file):
+    """Parse the header of a raw RGB565 or BMP file"""
+    file.seek(0)
+    head = file.read(RAW_HEADER)
+    if head[:4] in (RAW_MAGIC, RAW_ROTATED_MAGIC):
+        width, height = struct.unpack("<HH", head[4:8])
+        rotation = 180 if head[:4] == RAW_ROTATED_MAGIC else 0
+        return ImageInfo(width, height, "raw", RAW_HEADER, width * 2, rotation=rotation)
+    if head[:2] != b"BM":
+        raise ValueError("Not a BMP or raw RGB565 file")
+    file.seek(10)
+    offset, header_size, width, height, _, bpp, compression = struct.unpack("<IIiiHHI", file.read(24))
+    rle = compression == 1 and bpp == 8
+    if compression not in (0, 3) and not rle:
+        raise ValueError("Only RLE8 compressed BMP files are supported")
+    stride = (width * bpp + 31) // 32 * 4
+    palette = None
+    masks = None
+    if bpp <= 8:
+        file.seek(46)
+        count = struct.unpack("<I", file.read(4))[0] or (1 << bpp)
+        file.seek(14 + header_size)
+        entries = file.read(4 * count)
+        palette = bytearray(2 * count)
+        for i in range(count):
+            b, g, r = entries[4 * i], entries[4 * i + 1], entries[4 * i + 2]
+            palette[2 * i] = (r & 0xF8) | (g >> 5)
+            palette[2 * i + 1] = ((g << 3) & 0xE0) | (b >> 3)
+    elif bpp == 16:
+        masks = False
+        if compression == 3:
+            file.seek(54)
+            masks = struct.unpack("<I", file.read(4))[0] == 0xF800
+    return ImageInfo(width, abs(height), "bmp", offset, stride, bpp, height > 0, palette, masks, rle)
+
+
+def _convert_row(info, row, out, start, reverse):
+    """Convert one BMP row into big-endian RGB565 at out[start:]"""
+    width, bpp = info.width, info.bpp
+    step = -2 if reverse else 2
+    o = start + 2 * (width - 1) if reverse else start
+    if bpp >= 24:
+        size = bpp // 8
+        for i in range(0, width * size, size):
+            b, g, r = row[i], row[i + 1], row[i + 2]
+            out[o] = (r & 0xF8) | (g >> 5)
+            out[o + 1] = ((g << 3) & 0xE0) | (b >> 3)
+            o += step
+    elif bpp == 16:
+        for i in range(0, width * 2, 2):
+            value = row[i] | (row[i + 1] << 8)
+            if not info.masks:
+                value = ((value & 0x7FE0) << 1) | (value & 0x1F)
+            out[o] = value >> 8
+            out[o + 1] = value & 0xFF
+            o += step
+    else:
+        palette = info.palette
+        mask = (1 << bpp) - 1
+        for x in range(width):
+            bit = x * bpp
+            index = 2 * ((row[bit >> 3] >> (8 - bpp - (bit & 7))) & mask)
+            out[o] = palette[index]
+            out[o + 1] = palette[index + 1]
+            o += step
+
+
+def _reverse_pixels(band, length):
+    """Reverse the order of 2-byte pixels in band[:length] in place"""
+    i, j = 0, length - 2
+    while i < j:
+        band[i], band[i + 1], band[j], band[j + 1] = band[j], band[j + 1], band[i], band[i + 1]
+        i += 2
+        j -= 2
+
+
+def _rle8_rows(file, info):
+    """Decode an RLE8 BMP one row of palette indices at a time, in file order (bottom row first)"""
+    width = info.width
+    row = bytearray(width)
+    x = 0
+    rows = 0
+    chunk = b""
+    pos = 0
+
+    def take(count):
+        nonlocal chunk, pos
+        if pos + count > len(chunk):
+            chunk = chunk[pos:] + file.read(max(512, count))
+            pos = 0
+        data = chunk[pos:pos + count]
+        pos += count
+        return data
+
+    while rows < info.height:
+        count, value = take(2)
+        if count:
+            end = min(width, x + count)
+            row[x:end] = bytes((value,)) * (end - x)
+            x = end
+        elif value == 0 or value == 1:  # end of line / end of bitmap
+            yield row
+            rows += 1
+            row[:] = bytes(width)
+            x = 0
+            if value == 1:
+                while rows < info.height:
+                    yield row
+                    rows += 1
+        elif value == 2:  # delta: skipped pixels stay index 0
+            dx, dy = take(2)
+            for _ in range(dy):
+                yield row
+                rows += 1
+                row[:] = bytes(width)
+            x = min(width, x + dx)
+        else:  # absolute run of `value` indices, padded to 16 bits
+            data = take(value + (value & 1))
+            end = min(width, x + value)
+            row[x:end] = data[:end - x]
+            x = end
+
+
+def _blit_rle8(display_bus, file, info, x, y, band_rows, flip, band):
+    """Send an RLE8 BMP band by band as it decodes; returns (bus bytes, commands)"""
+    width, height = info.width, info.height
+    palette = info.palette
+    file.seek(info.offset)
+    sent = commands = 0
+    filled = 0
+    image_row = height  # image rows decode from the bottom up
+    for indices in _rle8_rows(file, info):
+        image_row -= 1
+        # Rows fill the band from its bottom; with rotation 180 the panel shows them top first
+        slot = filled if flip else band_rows - 1 - filled
+        o = slot * width * 2
+        for i in (range(width - 1, -1, -1) if flip else range(width)):
+            index = 2 * indices[i]
+            band[o] = palette[index]
+            band[o + 1] = palette[index + 1]
+            o += 2
+        filled += 1
+        if filled == band_rows or image_row == 0:
+            if flip:
+                top, data = y + height - 1 - image_row - (filled - 1), memoryview(band)[:filled * width * 2]
+            else:
+                top, data = y + image_row, memoryview(band)[(band_rows - filled) * width * 2:]
+            display_bus.send(CASET, struct.pack(">HH", x, x + width - 1))
+            display_bus.send(PASET, struct.pack(">HH", top, top + filled - 1))
+            display_bus.send(RAMWR, data)
+            sent += 11 + len(data)
+            commands += 3
+            filled = 0
+    return sent, commands
+
+
+def blit(display, display_bus, path, x=0, y=0, band_rows=8):
+    """
+    Stream the image at path onto the display at (x, y).
+    Returns {"format", "width", "height", "ms", "bus_bytes", "commands", "buffer_bytes"}.
+    """
+    start_ns = time.monotonic_ns()
+    rotation = getattr(display, "rotation", 0)
+    if rotation not in (0, 180):
+        raise ValueError("blit supports rotation 0 and 180")
+    with open(path, "rb") as file:
+        info = read_info(file)
+        width, height = info.width, info.height
+        if x < 0 or y < 0 or x + width > display.width or y + height > display.height:
+            raise ValueError(f"{width}x{height} image at ({x}, {y}) does not fit the display")
+        band_rows = max(1, min(band_rows, height))
+        band = bytearray(width * 2 * band_rows)
+        row_buffer = bytearray(info.stride * band_rows) if info.kind == "bmp" and not info.rle else None
+        flip = rotation == 180
+        if flip:
+            x, y = display.width - x - width, display.height - y - height
+        display.auto_refresh = False
+        if info.rle:
+            sent, commands = _blit_rle8(display_bus, file, info, x, y, band_rows, flip, band)
+            return _stats(info, start_ns, sent, commands, len(band))
+        display_bus.send(CASET, struct.pack(">HH", x, x + width - 1))
+        display_bus.send(PASET, struct.pack(">HH", y, y + height - 1))
+        sent = 10
+        commands = 2
+        command = RAMWR
+        # A raw file saved for the display's rotation is already in panel order
+        reverse = flip != (info.rotation == 180)
+        # Bands in panel order (top first); with rotation 180 that is the image's bottom rows first
+        for panel_row in range(0, height, band_rows):
+            rows = min(band_rows, height - panel_row)
+            length = width * 2 * rows
+            if info.kind == "raw":
+                first = height - panel_row - rows if reverse else panel_row  # first file row of the band
+                file.seek(info.offset + first * info.stride)
+                file.readinto(memoryview(band)[:length])
+                if reverse:
+                    _reverse_pixels(band, length)
+            else:
+                first = height - panel_row - rows if flip else panel_row  # first image row of the band
+                # Rows of the band are contiguous in the file; bottom-up files store them last row first
+                file_row = height - first - rows if info.bottom_up else first
+                file.seek(info.offset + file_row * info.stride)
+                file.readinto(memoryview(row_buffer)[:info.stride * rows])
+                for i in range(rows):
+                    in_band = rows - 1 - i if flip else i
+                    in_file = rows - 1 - i if info.bottom_up else i
+                    row = memoryview(row_buffer)[in_file * info.stride:(in_file + 1) * info.stride]
+                    _convert_row(info, row, band, in_band * width * 2, flip)
+            display_bus.send(command, memoryview(band)[:length])
+            sent += 1 + length
+            commands += 1
+            command = RAMWR_CONTINUE
+    return _stats(info, start_ns, sent, commands, len(band) + len(row_buffer or b""))
+
+
+def _stats(info, start_ns, sent, commands, buffer_bytes):
+    return {
+        "format": info.kind if info.kind == "raw" else f"bmp{info.bpp}{'-rle' if info.rle else ''}",
+        "width": info.width,
+        "height": info.height,
+        "ms": (time.monotonic_ns() - start_ns) / 1e6,
+        "bus_bytes": sent,
+        "commands": commands,
+        "buffer_bytes": buffer_bytes,
+    }
+
+
+def save_raw(path, raw_path, band_rows=8, rotation=0):
+    """Convert a BMP into a raw RGB565 file once, so later blits skip the conversion (rotation: the display's)"""
+    if rotation not in (0, 180):
+        raise ValueError("save_raw supports rotation 0 and 180")
+    flip = rotation == 180
+    with open(path, "rb") as file, open(raw_path, "wb") as out:
+        info = read_info(file)
+        if info.kind == "raw" or info.rle:
+            raise ValueError(f"{path} is raw RGB565 or RLE compressed, save_raw needs an uncompressed BMP")
+        out.write((RAW_ROTATED_MAGIC if flip else RAW_MAGIC) + struct.pack("<HH", info.width, info.height))
+        band = bytearray(info.width * 2)
+        row = bytearray(info.stride)
+        for out_row in range(info.height):
+            image_row = info.height - 1 - out_row if flip else out_row
+            file.seek(info.offset + (info.height - 1 - image_row if info.bottom_up else image_row) * info.stride)
+            file.readinto(row)
+            _convert_row(info, row, band, 0, flip)
+            out.write(band)
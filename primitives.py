@@ -0,0 +1,149 @@
+# primitives.py
+"""
+Pooled solid-color primitives for displayio.
+A solid rectangle needs a 1-value Bitmap of its size and a 1-color Palette; the pool
+keeps one Bitmap per size and one Palette per color and hands out TileGrids that
+share them, so a screen of twelve color bars holds one Bitmap instead of twelve,
+and the white background of one screen is the black background of the next.
+
+Pooled Bitmaps and Palettes are shared: never draw into them or change their colors.
+Every TileGrid handed out holds a reference on its Bitmap and Palette until the
+screen it is in is given back with release() (once per screen). Entries nobody
+references stay pooled for the next screen and are evicted least recently used
+first once the pool holds more than budget_bytes.
+
+    background = shapes.fill(0xFFFFFF)
+    bar = shapes.rect(0, 30, 26, 180, 0xFF0000)
+    rule = shapes.line(10, 200, 310, 200, 0x888888, thickness=2)
+    ...
+    shapes.release(old_screen)
+    shapes.report()  # rects handed out since the last report and the allocations they saved
+"""
+import displayio
+
+# Rough bookkeeping per pooled object (object header, key tuple, list) on top of pixel data
+_ENTRY_OVERHEAD = 64
+_PALETTE_BYTES = 32
+
+
+def bitmap_bytes(width, height):
+    """RAM held by a 1-value Bitmap (1 bit per pixel, rows 32-bit aligned)"""
+    return (width + 31) // 32 * 4 * height + _ENTRY_OVERHEAD
+
+
+class PrimitivePool:
+    """Reference-counted Bitmaps per size and Palettes per color, shared by solid rect/line/fill TileGrids"""
+
+    def __init__(self, budget_bytes=16 * 1024):
+        self.budget_bytes = budget_bytes
+        # Recency is a use count per entry, since MicroPython dicts do not keep insertion order
+        self._entries = {}  # (width, height) or color -> [Bitmap or Palette, references, bytes, last use]
+        self._uses = 0
+        self._keys = {}  # id(Bitmap or Palette) -> its key in _entries
+        self.bytes_resident = 0
+        self.rects = 0
+        self.allocations = 0
+        self.evictions = 0
+        self._reported = (0, 0)  # rects and allocations at the last report()
+
+    def _acquire(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            if isinstance(key, tuple):
+                obj = displayio.Bitmap(key[0], key[1], 1)
+                size = bitmap_bytes(key[0], key[1])
+            else:
+                obj = displayio.Palette(1)
+                obj[0] = key
+                size = _PALETTE_BYTES
+            entry = self._entries[key] = [obj, 0, size, 0]
+            self._keys[id(obj)] = key
+            self.bytes_resident += size
+            self.allocations += 1
+        self._uses += 1
+        entry[3] = self._uses
+        entry[1] += 1
+        return entry[0]
+
+    def rect(self, x, y, width, height, color):
+        """TileGrid filling width x height pixels at (x, y) with color"""
+        if width < 1 or height < 1:
+            raise ValueError("rect needs a width and height of at least 1")
+        bitmap = self._acquire((width, height))
+        grid = displayio.TileGrid(bitmap, pixel_shader=self._acquire(color), x=x, y=y)
+        self.rects += 1
+        self._evict()
+        return grid
+
+    def fill(self, color, width=320, height=240):
+        """Background TileGrid covering the screen with color"""
+        return self.rect(0, 0, width, height, color)
+
+    def line(self, x1, y1, x2, y2, color, thickness=1):
+        """Horizontal or vertical line from (x1, y1) to (x2, y2), ends included, thickness pixels wide"""
+        if y1 == y2:
+            return self.rect(min(x1, x2), y1 - thickness // 2, abs(x2 - x1) + 1, thickness, color)
+        if x1 == x2:
+            return self.rect(x1 - thickness // 2, min(y1, y2), thickness, abs(y2 - y1) + 1, color)
+        raise ValueError("pooled lines are horizontal or vertical")
+
+    def release(self, item):
+        """Give back the pooled TileGrids under item (a Group, TileGrid, or a tuple or list of them)"""
+        if isinstance(item, (tuple, list)):
+            for part in item:
+                self.release(part)
+        elif isinstance(item, displayio.Group):
+            for layer in item:
+                self.release(layer)
+        elif isinstance(item, displayio.TileGrid):
+            bitmap_key, palette_key = self._keys.get(id(item.bitmap)), self._keys.get(id(item.pixel_shader))
+            if bitmap_key is not None and palette_key is not None:
+                for key in (bitmap_key, palette_key):
+                    entry = self._entries[key]
+                    entry[1] = max(0, entry[1] - 1)
+                self._evict()
+
+    def _evict(self):
+        """Drop unreferenced entries, least recently used first, until under budget"""
+        if self.bytes_resident <= self.budget_bytes:
+            return
+        unused = [(entry[3], key) for key, entry in self._entries.items() if not entry[1]]
+        unused.sort(key=lambda item: item[0])
+        for _, key in unused:
+            self._drop(key)
+            self.evictions += 1
+            if self.bytes_resident <= self.budget_bytes:
+                return
+
+    def _drop(self, key):
+        obj, _, size, _ = self._entries.pop(key)
+        del self._keys[id(obj)]
+        self.bytes_resident -= size
+
+    def clear(self):
+        """Drop every unreferenced entry"""
+        for key in [key for key, entry in self._entries.items() if not entry[1]]:
+            self._drop(key)
+
+    def report(self, log=True):
+        """
+        Rects handed out since the last report, the Bitmaps and Palettes created for them and the
+        allocations saved against a Bitmap and Palette per rect; printed when log is set and there were any
+        """
+        rects, allocations = self.rects - self._reported[0], self.allocations - self._reported[1]
+        self._reported = (self.rects, self.allocations)
+        counts = {"rects": rects, "allocations": allocations, "saved": 2 * rects - allocations}
+        if log and rects:
+            print(f"🧱 {rects} pooled rects: {allocations} allocations, {counts['saved']} saved, "
+                  f"{self.bytes_resident:,} bytes pooled")
+        return counts
+
+    def stats(self):
+        """Counters as a dict, handy for printing over serial"""
+        return {"entries": len(self._entries), "rects": self.rects, "allocations": self.allocations,
+                "saved": 2 * self.rects - self.allocations, "evictions": self.evictions,
+                "bytes_resident": self.bytes_resident, "budget_bytes": self.budget_bytes}
+
+
+# Shared pool used by the demo scripts
+shapes = PrimitivePool()
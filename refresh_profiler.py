@@ -0,0 +1,132 @@
+# refresh_profiler.py
+"""
+Refresh profiling for displayio displays on the shared SPI bus.
+Wrap display.refresh() with RefreshProfiler.refresh() to record, per refresh:
+wall time, dirty area, bytes and commands sent over the bus. Records go into a
+fixed-size ring buffer that can be printed over serial or written to a file.
+
+On the board displayio drives the bus from C, so bytes and dirty area are
+estimated (full screen after a root_group change, or the area passed in).
+Under the simulator in sim/ the exact bus counters and dirty areas are used.
+"""
+import time
+
+# CASET + 4 bytes, PASET + 4 bytes, RAMWR: bytes of commands around every window
+WINDOW_OVERHEAD = 11
+WINDOW_COMMANDS = 3
+
+
+def area_pixels(areas):
+    return sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in areas)
+
+
+def area_bytes(areas, bytes_per_pixel=2):
+    return sum(WINDOW_OVERHEAD + (x2 - x1) * (y2 - y1) * bytes_per_pixel for x1, y1, x2, y2 in areas)
+
+
+class RefreshProfiler:
+    """Times display refreshes and keeps the last `capacity` records in a ring buffer"""
+
+    FIELDS = ("seq", "label", "time_ms", "refresh_ms", "dirty_px", "bytes", "commands", "exact")
+
+    def __init__(self, display, bus=None, capacity=64):
+        self.display = display
+        self.bus = bus
+        self.label = ""
+        self.capacity = capacity
+        self._ring = [None] * capacity
+        self._count = 0
+        self._last_group = None
+        self._start_ns = time.monotonic_ns()
+
+    def _bus_counters(self):
+        bus = self.bus if self.bus is not None else getattr(self.display, "bus", None)
+        if bus is not None and hasattr(bus, "bytes_sent"):
+            return bus.bytes_sent, bus.commands_sent
+        return None
+
+    def refresh(self, area=None, **kwargs):
+        """
+        display.refresh(**kwargs), recorded under the current label.
+        area: (x1, y1, x2, y2) the caller knows is dirty, or a list of them, used for the estimate on the board
+        """
+        before = self._bus_counters()
+        group = self.display.root_group
+        t0 = time.monotonic_ns()
+        result = self.display.refresh(**kwargs)
+        t1 = time.monotonic_ns()
+
+        exact_areas = getattr(self.display, "last_dirty_areas", None)
+        after = self._bus_counters()
+        if before is not None and after is not None and exact_areas is not None:
+            areas = exact_areas
+            sent, commands = after[0] - before[0], after[1] - before[1]
+            exact = True
+        else:
+            if group is not self._last_group:
+                areas = [(0, 0, self.display.width, self.display.height)]
+            else:
+                areas = area if isinstance(area, list) else [area] if area else []
+            sent, commands = area_bytes(areas), WINDOW_COMMANDS * len(areas)
+            exact = False
+        self._last_group = group
+
+        self.record(self.label, (t1 - t0) / 1e6, area_pixels(areas), sent, commands, exact, t1)
+        return result
+
+    def record(self, label, refresh_ms, dirty_px, sent, commands, exact=False, timestamp_ns=None):
+        """Add one record to the ring buffer (used by refresh(), or by hand for custom transfers)"""
+        timestamp_ns = time.monotonic_ns() if timestamp_ns is None else timestamp_ns
+        self._ring[self._count % self.capacity] = (self._count, label, (timestamp_ns - self._start_ns) // 1000000,
+                                                  refresh_ms, dirty_px, sent, commands, exact)
+        self._count += 1
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def records(self):
+        """Records in the buffer, oldest first"""
+        if self._count <= self.capacity:
+            return self._ring[:self._count]
+        start = self._count % self.capacity
+        return self._ring[start:] + self._ring[:start]
+
+    def clear(self):
+        self._ring = [None] * self.capacity
+        self._count = 0
+
+    def summary(self):
+        """Per label: [refreshes, total ms, total bytes, total dirty pixels], for records still buffered"""
+        totals = {}
+        for _, label, _, refresh_ms, dirty_px, sent, _, _ in self.records():
+            entry = totals.setdefault(label, [0, 0.0, 0, 0])
+            entry[0] += 1
+            entry[1] += refresh_ms
+            entry[2] += sent
+            entry[3] += dirty_px
+        return totals
+
+    def print_summary(self):
+        """Print labels sorted by bytes sent, biggest bus users first"""
+        print("📊 Refresh profile (label, refreshes, ms, bytes, dirty px)")
+        totals = self.summary()
+        for label in sorted(totals, key=lambda name: -totals[name][2]):
+            count, total_ms, sent, dirty_px = totals[label]
+            print(f"   {label or '-':24} {count:4} {total_ms:9.1f} {sent:10} {dirty_px:8}")
+
+    def dump(self, stream=None):
+        """Write the ring buffer as CSV to an open file, or print it over serial"""
+        lines = [",".join(self.FIELDS)]
+        for entry in self.records():
+            lines.append(",".join(str(value) for value in entry))
+        if stream is None:
+            for line in lines:
+                print(line)
+        else:
+            for line in lines:
+                stream.write(line + "\n")
+
+    def dump_to_file(self, path):
+        """Write the ring buffer as CSV to path (e.g. on /sd, CIRCUITPY is read-only to code)"""
+        with open(path, "w") as csv_file:
+            self.dump(csv_file)
@@ -0,0 +1,217 @@
+# scene_file.py
+"""
+Binary scene files: a finished displayio screen (Groups, TileGrids, Bitmaps and
+Palettes) saved once and rebuilt without running the code that built it.
+
+save() walks the tree from the root Group and writes every object once, shared
+Bitmaps and Palettes by reference (Palettes with the same colors are written once
+too, as a saved screen is not recolored); load() reads the file front to back, creating
+each object with its final size, so nothing is appended to or resized while the
+screen is rebuilt. Bitmap pixels go straight from the file into the Bitmap with
+bitmaptools.readinto(), and Bitmaps that hold a single value are stored as a fill.
+Label and other Group subclasses are saved as the plain Groups they draw with.
+Given a primitives.PrimitivePool, load() takes single-tile solid rectangles (a
+1-value Bitmap with a 1-color opaque Palette) from the pool instead of creating them.
+
+tools/compile_screens.py runs the demo's static screens on the simulator and
+writes one .scn file per screen; the demo shows those when they are present.
+
+Layout (little-endian): b"SCN1", seconds (f), object count (H), then objects:
+  b"B" width, height (HH), value_count (I), bits per value (B), fill flag (B),
+       then the fill value (I) or rows of pixels, most significant bits first, each row whole bytes
+  b"P" color count (H), colors (I each, bit 31 set when transparent)
+  b"T" bitmap, shader (HH object indexes), x, y (hh), width, height, tile width, tile height (HHHH),
+       flags (B: hidden, flip_x, flip_y, transpose_xy, custom tiles),
+       [tile indexes (B each, H each when the bitmap has more than 255 tiles)]
+  b"G" x, y (hh), scale (H), hidden (B), child count (H), child object indexes (H each)
+The last object is the root Group.
+"""
+import struct
+import displayio
+import bitmaptools
+
+MAGIC = b"SCN1"
+
+
+def bits_per_value(value_count):
+    """Bits the board stores each value of a Bitmap with value_count values in"""
+    for bits in (1, 2, 4, 8, 16):
+        if value_count <= 1 << bits:
+            return bits
+    return 32
+
+
+def tile_type(grid):
+    """struct code of a TileGrid's saved tile indexes: "B", or "H" when its bitmap has more than 255 tiles"""
+    tiles = (grid.bitmap.width // grid.tile_width) * (grid.bitmap.height // grid.tile_height)
+    return "B" if tiles <= 255 else "H"
+
+
+def pack_rows(bitmap, bits):
+    """Pixels of bitmap as rows of whole bytes, most significant bits first (what bitmaptools.readinto() reads)"""
+    rows = bytearray()
+    for y in range(bitmap.height):
+        row = bytearray((bitmap.width * bits + 7) // 8)
+        for x in range(bitmap.width):
+            value = bitmap[x, y]
+            if bits < 8:
+                bit = x * bits
+                row[bit >> 3] |= value << (8 - bits - (bit & 7))
+            else:
+                struct.pack_into("<" + {8: "B", 16: "H", 32: "I"}[bits], row, x * bits // 8, value)
+        rows += row
+    return rows
+
+
+class _Writer:
+    """Numbers the objects of a tree, children before their parents"""
+
+    def __init__(self, file):
+        self.file = file
+        self.index = {}  # id(object) -> object index
+        self.palettes = {}  # colors -> object index of the first Palette with them
+        self.count = 0
+
+    def add(self, obj):
+        index = self.index.get(id(obj))
+        if index is not None:
+            return index
+        if isinstance(obj, displayio.Group):
+            children = [self.add(layer) for layer in obj]
+            data = b"G" + struct.pack("<hhHBH", obj.x, obj.y, obj.scale, obj.hidden, len(children))
+            data += struct.pack(f"<{len(children)}H", *children)
+        elif isinstance(obj, displayio.TileGrid):
+            data = self._tilegrid(obj)
+        elif isinstance(obj, displayio.Palette):
+            colors = tuple(obj[i] | (0x80000000 if obj.is_transparent(i) else 0) for i in range(len(obj)))
+            index = self.palettes.get(colors)
+            if index is not None:
+                self.index[id(obj)] = index
+                return index
+            self.palettes[colors] = self.count
+            data = b"P" + struct.pack(f"<H{len(colors)}I", len(colors), *colors)
+        elif isinstance(obj, displayio.Bitmap):
+            data = self._bitmap(obj)
+        else:
+            raise ValueError(f"{type(obj).__name__} cannot be saved in a scene")
+        self.file.write(data)
+        self.index[id(obj)] = self.count
+        self.count += 1
+        return self.count - 1
+
+    def _tilegrid(self, grid):
+        bitmap, shader = self.add(grid.bitmap), self.add(grid.pixel_shader)
+        tiles = [grid[i] for i in range(grid.width * grid.height)]
+        custom = any(tiles)
+        flags = grid.hidden | grid.flip_x << 1 | grid.flip_y << 2 | grid.transpose_xy << 3 | custom << 4
+        data = b"T" + struct.pack("<HHhhHHHHB", bitmap, shader, grid.x, grid.y, grid.width, grid.height,
+                                  grid.tile_width, grid.tile_height, flags)
+        return data + struct.pack(f"<{len(tiles)}{tile_type(grid)}", *tiles) if custom else data
+
+    def _bitmap(self, bitmap):
+        width, height = bitmap.width, bitmap.height
+        bits = bits_per_value(bitmap.value_count)
+        first = bitmap[0, 0]
+        uniform = all(bitmap[x, y] == first for y in range(height) for x in range(width))
+        data = b"B" + struct.pack("<HHIBB", width, height, bitmap.value_count, bits, uniform)
+        if uniform:
+            return data + struct.pack("<I", first)
+        return data + pack_rows(bitmap, bits)
+
+
+def save(path, group, seconds=0.0):
+    """Write the tree under group to a scene file; returns the number of objects written"""
+    with open(path, "wb") as file:
+        file.write(MAGIC + struct.pack("<fH", seconds, 0))
+        writer = _Writer(file)
+        writer.add(group)
+        file.seek(len(MAGIC) + 4)
+        file.write(struct.pack("<H", writer.count))
+    return writer.count
+
+
+def _materialize(objects, index):
+    """Object at index, creating the Bitmap or Palette a pooled rect placeholder stands for"""
+    obj = objects[index]
+    if isinstance(obj, tuple):
+        obj = objects[index] = displayio.Bitmap(obj[0], obj[1], 1)
+    elif isinstance(obj, int):
+        color, obj = obj, displayio.Palette(1)
+        obj[0] = color
+        objects[index] = obj
+    return obj
+
+
+def _read(file, size):
+    """size bytes from file; ValueError when it ends first (a truncated scene)"""
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("scene file ends early")
+    return data
+
+
+def load(path, pool=None):
+    """Rebuild a saved scene; returns (root Group, seconds it was shown for). pool: PrimitivePool for solid rects"""
+    with open(path, "rb") as file:
+        if file.read(4) != MAGIC:
+            raise ValueError(f"{path} is not a scene file")
+        seconds, count = struct.unpack("<fH", _read(file, 6))
+        objects = []
+        for _ in range(count):
+            kind = _read(file, 1)
+            if kind == b"B":
+                width, height, value_count, bits, uniform = struct.unpack("<HHIBB", _read(file, 10))
+                if pool is not None and uniform and value_count == 1:
+                    _read(file, 4)
+                    objects.append((width, height))  # the TileGrid takes it from the pool, see _materialize()
+                    continue
+                obj = displayio.Bitmap(width, height, value_count)
+                if uniform:
+                    value = struct.unpack("<I", _read(file, 4))[0]
+                    if value:
+                        obj.fill(value)
+                else:
+                    bitmaptools.readinto(obj, file, bits, element_size=max(1, bits // 8))
+            elif kind == b"P":
+                colors = struct.unpack("<H", _read(file, 2))[0]
+                values = struct.unpack(f"<{colors}I", _read(file, 4 * colors))
+                if pool is not None and colors == 1 and not values[0] & 0x80000000:
+                    objects.append(values[0])
+                    continue
+                obj = displayio.Palette(colors)
+                for i, color in enumerate(values):
+                    obj[i] = color & 0xFFFFFF
+                    if color & 0x80000000:
+                        obj.make_transparent(i)
+            elif kind == b"T":
+                bitmap, shader, x, y, width, height, tile_width, tile_height, flags = struct.unpack(
+                    "<HHhhHHHHB", _read(file, 17))
+                solid = isinstance(objects[bitmap], tuple) and isinstance(objects[shader], int)
+                if solid and width == height == 1 and not flags & 16:
+                    size = objects[bitmap][::-1] if flags & 8 else objects[bitmap]
+                    obj = pool.rect(x, y, size[0], size[1], objects[shader])
+                    obj.hidden = bool(flags & 1)
+                    objects.append(obj)
+                    continue
+                obj = displayio.TileGrid(_materialize(objects, bitmap), pixel_shader=_materialize(objects, shader),
+                                         width=width, height=height, tile_width=tile_width, tile_height=tile_height,
+                                         x=x, y=y)
+                obj.hidden = bool(flags & 1)
+                obj.flip_x = bool(flags & 2)
+                obj.flip_y = bool(flags & 4)
+                obj.transpose_xy = bool(flags & 8)
+                if flags & 16:
+                    code = tile_type(obj)
+                    tiles = struct.unpack(f"<{width * height}{code}", _read(file, width * height * struct.calcsize(code)))
+                    for i, tile in enumerate(tiles):
+                        obj[i] = tile
+            elif kind == b"G":
+                x, y, scale, hidden, children = struct.unpack("<hhHBH", _read(file, 9))
+                obj = displayio.Group(scale=scale, x=x, y=y)
+                obj.hidden = bool(hidden)
+                for index in struct.unpack(f"<{children}H", _read(file, 2 * children)):
+                    obj.append(objects[index])
+            else:
+                raise ValueError(f"{path}: unknown object {kind!r}")
+            objects.append(obj)
+    return objects[-1], seconds
@@ -0,0 +1,74 @@
+# sim/adafruit_bitmap_font/bitmap_font.py
+"""
+Simulated adafruit_bitmap_font.bitmap_font. Parses BDF/PCF with the readers in
+tools/compile_fonts.py; glyph Bitmaps are only built when a glyph is requested,
+like the lazy loading on the board.
+"""
+import os
+import sys
+from collections import namedtuple
+
+import displayio
+import simenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                "tools"))
+import compile_fonts  # noqa: E402
+
+Glyph = namedtuple("Glyph", ["bitmap", "tile_index", "width", "height", "dx", "dy", "shift_x", "shift_y"])
+
+_parsed = {}  # host-side parse cache, the board has nothing like it
+
+
+class SimFont:
+    def __init__(self, path, bitmap_class=displayio.Bitmap):
+        real_path = simenv.device_path(path)
+        key = os.path.abspath(real_path)
+        if key not in _parsed:
+            with simenv.excluded():
+                _parsed[key] = compile_fonts.read_font(real_path)
+        self._source = _parsed[key]
+        self._bitmap_class = bitmap_class
+        self._glyphs = {}
+        self.ascent = self._source.ascent
+        self.descent = self._source.descent
+
+    def get_bounding_box(self):
+        glyphs = self._source.glyphs.values()
+        width = max((g.width for g in glyphs), default=0)
+        min_y = min((g.y_offset for g in glyphs), default=0)
+        max_y = max((g.y_offset + g.height for g in glyphs), default=0)
+        return width, max_y - min_y, min((g.x_offset for g in glyphs), default=0), min_y
+
+    def load_glyphs(self, code_points):
+        if isinstance(code_points, int):
+            code_points = (code_points,)
+        elif isinstance(code_points, str):
+            code_points = [ord(c) for c in code_points]
+        for code_point in code_points:
+            if code_point in self._glyphs:
+                continue
+            source = self._source.glyphs.get(code_point)
+            if source is None:
+                self._glyphs[code_point] = None
+                continue
+            bitmap = self._bitmap_class(max(1, source.width), max(1, source.height), 2)
+            for y, row in enumerate(source.rows):
+                for x in range(source.width):
+                    if row >> (source.width - 1 - x) & 1:
+                        bitmap[x, y] = 1
+            bitmap._dirty = None
+            self._glyphs[code_point] = Glyph(bitmap, 0, source.width, source.height, source.x_offset,
+                                             source.y_offset, source.dwidth, 0)
+
+    def get_glyph(self, code_point):
+        if code_point not in self._glyphs:
+            self.load_glyphs(code_point)
+        return self._glyphs[code_point]
+
+
+def load_font(filename, bitmap=None):
+    """Load a .bdf or .pcf font"""
+    if not os.path.exists(simenv.device_path(filename)):
+        raise OSError(2, "No such file/directory", filename)
+    return SimFont(filename, bitmap or displayio.Bitmap)
@@ -0,0 +1,143 @@
+# sim/adafruit_display_text/label.py
+"""
+Simulated adafruit_display_text.label.Label: renders its text into one Bitmap
+shown by one TileGrid inside the Label's Group, with the library's positioning
+rules (y is the middle of the first line unless anchored).
+"""
+import displayio
+
+
+class Label(displayio.Group):
+    def __init__(self, font, *, text="", color=0xFFFFFF, background_color=None, scale=1, anchor_point=None,
+                 anchored_position=None, x=0, y=0, line_spacing=1.25, padding_left=0, padding_right=0,
+                 padding_top=0, padding_bottom=0, **kwargs):
+        super().__init__(scale=scale, x=x, y=y)
+        self._font = font
+        self._line_spacing = line_spacing
+        self._palette = displayio.Palette(2)
+        self._palette[1] = color
+        self._color = color
+        self._background_color = background_color
+        self._apply_background()
+        self._anchor_point = anchor_point
+        self._anchored_position = anchored_position
+        self._tilegrid = None
+        self._bbox = (0, 0, 0, 0)
+        self._text = None
+        self.text = text
+
+    def _apply_background(self):
+        if self._background_color is None:
+            self._palette.make_transparent(0)
+        else:
+            self._palette[0] = self._background_color
+            self._palette.make_opaque(0)
+
+    @property
+    def font(self):
+        return self._font
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        self._color = value
+        self._palette[1] = value
+
+    @property
+    def background_color(self):
+        return self._background_color
+
+    @background_color.setter
+    def background_color(self, value):
+        self._background_color = value
+        self._apply_background()
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        value = str(value)
+        if value == self._text:
+            return
+        self._text = value
+        self._render()
+        self._update_anchor()
+
+    @property
+    def bounding_box(self):
+        return self._bbox
+
+    @property
+    def width(self):
+        return self._bbox[2]
+
+    @property
+    def height(self):
+        return self._bbox[3]
+
+    @property
+    def anchor_point(self):
+        return self._anchor_point
+
+    @anchor_point.setter
+    def anchor_point(self, value):
+        self._anchor_point = value
+        self._update_anchor()
+
+    @property
+    def anchored_position(self):
+        return self._anchored_position
+
+    @anchored_position.setter
+    def anchored_position(self, value):
+        self._anchored_position = value
+        self._update_anchor()
+
+    def _render(self):
+        font = self._font
+        ascent, descent = font.ascent, font.descent
+        line_height = int((ascent + descent) * self._line_spacing)
+        placed = []  # (glyph, x, baseline)
+        min_x = max_x = 0
+        baseline = 0
+        for line_number, line in enumerate(self._text.split("\n")):
+            cursor = 0
+            baseline = line_number * line_height
+            for char in line:
+                glyph = font.get_glyph(ord(char))
+                if glyph is None:
+                    continue
+                placed.append((glyph, cursor, baseline))
+                min_x = min(min_x, cursor + glyph.dx)
+                max_x = max(max_x, cursor + glyph.dx + glyph.width, cursor + glyph.shift_x)
+                cursor += glyph.shift_x
+        width = max(1, max_x - min_x)
+        height = max(1, baseline + ascent + descent)
+        bitmap = displayio.Bitmap(width, height, 2)
+        for glyph, cursor, line_base in placed:
+            left = cursor + glyph.dx - min_x
+            top = line_base + ascent - glyph.dy - glyph.height
+            source = glyph.bitmap
+            for gy in range(glyph.height):
+                for gx in range(glyph.width):
+                    if source[gx, gy] and 0 <= left + gx < width and 0 <= top + gy < height:
+                        bitmap[left + gx, top + gy] = 1
+        # y refers to the middle of the first line's ascent, as in adafruit_display_text
+        y_offset = -(ascent - ascent // 2)
+        if self._tilegrid is not None:
+            self.remove(self._tilegrid)
+        self._tilegrid = displayio.TileGrid(bitmap, pixel_shader=self._palette, x=min_x, y=y_offset)
+        self.append(self._tilegrid)
+        self._bbox = (min_x, y_offset, width, height)
+
+    def _update_anchor(self):
+        if self._anchor_point is None or self._anchored_position is None:
+            return
+        bx, by, width, height = self._bbox
+        self.x = int(self._anchored_position[0] - (bx + round(self._anchor_point[0] * width)) * self.scale)
+        self.y = int(self._anchored_position[1] - (by + round(self._anchor_point[1] * height)) * self.scale)
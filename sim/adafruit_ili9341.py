@@ -0,0 +1,94 @@
+# sim/adafruit_ili9341.py
+"""
+Simulated adafruit_ili9341 driver plus a panel model that decodes the commands
+sent over the bus (CASET/PASET/RAMWR/Write Memory Continue) into an RGB565 framebuffer.
+"""
+import struct
+
+from displayio import BusDisplay
+from framebuffer import Framebuffer
+
+_INIT_SEQUENCE = (
+    b"\x01\x80\x80"  # Software reset then delay 0x80 (128ms)
+    b"\xEF\x03\x03\x80\x02"
+    b"\xCF\x03\x00\xC1\x30"
+    b"\xED\x04\x64\x03\x12\x81"
+    b"\xE8\x03\x85\x00\x78"
+    b"\xCB\x05\x39\x2C\x00\x34\x02"
+    b"\xF7\x01\x20"
+    b"\xEA\x02\x00\x00"
+    b"\xc0\x01\x23"  # Power control VRH[5:0]
+    b"\xc1\x01\x10"  # Power control SAP[2:0];BT[3:0]
+    b"\xc5\x02\x3e\x28"  # VCM control
+    b"\xc7\x01\x86"  # VCM control2
+    b"\x36\x01\x38"  # Memory Access Control
+    b"\x37\x01\x00"  # Vertical scroll zero
+    b"\x3a\x01\x55"  # COLMOD: Pixel Format Set
+    b"\xb1\x02\x00\x18"  # Frame Rate Control (In Normal Mode/Full Colors)
+    b"\xb6\x03\x08\x82\x27"  # Display Function Control
+    b"\xF2\x01\x00"  # 3Gamma Function Disable
+    b"\x26\x01\x01"  # Gamma curve selected
+    b"\xe0\x0f\x0F\x31\x2B\x0C\x0E\x08\x4E\xF1\x37\x07\x10\x03\x0E\x09\x00"  # Set Gamma
+    b"\xe1\x0f\x00\x0E\x14\x03\x11\x07\x31\xC1\x48\x08\x0F\x0C\x31\x36\x0F"  # Set Gamma
+    b"\x11\x80\x78"  # Exit Sleep then delay 0x78 (120ms)
+    b"\x29\x80\x78"  # Display on then delay 0x78 (120ms)
+)
+
+CASET = 0x2A
+PASET = 0x2B
+RAMWR = 0x2C
+RAMWR_CONTINUE = 0x3C
+
+
+class ILI9341Panel:
+    """The glass: keeps the address window and writes RAMWR pixel data into framebuffer"""
+
+    def __init__(self, width, height):
+        self.framebuffer = Framebuffer(width, height)
+        self.window = (0, 0, width - 1, height - 1)
+        self.windows = 0
+        self.commands = {}
+        self._cursor = (0, 0)  # next pixel RAMWR_CONTINUE writes to
+
+    def reset(self):
+        self.window = (0, 0, self.framebuffer.width - 1, self.framebuffer.height - 1)
+        self._cursor = (0, 0)
+
+    def _write(self, values):
+        """Write pixels from the cursor on, wrapping at the window's right edge"""
+        x1, y1, x2, y2 = self.window
+        x, y = self._cursor
+        i = 0
+        while i < len(values) and y <= y2:
+            count = min(x2 - x + 1, len(values) - i)
+            self.framebuffer.write_row(x, y, values[i:i + count])
+            i += count
+            x += count
+            if x > x2:
+                x, y = x1, y + 1
+        self._cursor = (x, y)
+
+    def receive(self, command, data):
+        self.commands[command] = self.commands.get(command, 0) + 1
+        x1, y1, x2, y2 = self.window
+        if command == CASET:
+            x1, x2 = struct.unpack(">HH", data)
+            self.window = (x1, y1, x2, y2)
+        elif command == PASET:
+            y1, y2 = struct.unpack(">HH", data)
+            self.window = (x1, y1, x2, y2)
+        elif command == RAMWR:
+            self.windows += 1
+            self._cursor = (x1, y1)
+            self._write(struct.unpack(f">{len(data) // 2}H", data))
+        elif command == RAMWR_CONTINUE:
+            self._write(struct.unpack(f">{len(data) // 2}H", data))
+
+
+class ILI9341(BusDisplay):
+    def __init__(self, bus, hardware_reset=True, **kwargs):
+        kwargs.pop("backlight_pin", None)
+        width, height = kwargs.get("width", 240), kwargs.get("height", 320)
+        self.panel = ILI9341Panel(width, height)
+        bus.panel = self.panel
+        super().__init__(bus, _INIT_SEQUENCE, **kwargs)
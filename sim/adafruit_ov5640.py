@@ -0,0 +1,179 @@
+# sim/adafruit_ov5640.py
+"""
+Simulated OV5640 camera. Frames are a fixed test scene (gradient with colour
+blocks) plus a bouncing square, written in RGB565 byte-swapped order like the
+real sensor in OV5640_COLOR_RGB mode, or one luma byte per pixel in
+OV5640_COLOR_GRAYSCALE mode. The sensor runs on its own frame clock:
+capture() waits for the next frame to finish, and continuous capture keeps
+filling the two buffers in the background, so overlap with SPI transfers shows up
+in the simulated time.
+"""
+import random
+from array import array
+
+import simenv
+
+OV5640_COLOR_RGB = 0
+OV5640_COLOR_YUV = 1
+OV5640_COLOR_GRAYSCALE = 2
+OV5640_COLOR_JPEG = 3
+
+OV5640_SIZE_96X96 = 0
+OV5640_SIZE_QQVGA = 1
+OV5640_SIZE_QCIF = 2
+OV5640_SIZE_HQVGA = 3
+OV5640_SIZE_240X240 = 4
+OV5640_SIZE_QVGA = 5
+OV5640_SIZE_CIF = 6
+OV5640_SIZE_HVGA = 7
+OV5640_SIZE_VGA = 8
+
+_SIZES = {
+    OV5640_SIZE_96X96: (96, 96),
+    OV5640_SIZE_QQVGA: (160, 120),
+    OV5640_SIZE_QCIF: (176, 144),
+    OV5640_SIZE_HQVGA: (240, 176),
+    OV5640_SIZE_240X240: (240, 240),
+    OV5640_SIZE_QVGA: (320, 240),
+    OV5640_SIZE_CIF: (400, 296),
+    OV5640_SIZE_HVGA: (480, 320),
+    OV5640_SIZE_VGA: (640, 480),
+}
+
+# Pixel clock limited: a QVGA RGB565 frame every 1/15 s, smaller sizes faster (30 fps cap)
+QVGA_FRAME_SECONDS = 1 / 15
+
+
+def _swapped565(r, g, b):
+    value = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    return ((value & 0xFF) << 8) | (value >> 8)
+
+
+class OV5640:
+    def __init__(self, i2c_bus, data_pins, clock, vsync, href, shutdown=None, reset=None, mclk=None,
+                 mclk_frequency=20_000_000, i2c_address=0x3C, size=OV5640_SIZE_QVGA, noise=0):
+        self.chip_id = 0x5640
+        self.colorspace = OV5640_COLOR_RGB
+        self.flip_x = False
+        self.flip_y = False
+        self.test_pattern = False
+        self.noise = noise  # random low bits added to every pixel, 0 = perfectly still scene
+        self.frames_captured = 0
+        self._buffers = None
+        self._next_buffer = 0
+        self._epoch = simenv.monotonic()
+        self.size = size
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, size):
+        self._size = size
+        self.width, self.height = _SIZES[size]
+        self._gray = None
+        with simenv.excluded():
+            self._background = self._render_background()
+
+    @property
+    def frame_seconds(self):
+        return max(1 / 30, QVGA_FRAME_SECONDS * self.width * self.height / (320 * 240))
+
+    @property
+    def capture_buffer_size(self):
+        if self.colorspace == OV5640_COLOR_GRAYSCALE:
+            return self.width * self.height
+        return self.width * self.height * 2
+
+    def _render_background(self):
+        width, height = self.width, self.height
+        pixels = array("H", bytes(2 * width * height))
+        for y in range(height):
+            row = y * width
+            for x in range(width):
+                pixels[row + x] = _swapped565(x * 255 // width, y * 255 // height, 96)
+        for i, color in enumerate(((255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0))):
+            block = _swapped565(*color)
+            x0 = (i + 1) * width // 6
+            for y in range(height // 8, height // 4):
+                for x in range(x0, x0 + width // 10):
+                    pixels[y * width + x] = block
+        return pixels
+
+    def _gray_background(self):
+        """Luma of the RGB565 test scene, one byte per pixel"""
+        if self._gray is None:
+            gray = bytearray(len(self._background))
+            for i, value in enumerate(self._background):
+                value = ((value & 0xFF) << 8) | (value >> 8)
+                r, g, b = (value >> 8) & 0xF8, (value >> 3) & 0xFC, (value << 3) & 0xF8
+                gray[i] = (r * 77 + g * 150 + b * 29) >> 8
+            self._gray = array("B", gray)
+        return self._gray
+
+    def _fill(self, buffer):
+        """Write the scene for the current frame number into buffer"""
+        with simenv.excluded():
+            if self.colorspace == OV5640_COLOR_GRAYSCALE:
+                typecode, background, white = "B", self._gray_background(), 255
+            else:
+                typecode, background, white = "H", self._background, _swapped565(255, 255, 255)
+            data = memoryview(buffer).cast("B").cast(typecode) if not isinstance(buffer, array) else \
+                memoryview(buffer)
+            if len(data) != len(background):
+                raise ValueError(f"buffer holds {len(data)} pixels, frame has {len(background)}")
+            data[:] = background
+            side = max(8, self.width // 8)
+            span_x, span_y = self.width - side, self.height - side
+            frame = self.frames_captured
+            bx = abs((frame * 7) % (2 * span_x) - span_x)
+            by = abs((frame * 5) % (2 * span_y) - span_y)
+            square = array(typecode, [white]) * side
+            for y in range(by, by + side):
+                data[y * self.width + bx:y * self.width + bx + side] = square
+            if self.noise:
+                mask = (1 << min(self.noise, 8 * data.itemsize)) - 1
+                for i in range(0, len(data), 7):
+                    data[i] ^= random.getrandbits(8 * data.itemsize) & mask
+            self.frames_captured += 1
+
+    def _wait_frame_end(self):
+        """Block until the frame in progress completes; returns its end time"""
+        period = self.frame_seconds
+        elapsed = simenv.monotonic() - self._epoch
+        frame_end = self._epoch + (int(elapsed / period) + 1) * period
+        simenv.advance(frame_end - simenv.monotonic())
+        return frame_end
+
+    def capture(self, buf):
+        """Blocking capture: wait for the next frame start, then one full frame"""
+        self._wait_frame_end()
+        simenv.advance(self.frame_seconds)
+        self._fill(buf)
+        return buf
+
+    def continuous_capture_start(self, buf1, buf2):
+        self._buffers = (buf1, buf2)
+        self._next_buffer = 0
+        self._last_frame_end = self._wait_frame_end()
+
+    def continuous_capture_get_frame(self):
+        """Return the buffer holding the newest complete frame (waits if none finished yet)"""
+        if self._buffers is None:
+            raise RuntimeError("continuous capture not started")
+        if simenv.monotonic() < self._last_frame_end + self.frame_seconds:
+            self._last_frame_end = self._wait_frame_end()
+        else:
+            self._last_frame_end = self._epoch + int((simenv.monotonic() - self._epoch) / self.frame_seconds) * \
+                self.frame_seconds
+        buffer = self._buffers[self._next_buffer]
+        self._next_buffer ^= 1
+        self._fill(buffer)
+        return buffer
+
+    def continuous_capture_stop(self):
+        self._buffers = None
+
+    def deinit(self):
+        self.continuous_capture_stop()
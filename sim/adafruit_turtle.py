@@ -0,0 +1,215 @@
+# sim/adafruit_turtle.py
+"""
+Simulated adafruit_turtle: the part of the library the demo uses, drawing the way the
+library does (a float Bresenham loop setting one Bitmap pixel per step, the turtle
+sprite moved after every line), so its Python cost shows up in simulated time. The
+board runs auto refresh from background tasks while that loop runs; here it is run
+about 60 times a second of simulated time through simenv.background().
+"""
+import math
+
+import displayio
+import simenv
+
+
+class Color:
+    WHITE = 0xFFFFFF
+    BLACK = 0x000000
+    RED = 0xFF0000
+    ORANGE = 0xFFA500
+    YELLOW = 0xFFEE00
+    GREEN = 0x00C000
+    BLUE = 0x0000FF
+    PURPLE = 0x8040C0
+    PINK = 0xFF40C0
+    LIGHT_GRAY = 0xAAAAAA
+    GRAY = 0x444444
+    BROWN = 0xCA801D
+    DARK_GREEN = 0x008700
+    TURQUOISE = 0x00C0C0
+    DARK_BLUE = 0x0000AA
+    DARK_RED = 0x800000
+
+    colors = (BLACK, WHITE, RED, YELLOW, GREEN, ORANGE, BLUE, PURPLE, PINK, GRAY, LIGHT_GRAY, BROWN, DARK_GREEN,
+              TURQUOISE, DARK_BLUE, DARK_RED)
+
+
+class turtle:  # noqa: N801 - the library's name
+    def __init__(self, display=None, scale=1):
+        self._display = display
+        self._w, self._h = display.width // scale, display.height // scale
+        self._x, self._y = self._w // 2, self._h // 2
+        self._heading = 0.0
+        self._speed = 6
+        self._pensize = 1
+        self._penstate = True
+        self._splash = displayio.Group()
+
+        self._bg_bitmap = displayio.Bitmap(1, 1, 1)
+        self._bg_palette = displayio.Palette(1)
+        self._bg_palette[0] = Color.BLACK
+        self._bg_sprite = displayio.TileGrid(self._bg_bitmap, pixel_shader=self._bg_palette, width=self._w,
+                                             height=self._h, tile_width=1, tile_height=1)
+        self._splash.append(self._bg_sprite)
+
+        self._fg_palette = displayio.Palette(len(Color.colors))
+        for i, color in enumerate(Color.colors):
+            self._fg_palette[i] = color
+        self._fg_palette.make_transparent(0)
+        self._fg_bitmap = displayio.Bitmap(self._w, self._h, len(Color.colors))
+        self._splash.append(displayio.TileGrid(self._fg_bitmap, pixel_shader=self._fg_palette))
+        self._pencolor = 1
+
+        self._turtle_bitmap = displayio.Bitmap(9, 9, 2)
+        for x, y in ((4, 0), (3, 1), (4, 1), (5, 1), (2, 2), (4, 2), (6, 2), (4, 3), (4, 4), (4, 5), (4, 6)):
+            self._turtle_bitmap[x, y] = 1
+        self._turtle_palette = displayio.Palette(2)
+        self._turtle_palette.make_transparent(0)
+        self._turtle_palette[1] = Color.WHITE
+        self._turtle_sprite = displayio.TileGrid(self._turtle_bitmap, pixel_shader=self._turtle_palette)
+        self._splash.append(self._turtle_sprite)
+        self._drawturtle()
+        display.root_group = self._splash
+
+    def _drawturtle(self):
+        self._turtle_sprite.x = int(self._x - 4)
+        self._turtle_sprite.y = int(self._y - 4)
+
+    def _plot(self, x, y, c):
+        if self._pensize == 1:
+            try:
+                self._fg_bitmap[int(x), int(y)] = c
+                return
+            except IndexError:
+                pass
+        r = self._pensize // 2 + 1
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                if dx * dx + dy * dy <= r * r:
+                    try:
+                        self._fg_bitmap[int(x + dx), int(y + dy)] = c
+                    except IndexError:
+                        pass
+
+    def goto(self, x1, y1=None):
+        if y1 is None:
+            x1, y1 = x1
+        x1 += self._w // 2
+        y1 = self._h // 2 - y1
+        x0, y0 = self._x, self._y
+        if not self._penstate:
+            self._x, self._y = x1, y1
+            self._drawturtle()
+            return
+        steep = abs(y1 - y0) > abs(x1 - x0)
+        rev = False
+        dx = x1 - x0
+        if steep:
+            x0, y0 = y0, x0
+            x1, y1 = y1, x1
+            dx = x1 - x0
+        if x0 > x1:
+            rev = True
+            dx = x0 - x1
+        dy = abs(y1 - y0)
+        err = dx / 2
+        ystep = 1 if y0 < y1 else -1
+        while (not rev and x0 <= x1) or (rev and x1 <= x0):
+            if steep:
+                self._plot(int(y0), int(x0), self._pencolor)
+                self._x, self._y = y0, x0
+            else:
+                self._plot(int(x0), int(y0), self._pencolor)
+                self._x, self._y = x0, y0
+            err -= dy
+            if err < 0:
+                y0 += ystep
+                err += dx
+            x0 += -1 if rev else 1
+            simenv.background()
+        self._drawturtle()
+
+    setpos = setposition = goto
+
+    def forward(self, distance):
+        x = self._x - self._w // 2 + math.cos(math.radians(self._heading)) * distance
+        y = self._h // 2 - self._y + math.sin(math.radians(self._heading)) * distance
+        self.goto(x, y)
+
+    fd = forward
+
+    def backward(self, distance):
+        self.forward(-distance)
+
+    bk = back = backward
+
+    def right(self, angle):
+        self._heading = (self._heading - angle) % 360
+        self._drawturtle()
+
+    rt = right
+
+    def left(self, angle):
+        self.right(-angle)
+
+    lt = left
+
+    def heading(self):
+        return self._heading
+
+    def setheading(self, to_angle):
+        self._heading = to_angle % 360
+
+    seth = setheading
+
+    def pos(self):
+        return self._x - self._w // 2, self._h // 2 - self._y
+
+    position = pos
+
+    def penup(self):
+        self._penstate = False
+
+    pu = up = penup
+
+    def pendown(self):
+        self._penstate = True
+
+    pd = down = pendown
+
+    def isdown(self):
+        return self._penstate
+
+    def pensize(self, width=None):
+        if width is not None:
+            self._pensize = width
+        return self._pensize
+
+    width = pensize
+
+    def pencolor(self, c=None):
+        if c is None:
+            return Color.colors[self._pencolor]
+        if c not in Color.colors:
+            raise RuntimeError("Color must be one of the 'Color' class items")
+        self._pencolor = Color.colors.index(c)
+
+    def bgcolor(self, c=None):
+        if c is None:
+            return self._bg_palette[0]
+        self._bg_palette[0] = c
+
+    def speed(self, speed=None):
+        if speed is not None:
+            self._speed = speed
+        return self._speed
+
+    def hideturtle(self):
+        self._turtle_sprite.hidden = True
+
+    ht = hideturtle
+
+    def showturtle(self):
+        self._turtle_sprite.hidden = False
+
+    st = showturtle
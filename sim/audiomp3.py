@@ -0,0 +1,42 @@
+# sim/audiomp3.py
+"""
+Simulated audiomp3.MP3Decoder. Nothing is decoded: a stream plays for as long as
+its file lasts at BYTES_PER_SECOND (128 kbit/s CBR), and the audio output reads
+the file at that rate while it plays.
+"""
+BYTES_PER_SECOND = 16000
+READ_SIZE = 2048  # like the decoder's input buffer, refilled from the file as it drains
+
+
+class MP3Decoder:
+    def __init__(self, file, buffer=None):
+        self.sample_rate = 22050
+        self.bits_per_sample = 16
+        self.channels = 1
+        self.buffer = buffer
+        self._file = None
+        self.file = file
+
+    @property
+    def file(self):
+        return self._file
+
+    @file.setter
+    def file(self, file):
+        if isinstance(file, str):
+            file = open(file, "rb")
+        self._file = file
+        self.bytes_read = 0
+        self.eof = False
+
+    def _feed(self, until_bytes):
+        """Read the file up to until_bytes from its start; False once it has ended"""
+        while not self.eof and self.bytes_read < until_bytes:
+            data = self._file.read(READ_SIZE)
+            self.bytes_read += len(data)
+            if len(data) < READ_SIZE:
+                self.eof = True
+        return not (self.eof and self.bytes_read <= until_bytes)
+
+    def deinit(self):
+        self._file = None
@@ -0,0 +1,51 @@
+# sim/audiopwmio.py
+"""Simulated audiopwmio.PWMAudioOut: playback runs on the simulated clock"""
+import simenv
+
+
+class PWMAudioOut:
+    def __init__(self, left_channel, *, right_channel=None, quiescent_value=0x8000):
+        self.left_channel = left_channel
+        self._sample = None
+        self._started = 0.0
+        self._paused_at = None
+        self.tracks_played = 0
+
+    def play(self, sample, *, loop=False):
+        self._sample = sample
+        self._started = simenv.monotonic()
+        self._paused_at = None
+        self.tracks_played += 1
+        if hasattr(sample, "_feed"):
+            sample._feed(1)  # the decoder fills its input buffer before output starts
+
+    @property
+    def playing(self):
+        if self._sample is None:
+            return False
+        if not hasattr(self._sample, "_feed"):
+            return True
+        import audiomp3
+        now = self._paused_at if self._paused_at is not None else simenv.monotonic()
+        if self._sample._feed((now - self._started) * audiomp3.BYTES_PER_SECOND):
+            return True
+        self._sample = None
+        return False
+
+    @property
+    def paused(self):
+        return self._paused_at is not None
+
+    def pause(self):
+        self._paused_at = simenv.monotonic()
+
+    def resume(self):
+        if self._paused_at is not None:
+            self._started += simenv.monotonic() - self._paused_at
+            self._paused_at = None
+
+    def stop(self):
+        self._sample = None
+
+    def deinit(self):
+        self.stop()
@@ -0,0 +1,90 @@
+# sim/bitmaptools.py
+"""Simulated bitmaptools: the helpers the scripts use, implemented on sim displayio Bitmaps"""
+from array import array
+
+
+def blit(dest_bitmap, source_bitmap, x, y, *, x1=0, y1=0, x2=None, y2=None, skip_source_index=None,
+         skip_dest_index=None):
+    x2 = source_bitmap.width if x2 is None else x2
+    y2 = source_bitmap.height if y2 is None else y2
+    width = min(x2 - x1, dest_bitmap.width - x)
+    if width <= 0:
+        return
+    if skip_source_index is None and skip_dest_index is None and dest_bitmap.typecode == source_bitmap.typecode:
+        for row in range(y2 - y1):
+            if 0 <= y + row < dest_bitmap.height:
+                dest = (y + row) * dest_bitmap.width + x
+                source = (y1 + row) * source_bitmap.width + x1
+                dest_bitmap._data[dest:dest + width] = source_bitmap._data[source:source + width]
+        dest_bitmap._mark(x, y, x + width, min(dest_bitmap.height, y + y2 - y1))
+        return
+    dest_bitmap.blit(x, y, source_bitmap, x1=x1, y1=y1, x2=x2, y2=y2, skip_index=skip_source_index)
+
+
+def fill_region(dest_bitmap, x1, y1, x2, y2, value):
+    for y in range(max(0, y1), min(dest_bitmap.height, y2)):
+        start = y * dest_bitmap.width
+        for x in range(max(0, x1), min(dest_bitmap.width, x2)):
+            dest_bitmap._data[start + x] = value
+    dest_bitmap._mark(x1, y1, x2, y2)
+
+
+_unpack_tables = {}  # (bits per pixel, reversed) -> bytes of the pixel values in each byte value
+
+
+def _unpack_table(bits, reverse):
+    key = (bits, reverse)
+    if key not in _unpack_tables:
+        per_byte = 8 // bits
+        table = []
+        for byte in range(256):
+            values = [(byte >> (8 - bits * (slot + 1))) & ((1 << bits) - 1) for slot in range(per_byte)]
+            table.append(bytes(values[::-1] if reverse else values))
+        _unpack_tables[key] = table
+    return _unpack_tables[key]
+
+
+def readinto(bitmap, file, bits_per_pixel, element_size=1, reverse_pixels_in_element=False,
+             swap_bytes_in_element=False, reverse_rows=False):
+    """Rows of packed pixels from file, each a whole number of elements; sub-byte pixels most significant first"""
+    row_bytes = (bitmap.width * bits_per_pixel + 8 * element_size - 1) // (8 * element_size) * element_size
+    width = bitmap.width
+    for row in range(bitmap.height):
+        data = file.read(row_bytes)
+        y = bitmap.height - 1 - row if reverse_rows else row
+        if bits_per_pixel < 8:
+            if element_size > 1 and (swap_bytes_in_element != reverse_pixels_in_element):
+                data = b"".join(data[i:i + element_size][::-1] for i in range(0, len(data), element_size))
+            table = _unpack_table(bits_per_pixel, reverse_pixels_in_element)
+            values = b"".join([table[byte] for byte in data])[:width]
+        elif bits_per_pixel == 8:
+            values = data[:width]
+        else:
+            size = bits_per_pixel // 8
+            order = "big" if swap_bytes_in_element else "little"
+            values = [int.from_bytes(data[x * size:(x + 1) * size], order) for x in range(width)]
+        bitmap._data[y * width:(y + 1) * width] = array(bitmap.typecode, values)
+    bitmap._mark(0, 0, bitmap.width, bitmap.height)
+
+
+def draw_line(dest_bitmap, x1, y1, x2, y2, value):
+    """Integer Bresenham line from (x1, y1) to (x2, y2), both ends included, clipped to the bitmap"""
+    dx, dy = abs(x2 - x1), -abs(y2 - y1)
+    sx, sy = (1 if x1 < x2 else -1), (1 if y1 < y2 else -1)
+    err = dx + dy
+    width, height, data = dest_bitmap.width, dest_bitmap.height, dest_bitmap._data
+    x, y = x1, y1
+    while True:
+        if 0 <= x < width and 0 <= y < height:
+            data[y * width + x] = value
+        if x == x2 and y == y2:
+            break
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x += sx
+        if e2 <= dx:
+            err += dx
+            y += sy
+    dest_bitmap._mark(max(0, min(x1, x2)), max(0, min(y1, y2)), min(width, max(x1, x2) + 1),
+                      min(height, max(y1, y2) + 1))
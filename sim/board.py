@@ -0,0 +1,21 @@
+# sim/board.py
+"""Simulated board module: every GPxx (and any other) pin name returns a Pin"""
+
+
+class Pin:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"board.{self.name}"
+
+
+_pins = {}
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    if name not in _pins:
+        _pins[name] = Pin(name)
+    return _pins[name]
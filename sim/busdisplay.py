@@ -0,0 +1,3 @@
+# sim/busdisplay.py
+"""Simulated busdisplay module (CircuitPython 9 location of BusDisplay)"""
+from displayio import BusDisplay
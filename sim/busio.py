@@ -0,0 +1,97 @@
+# sim/busio.py
+"""
+Simulated busio. SPI counts every byte clocked out and advances the simulated
+clock by the time those bytes take at the configured baudrate.
+"""
+import simenv
+
+
+class SPI:
+    def __init__(self, clock, MOSI=None, MISO=None, half_duplex=False):
+        self.clock = clock
+        self.MOSI = MOSI
+        self.MISO = MISO
+        self.frequency = 250000
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.transfers = 0
+        self._locked = False
+
+    def configure(self, *, baudrate=100000, polarity=0, phase=0, bits=8):
+        self.frequency = baudrate
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def _clock_bytes(self, count):
+        self.transfers += 1
+        simenv.advance(count * 8 / self.frequency)
+
+    def write(self, buffer, *, start=0, end=None):
+        count = len(buffer[start:end])
+        self.bytes_written += count
+        self._clock_bytes(count)
+
+    def readinto(self, buffer, *, start=0, end=None, write_value=0):
+        count = len(buffer[start:end])
+        self.bytes_read += count
+        self._clock_bytes(count)
+
+    def write_readinto(self, out_buffer, in_buffer, *, out_start=0, out_end=None, in_start=0, in_end=None):
+        count = len(out_buffer[out_start:out_end])
+        self.bytes_written += count
+        self.bytes_read += count
+        self._clock_bytes(count)
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
+
+
+class I2C:
+    def __init__(self, scl, sda, *, frequency=100000, timeout=255):
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return []
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        pass
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        pass
+
+    def writeto_then_readfrom(self, address, out_buffer, in_buffer, **kwargs):
+        pass
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
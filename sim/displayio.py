@@ -0,0 +1,660 @@
+# sim/displayio.py
+"""
+Simulated displayio for running the demo scripts on a desktop computer.
+
+Bitmap, Palette, ColorConverter, TileGrid, Group and OnDiskBitmap behave like the
+CircuitPython versions for the features the scripts use. BusDisplay tracks dirty
+areas the way displayio does (moved or changed layers, written bitmap regions,
+new root_group = full screen), composites only those areas and sends them to the
+panel as ILI9341 column/page/memory-write commands over the simulated bus.
+"""
+import struct
+import sys
+from array import array
+
+import simenv
+from fourwire import FourWire
+
+_displays = []
+
+# Objects constructed per class name, for benchmarks and allocation profiling
+created = {}
+
+
+def _count(kind):
+    created[kind] = created.get(kind, 0) + 1
+
+
+def release_displays():
+    """Forget every display, like displayio.release_displays() on the board"""
+    _displays.clear()
+
+
+def _background_refresh():
+    for display in _displays:
+        if display.auto_refresh:
+            display.refresh()
+
+
+simenv.on_sleep(_background_refresh)
+
+
+def _rgb888_to_565(color):
+    return ((color >> 8) & 0xF800) | ((color >> 5) & 0x07E0) | ((color >> 3) & 0x001F)
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _intersect(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return (x1, y1, x2, y2)
+
+
+class Colorspace:
+    RGB888 = "RGB888"
+    RGB565 = "RGB565"
+    RGB565_SWAPPED = "RGB565_SWAPPED"
+    RGB555 = "RGB555"
+    RGB555_SWAPPED = "RGB555_SWAPPED"
+    BGR565 = "BGR565"
+    BGR565_SWAPPED = "BGR565_SWAPPED"
+    L8 = "L8"
+
+
+class Bitmap(array):
+    """
+    Width x height values, each below value_count; records the area written since last refresh.
+    Like the CircuitPython Bitmap it supports the buffer protocol (memoryview(bitmap)), with one
+    byte per value up to 8 bits per value, 'H' for 16 and 'I' for 32 (the board packs <8 bits).
+    """
+
+    def __new__(cls, width, height, value_count):
+        if value_count < 1 or value_count > 1 << 32:
+            raise ValueError("value_count must be 1 to 2**32")
+        typecode = "B" if value_count <= 256 else "H" if value_count <= 65536 else "I"
+        return super().__new__(cls, typecode, bytes(array(typecode).itemsize * width * height))
+
+    def __init__(self, width, height, value_count):
+        _count("Bitmap")
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self.bits_per_value = next(b for b in (1, 2, 4, 8, 16, 32) if value_count <= 1 << b)
+        self._data = memoryview(self)
+        self._dirty = None  # (x1, y1, x2, y2) written since the last refresh
+        self._version = 0
+
+    # Bitmaps are objects, not sequences: compare and hash by identity like on the board
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
+
+    def _mark(self, x1, y1, x2, y2):
+        self._dirty = _union(self._dirty, (x1, y1, x2, y2))
+        self._version += 1
+
+    def _index(self, key):
+        if isinstance(key, tuple):
+            x, y = key
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel index out of range")
+            return x, y, y * self.width + x
+        if not 0 <= key < self.width * self.height:
+            raise IndexError("pixel index out of range")
+        return key % self.width, key // self.width, key
+
+    def __getitem__(self, key):
+        return self._data[self._index(key)[2]]
+
+    def __setitem__(self, key, value):
+        if not 0 <= value < self.value_count:
+            raise ValueError(f"value {value} out of range for value_count {self.value_count}")
+        x, y, index = self._index(key)
+        self._data[index] = value
+        self._mark(x, y, x + 1, y + 1)
+
+    def fill(self, value):
+        if not 0 <= value < self.value_count:
+            raise ValueError(f"value {value} out of range for value_count {self.value_count}")
+        self._data[:] = array(self.typecode, [value]) * (self.width * self.height)
+        self._mark(0, 0, self.width, self.height)
+
+    def blit(self, x, y, source_bitmap, *, x1=0, y1=0, x2=None, y2=None, skip_index=None):
+        x2 = source_bitmap.width if x2 is None else x2
+        y2 = source_bitmap.height if y2 is None else y2
+        for sy in range(y1, y2):
+            dy = y + sy - y1
+            if not 0 <= dy < self.height:
+                continue
+            for sx in range(x1, x2):
+                dx = x + sx - x1
+                if 0 <= dx < self.width:
+                    value = source_bitmap._data[sy * source_bitmap.width + sx]
+                    if value != skip_index:
+                        self._data[dy * self.width + dx] = value
+        self._mark(max(0, x), max(0, y), min(self.width, x + x2 - x1), min(self.height, y + y2 - y1))
+
+    def dirty(self, x1=0, y1=0, x2=-1, y2=-1):
+        """Mark an area changed after writing the buffer directly (e.g. camera capture)"""
+        x2 = self.width if x2 < 0 else x2
+        y2 = self.height if y2 < 0 else y2
+        self._mark(x1, y1, x2, y2)
+
+    def deinit(self):
+        pass
+
+
+class Palette:
+    def __init__(self, color_count, *, dither=False):
+        _count("Palette")
+        self._colors = [0] * color_count
+        self._transparent = [False] * color_count
+        self.dither = dither
+        self._version = 0
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(value, (bytes, bytearray, tuple, list)):
+            value = (value[0] << 16) | (value[1] << 8) | value[2]
+        self._colors[index] = value & 0xFFFFFF
+        self._version += 1
+
+    def make_transparent(self, index):
+        self._transparent[index] = True
+        self._version += 1
+
+    def make_opaque(self, index):
+        self._transparent[index] = False
+        self._version += 1
+
+    def is_transparent(self, index):
+        return self._transparent[index]
+
+    def _lookup(self):
+        """RGB565 per index, None where transparent"""
+        return [None if t else _rgb888_to_565(c) for c, t in zip(self._colors, self._transparent)]
+
+
+class ColorConverter:
+    def __init__(self, *, input_colorspace=Colorspace.RGB888, dither=False):
+        _count("ColorConverter")
+        self.input_colorspace = input_colorspace
+        self.dither = dither
+        self._transparent_color = None
+        self._version = 0
+
+    def convert(self, color):
+        """Input color to RGB888"""
+        value = self._to_565(color)
+        r, g, b = (value >> 11) & 0x1F, (value >> 5) & 0x3F, value & 0x1F
+        return ((r * 255 // 31) << 16) | ((g * 255 // 63) << 8) | (b * 255 // 31)
+
+    def make_transparent(self, color):
+        self._transparent_color = color
+        self._version += 1
+
+    def make_opaque(self, color):
+        self._transparent_color = None
+        self._version += 1
+
+    def _to_565(self, value):
+        space = self.input_colorspace
+        if space == Colorspace.RGB888:
+            return _rgb888_to_565(value)
+        if space in (Colorspace.RGB565_SWAPPED, Colorspace.RGB555_SWAPPED, Colorspace.BGR565_SWAPPED):
+            value = ((value & 0xFF) << 8) | ((value >> 8) & 0xFF)
+        if space in (Colorspace.RGB555, Colorspace.RGB555_SWAPPED):
+            return ((value & 0x7FE0) << 1) | (value & 0x1F)
+        if space in (Colorspace.BGR565, Colorspace.BGR565_SWAPPED):
+            return ((value & 0x1F) << 11) | (value & 0x07E0) | (value >> 11)
+        if space == Colorspace.L8:
+            return _rgb888_to_565(value * 0x010101)
+        return value & 0xFFFF
+
+    def _lookup(self):
+        transparent = self._transparent_color
+        cache = {}
+
+        def lookup(value):
+            color = cache.get(value, -1)
+            if color == -1:
+                color = None if value == transparent else self._to_565(value)
+                cache[value] = color
+            return color
+
+        return lookup
+
+
+class OnDiskBitmap:
+    """
+    BMP file stand-in. Pixels are decoded once on the host, but every refresh that
+    draws it counts the file bytes the device would re-read (bytes_read).
+    """
+
+    def __init__(self, file):
+        _count("OnDiskBitmap")
+        with simenv.excluded():
+            self._decode(file)
+
+    def _decode(self, file):
+        if isinstance(file, str):
+            with open(simenv.device_path(file), "rb") as bmp:
+                data = bmp.read()
+        else:
+            data = file.read()
+        if data[:2] != b"BM":
+            raise ValueError("Invalid BMP file")
+        data_offset, header_size = struct.unpack_from("<II", data, 10)
+        width, height, _, bpp, compression = struct.unpack_from("<iiHHI", data, 18)
+        colors_used = struct.unpack_from("<I", data, 46)[0] if header_size >= 40 else 0
+        if compression not in (0, 3):
+            raise ValueError("Unsupported BMP compression")
+        self.width = width
+        self.height = abs(height)
+        self.bytes_read = 0
+        stride = (width * bpp + 31) // 32 * 4
+        self._stride = stride
+        if bpp <= 8:
+            count = colors_used or (1 << bpp)
+            self.pixel_shader = Palette(count)
+            for i in range(count):
+                b, g, r = data[14 + header_size + 4 * i:14 + header_size + 4 * i + 3]
+                self.pixel_shader[i] = (r << 16) | (g << 8) | b
+        elif bpp == 16:
+            self.pixel_shader = ColorConverter(
+                input_colorspace=Colorspace.RGB565 if compression == 3 else Colorspace.RGB555)
+        else:
+            self.pixel_shader = ColorConverter(input_colorspace=Colorspace.RGB888)
+        self._data = array("I", [0]) * (self.width * self.height)
+        for row in range(self.height):
+            y = self.height - 1 - row if height > 0 else row
+            offset = data_offset + row * stride
+            for x in range(width):
+                if bpp <= 8:
+                    bit = x * bpp
+                    value = (data[offset + bit // 8] >> (8 - bpp - bit % 8)) & ((1 << bpp) - 1)
+                elif bpp == 16:
+                    value = data[offset + 2 * x] | (data[offset + 2 * x + 1] << 8)
+                else:
+                    step = bpp // 8
+                    b, g, r = data[offset + step * x:offset + step * x + 3]
+                    value = (r << 16) | (g << 8) | b
+                self._data[y * width + x] = value
+        self._bpp = bpp
+        self._dirty = None
+        self._version = 0
+
+    def __getitem__(self, key):
+        x, y = key if isinstance(key, tuple) else (key % self.width, key // self.width)
+        return self._data[y * self.width + x]
+
+    def _account_read(self, pixel_count):
+        self.bytes_read += (pixel_count * self._bpp + 7) // 8
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1, tile_width=None, tile_height=None,
+                 default_tile=0, x=0, y=0):
+        _count("TileGrid")
+        tile_width = bitmap.width if tile_width is None else tile_width
+        tile_height = bitmap.height if tile_height is None else tile_height
+        if bitmap.width % tile_width:
+            raise ValueError("Tile width must exactly divide bitmap width")
+        if bitmap.height % tile_height:
+            raise ValueError("Tile height must exactly divide bitmap height")
+        self._bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        # 8-bit tile indexes unless the bitmap holds more than 255 tiles, as on the board
+        tiles_in_bitmap = (bitmap.width // tile_width) * (bitmap.height // tile_height)
+        self._tiles = bytearray([default_tile]) * (width * height) if tiles_in_bitmap <= 255 else \
+            [default_tile] * (width * height)
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self.flip_x = False
+        self.flip_y = False
+        self.transpose_xy = False
+        self._tiles_version = 0
+        self._parent = None
+
+    @property
+    def bitmap(self):
+        return self._bitmap
+
+    @bitmap.setter
+    def bitmap(self, new_bitmap):
+        if new_bitmap.width != self._bitmap.width or new_bitmap.height != self._bitmap.height:
+            raise ValueError("New bitmap must be same size as old bitmap")
+        self._bitmap = new_bitmap
+
+    def _tile_index(self, key):
+        if isinstance(key, tuple):
+            return key[1] * self.width + key[0]
+        return key
+
+    def __getitem__(self, key):
+        return self._tiles[self._tile_index(key)]
+
+    def __setitem__(self, key, value):
+        index = self._tile_index(key)
+        if self._tiles[index] != value:
+            self._tiles[index] = value
+            self._tiles_version += 1
+
+    def contains(self, touch_tuple):
+        x, y = touch_tuple[0], touch_tuple[1]
+        return (self.x <= x < self.x + self.width * self.tile_width and
+                self.y <= y < self.y + self.height * self.tile_height)
+
+
+class Group:
+    def __init__(self, *, scale=1, x=0, y=0):
+        _count("Group")
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self._layers = []
+        self._parent = None
+
+    def _adopt(self, layer):
+        if getattr(layer, "_parent", None) is not None:
+            raise ValueError("Layer already in a group")
+        layer._parent = self
+
+    def append(self, layer):
+        self._adopt(layer)
+        self._layers.append(layer)
+
+    def insert(self, index, layer):
+        self._adopt(layer)
+        self._layers.insert(index, layer)
+
+    def index(self, layer):
+        return self._layers.index(layer)
+
+    def pop(self, i=-1):
+        layer = self._layers.pop(i)
+        layer._parent = None
+        return layer
+
+    def remove(self, layer):
+        self._layers.remove(layer)
+        layer._parent = None
+
+    def sort(self, key=None, reverse=False):
+        self._layers.sort(key=key, reverse=reverse)
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __bool__(self):
+        return True
+
+    def __getitem__(self, index):
+        return self._layers[index]
+
+    def __setitem__(self, index, layer):
+        old = self._layers[index]
+        self._adopt(layer)
+        old._parent = None
+        self._layers[index] = layer
+
+    def __delitem__(self, index):
+        self.pop(index)
+
+    def __iter__(self):
+        return iter(self._layers)
+
+    def __contains__(self, layer):
+        return layer in self._layers
+
+
+class _Layer:
+    """One TileGrid as placed on screen during a refresh"""
+
+    def __init__(self, tilegrid, origin_x, origin_y, scale):
+        self.tilegrid = tilegrid
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.scale = scale
+        width = tilegrid.width * tilegrid.tile_width
+        height = tilegrid.height * tilegrid.tile_height
+        if tilegrid.transpose_xy:
+            width, height = height, width
+        self.rect = (origin_x, origin_y, origin_x + width * scale, origin_y + height * scale)
+        shader = tilegrid.pixel_shader
+        self.state = (self.rect, scale, id(tilegrid.bitmap), id(shader), getattr(shader, "_version", 0),
+                      tilegrid._tiles_version, tilegrid.flip_x, tilegrid.flip_y, tilegrid.transpose_xy)
+
+    def bitmap_area_to_screen(self, area):
+        """Screen rect covering a changed bitmap area (the whole layer if tiles make it ambiguous)"""
+        tg = self.tilegrid
+        if (tg.width, tg.height) != (1, 1) or tg.flip_x or tg.flip_y or tg.transpose_xy:
+            return self.rect
+        x1, y1, x2, y2 = area
+        s = self.scale
+        return (self.origin_x + x1 * s, self.origin_y + y1 * s, self.origin_x + x2 * s, self.origin_y + y2 * s)
+
+
+def _collect_layers(group, origin_x=0, origin_y=0, scale=1, layers=None):
+    """Flatten a Group tree into back-to-front visible TileGrid layers"""
+    if layers is None:
+        layers = []
+    if group.hidden:
+        return layers
+    origin_x += group.x * scale
+    origin_y += group.y * scale
+    scale *= group.scale
+    for layer in group:
+        if isinstance(layer, TileGrid):
+            if not layer.hidden:
+                layers.append(_Layer(layer, origin_x + layer.x * scale, origin_y + layer.y * scale, scale))
+        else:
+            _collect_layers(layer, origin_x, origin_y, scale, layers)
+    return layers
+
+
+class BusDisplay:
+    """
+    Display driver core. Subclasses (adafruit_ili9341.ILI9341) supply the init
+    sequence; the attached panel model receives everything sent over the bus.
+    """
+
+    def __init__(self, display_bus, init_sequence, *, width, height, colstart=0, rowstart=0, rotation=0,
+                 color_depth=16, set_column_command=0x2A, set_row_command=0x2B, write_ram_command=0x2C,
+                 backlight_pin=None, brightness=1.0, auto_refresh=True, **kwargs):
+        self.bus = display_bus
+        self.rotation = rotation
+        self._width, self._height = (height, width) if rotation in (90, 270) else (width, height)
+        self.colstart = colstart
+        self.rowstart = rowstart
+        self.brightness = brightness
+        self.auto_refresh = auto_refresh
+        self._column_command = set_column_command
+        self._row_command = set_row_command
+        self._ram_command = write_ram_command
+        self._root_group = None
+        self._full_refresh = True
+        self._previous = {}
+        self.refresh_count = 0
+        self.pixels_sent = 0
+        self.last_dirty_areas = []
+        self._send_init(init_sequence)
+        _displays.append(self)
+
+    def _send_init(self, sequence):
+        i = 0
+        while i < len(sequence):
+            command, length = sequence[i], sequence[i + 1]
+            delay = length & 0x80
+            length &= 0x7F
+            self.bus.send(command, bytes(sequence[i + 2:i + 2 + length]))
+            i += 2 + length
+            if delay:
+                simenv.advance((500 if sequence[i] == 255 else sequence[i]) / 1000)
+                i += 1
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def root_group(self):
+        return self._root_group
+
+    @root_group.setter
+    def root_group(self, group):
+        if group is not self._root_group:
+            self._root_group = group
+            self._full_refresh = True
+
+    def _dirty_areas(self, layers):
+        screen = (0, 0, self._width, self._height)
+        current = {id(layer.tilegrid): layer for layer in layers}
+        areas = []
+        if self._full_refresh:
+            areas.append(screen)
+        else:
+            for key, layer in current.items():
+                old = self._previous.get(key)
+                bitmap = layer.tilegrid.bitmap
+                if old is None or old[0] != layer.state:
+                    areas.append(layer.rect)
+                    if old is not None:
+                        areas.append(old[1])
+                elif getattr(bitmap, "_dirty", None):
+                    areas.append(layer.bitmap_area_to_screen(bitmap._dirty))
+            for key, old in self._previous.items():
+                if key not in current:
+                    areas.append(old[1])
+        clipped = []
+        for area in areas:
+            area = _intersect(area, screen)
+            if area and area not in clipped:
+                clipped.append(area)
+        return clipped
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        """Composite and send every dirty area; returns True like the real refresh()"""
+        with simenv.excluded():
+            layers = _collect_layers(self._root_group) if self._root_group is not None else []
+            areas = self._dirty_areas(layers)
+            rendered = []
+            for area in areas:
+                rendered.append((area, self._render(area, layers)))
+            # (state, rect) only: like the real display, keep no references that would pin old bitmaps
+            self._previous = {id(layer.tilegrid): (layer.state, layer.rect) for layer in layers}
+            self._full_refresh = False
+            for layer in layers:
+                layer.tilegrid.bitmap._dirty = None
+        # Bus traffic is outside the exclusion so it is charged to the script
+        for area, pixels in rendered:
+            self._send_area(area, pixels)
+        self.refresh_count += 1
+        self.last_dirty_areas = areas
+        return True
+
+    def _render(self, area, layers):
+        x1, y1, x2, y2 = area
+        width = x2 - x1
+        pixels = array("H", bytes(2)) * (width * (y2 - y1))
+        for layer in layers:
+            overlap = _intersect(area, layer.rect)
+            if overlap is None:
+                continue
+            tg = layer.tilegrid
+            bitmap = tg.bitmap
+            data = bitmap._data
+            bitmap_width = bitmap.width
+            tiles_per_row = bitmap_width // tg.tile_width
+            shader = tg.pixel_shader
+            lookup = shader._lookup()
+            palette = isinstance(lookup, list)
+            s = layer.scale
+            layer_w = (layer.rect[2] - layer.rect[0]) // s
+            layer_h = (layer.rect[3] - layer.rect[1]) // s
+            ox1, oy1, ox2, oy2 = overlap
+            for sy in range(oy1, oy2):
+                ly = (sy - layer.origin_y) // s
+                row_base = (sy - y1) * width - x1
+                for sx in range(ox1, ox2):
+                    lx = (sx - layer.origin_x) // s
+                    tx, ty = lx, ly
+                    if tg.flip_x:
+                        tx = layer_w - 1 - tx
+                    if tg.flip_y:
+                        ty = layer_h - 1 - ty
+                    if tg.transpose_xy:
+                        tx, ty = ty, tx
+                    tile = tg._tiles[(ty // tg.tile_height) * tg.width + tx // tg.tile_width]
+                    bx = (tile % tiles_per_row) * tg.tile_width + tx % tg.tile_width
+                    by = (tile // tiles_per_row) * tg.tile_height + ty % tg.tile_height
+                    value = data[by * bitmap_width + bx]
+                    color = (lookup[value] if value < len(lookup) else None) if palette else lookup(value)
+                    if color is not None:
+                        pixels[row_base + sx] = color
+            if isinstance(bitmap, OnDiskBitmap):
+                bitmap._account_read((ox2 - ox1) * (oy2 - oy1) // (s * s))
+        return pixels
+
+    def _to_panel(self, area, pixels):
+        """Rotate a rendered area into panel coordinates"""
+        x1, y1, x2, y2 = area
+        width, height = x2 - x1, y2 - y1
+        w, h = self._width, self._height
+        if self.rotation == 0:
+            return area, pixels
+        if self.rotation == 180:
+            out = array("H", reversed(pixels))
+            return (w - x2, h - y2, w - x1, h - y1), out
+        out = array("H", bytes(2)) * len(pixels)
+        for y in range(height):
+            for x in range(width):
+                if self.rotation == 90:
+                    px, py = height - 1 - y, x
+                else:
+                    px, py = y, width - 1 - x
+                out[py * height + px] = pixels[y * width + x]
+        if self.rotation == 90:
+            return (h - y2, x1, h - y1, x2), out
+        return (y1, w - x2, y2, w - x1), out
+
+    def _send_area(self, area, pixels):
+        (x1, y1, x2, y2), pixels = self._to_panel(area, pixels)
+        x1 += self.colstart
+        x2 += self.colstart
+        y1 += self.rowstart
+        y2 += self.rowstart
+        self.bus.send(self._column_command, struct.pack(">HH", x1, x2 - 1))
+        self.bus.send(self._row_command, struct.pack(">HH", y1, y2 - 1))
+        data = array("H", pixels)
+        if sys.byteorder == "little":
+            data.byteswap()
+        self.bus.send(self._ram_command, data.tobytes())
+        self.pixels_sent += len(pixels)
+
+
+Display = BusDisplay
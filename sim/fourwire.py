@@ -0,0 +1,35 @@
+# sim/fourwire.py
+"""
+Simulated fourwire.FourWire display bus. Commands go out over the simulated SPI
+(so bytes and bus time are counted) and are handed to the attached panel model.
+"""
+
+
+class FourWire:
+    def __init__(self, spi_bus, *, command, chip_select, reset=None, baudrate=24000000, polarity=0, phase=0):
+        self.spi = spi_bus
+        self.command = command
+        self.chip_select = chip_select
+        self.reset_pin = reset
+        self.baudrate = baudrate
+        self.panel = None  # set by the display driver, receives (command, data)
+        self.commands_sent = 0
+        self.bytes_sent = 0
+
+    def reset(self):
+        if self.panel is not None:
+            self.panel.reset()
+
+    def send(self, command, data, *, toggle_every_byte=False):
+        """Send one command byte (D/C low) followed by its data bytes (D/C high)"""
+        self.spi.configure(baudrate=self.baudrate)
+        self.spi.write(bytes((command,)))
+        if data:
+            self.spi.write(data)
+        self.commands_sent += 1
+        self.bytes_sent += 1 + len(data)
+        if self.panel is not None:
+            self.panel.receive(command, data)
+
+    def deinit(self):
+        pass
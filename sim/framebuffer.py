@@ -0,0 +1,80 @@
+# sim/framebuffer.py
+"""
+RGB565 framebuffer standing in for the ILI9341 panel memory, with PNG export.
+Uses a NumPy uint16 array when NumPy is installed, a flat array('H') otherwise.
+"""
+import struct
+import zlib
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Framebuffer:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        if numpy is not None:
+            self.pixels = numpy.zeros((height, width), dtype=numpy.uint16)
+        else:
+            self.pixels = array("H", bytes(2)) * (width * height)
+        self.pixels_written = 0
+
+    def write_row(self, x, y, values):
+        """Store a run of RGB565 values starting at (x, y)"""
+        if not 0 <= y < self.height:
+            return
+        end = min(self.width, x + len(values))
+        if end <= x:
+            return
+        values = values[:end - x]
+        if numpy is not None:
+            self.pixels[y, x:end] = values
+        else:
+            start = y * self.width
+            self.pixels[start + x:start + end] = array("H", values)
+        self.pixels_written += end - x
+
+    def get(self, x, y):
+        if numpy is not None:
+            return int(self.pixels[y, x])
+        return self.pixels[y * self.width + x]
+
+    def count_nonzero(self):
+        """Pixels that are not black"""
+        if numpy is not None:
+            return int(numpy.count_nonzero(self.pixels))
+        return len(self.pixels) - self.pixels.count(0)
+
+    def as_numpy(self):
+        """The framebuffer as a (height, width) uint16 NumPy array"""
+        if numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        return self.pixels
+
+    def rgb888_rows(self):
+        """Rows of RGB888 bytes, expanded from RGB565"""
+        for y in range(self.height):
+            row = bytearray(3 * self.width)
+            for x in range(self.width):
+                value = self.get(x, y)
+                r, g, b = (value >> 11) & 0x1F, (value >> 5) & 0x3F, value & 0x1F
+                row[3 * x] = (r << 3) | (r >> 2)
+                row[3 * x + 1] = (g << 2) | (g >> 4)
+                row[3 * x + 2] = (b << 3) | (b >> 2)
+            yield bytes(row)
+
+    def save_png(self, path):
+        raw = b"".join(b"\x00" + row for row in self.rgb888_rows())
+
+        def chunk(kind, data):
+            body = kind + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        with open(path, "wb") as png:
+            png.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) +
+                      chunk(b"IEND", b""))
@@ -0,0 +1,19 @@
+# sim/pwmio.py
+"""Simulated pwmio: PWMOut just remembers its settings"""
+
+
+class PWMOut:
+    def __init__(self, pin, *, duty_cycle=0, frequency=500, variable_frequency=False):
+        self.pin = pin
+        self.duty_cycle = duty_cycle
+        self.frequency = frequency
+        self.variable_frequency = variable_frequency
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.deinit()
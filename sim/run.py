@@ -0,0 +1,163 @@
+# sim/run.py
+"""
+Run a display script unchanged on a desktop computer against the simulated
+board, busio, fourwire, displayio, pwmio and adafruit_ili9341 modules in sim/.
+
+    python sim/run.py big-ILI9341-demo.py --snapshots snapshots/
+    python sim/run.py some-script.py --main --max-refreshes 50
+    python sim/run.py ili9341-adalogger-cowbell-SDcard-audio-test.py --main --sd sd/ --max-seconds 30
+
+For scripts with demo_* functions and run_demo(), each demo is run once in order
+and a PNG of the panel plus its bus statistics is saved after it. With --main the
+script runs as __main__ until it finishes or hits --max-refreshes.
+"""
+import argparse
+import os
+import runpy
+import sys
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+import simenv  # noqa: E402
+
+
+class SimulationDone(BaseException):
+    """Raised to stop a script that would otherwise loop forever"""
+
+
+def bus_totals():
+    """(bytes, commands, refreshes) summed over every simulated display"""
+    import displayio
+    total_bytes = total_commands = refreshes = 0
+    for display in displayio._displays:
+        total_bytes += display.bus.bytes_sent
+        total_commands += display.bus.commands_sent
+        refreshes += display.refresh_count
+    return total_bytes, total_commands, refreshes
+
+
+def current_display():
+    import displayio
+    return displayio._displays[-1] if displayio._displays else None
+
+
+def snapshot(path):
+    """Flush pending auto refresh, then save the panel framebuffer as PNG"""
+    display = current_display()
+    if display is None:
+        return False
+    if display.auto_refresh:
+        display.refresh()
+    with simenv.excluded():
+        display.panel.framebuffer.save_png(path)
+    return True
+
+
+def limit_refreshes(max_refreshes):
+    """Stop the script after max_refreshes display refreshes"""
+    import displayio
+    original = displayio.BusDisplay.refresh
+
+    def refresh(self, **kwargs):
+        result = original(self, **kwargs)
+        if self.refresh_count >= max_refreshes:
+            raise SimulationDone()
+        return result
+
+    displayio.BusDisplay.refresh = refresh
+
+
+def load_script(script):
+    """Execute the script's top level (setup) without running __main__, return its globals"""
+    run_demo = runpy.run_path(script, run_name="sim_script").get("run_demo")
+    if run_demo is None:
+        raise SystemExit(f"{script} has no run_demo(); use --main")
+    return run_demo.__globals__
+
+
+def demo_functions(module_globals):
+    """demo_* functions in the order run_demo() lists them (definition order as fallback)"""
+    names = [name for name, value in module_globals.items() if name.startswith("demo_") and callable(value)]
+    source = module_globals["run_demo"].__code__.co_names
+    listed = [name for name in source if name in names]
+    return listed or names
+
+
+def run_demos(script, out_dir, cycles=1, on_demo=None):
+    """Run every demo of a run_demo()-style script, snapshotting each; returns per-demo stats"""
+    module_globals = load_script(script)
+    results = []
+    for cycle in range(cycles):
+        for index, name in enumerate(demo_functions(module_globals)):
+            before = bus_totals()
+            start = simenv.monotonic()
+            module_globals[name]()
+            elapsed = simenv.monotonic() - start
+            stats = {"demo": name, "cycle": cycle, "seconds": round(elapsed, 3)}
+            if out_dir:
+                path = os.path.join(out_dir, f"{cycle:02d}-{index:02d}-{name}.png")
+                if snapshot(path):
+                    stats["snapshot"] = path
+            after = bus_totals()
+            stats.update(bus_bytes=after[0] - before[0], bus_commands=after[1] - before[1],
+                         refreshes=after[2] - before[2])
+            if on_demo:
+                on_demo(stats)
+            results.append(stats)
+    return results
+
+
+def run_main(script, out_dir, max_refreshes=None):
+    """Run the script as __main__; snapshot the panel when it ends or is stopped"""
+    if max_refreshes:
+        limit_refreshes(max_refreshes)
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except (SimulationDone, KeyboardInterrupt):
+        pass
+    if out_dir:
+        snapshot(os.path.join(out_dir, os.path.splitext(os.path.basename(script))[0] + ".png"))
+    return bus_totals()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a CircuitPython display script on the simulator")
+    parser.add_argument("script")
+    parser.add_argument("--snapshots", help="directory for PNG snapshots")
+    parser.add_argument("--cycles", type=int, default=1, help="times to run the demo list")
+    parser.add_argument("--main", action="store_true", help="run the script as __main__ instead")
+    parser.add_argument("--max-refreshes", type=int, help="stop after this many refreshes (--main)")
+    parser.add_argument("--max-seconds", type=float, help="stop at the first sleep after this much simulated time")
+    parser.add_argument("--sd", help="directory standing in for the SD card (default: sd/ in the repo)")
+    args = parser.parse_args()
+
+    simenv.install_time()
+    simenv.install_files()
+    if args.sd:
+        simenv.SD_ROOT = os.path.abspath(args.sd)
+    if args.max_seconds:
+        simenv.stop_after(args.max_seconds, SimulationDone)
+    if args.snapshots:
+        os.makedirs(args.snapshots, exist_ok=True)
+        simenv.allow_host_writes(args.snapshots)
+    script_dir = os.path.dirname(os.path.abspath(args.script))
+    sys.path.insert(1, script_dir)  # helper modules next to the script, as on CIRCUITPY
+
+    if args.main:
+        total_bytes, commands, refreshes = run_main(args.script, args.snapshots, args.max_refreshes)
+        print(f"🖥️ {refreshes} refreshes, {commands} commands, {total_bytes:,} bytes over SPI")
+        if simenv.open_files:
+            print(f"❌ {len(simenv.open_files)} device files left open")
+        return
+
+    def report(stats):
+        print(f"🖥️ {stats['demo']:24} {stats['seconds']:8.2f} s {stats['refreshes']:4} refreshes "
+              f"{stats['bus_bytes']:>10,} bytes")
+
+    run_demos(args.script, args.snapshots, args.cycles, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# sim/sdcardio.py
+"""
+Simulated sdcardio.SDCard. Files under the mount point live in simenv.SD_ROOT;
+every byte read or written is clocked over the shared SPI bus in 512-byte blocks
+(plus command/CRC overhead), so SD traffic shows up next to display traffic.
+Each write also waits WRITE_BUSY for the card to program it: one multi-block write
+pays that once, many small writes pay it each time.
+"""
+import simenv
+
+BLOCK_SIZE = 512
+BLOCK_OVERHEAD = 10  # command, response, start token and CRC bytes per block
+WRITE_BUSY = 0.0005  # seconds the card stays busy after each write command
+
+
+class SDCard:
+    def __init__(self, bus, cs, baudrate=8000000):
+        self.spi = bus
+        self.cs = cs
+        self.baudrate = baudrate
+        self.blocks_transferred = 0
+        self.bytes_transferred = 0
+
+    def count(self):
+        return 32 * 1024 * 1024 * 1024 // BLOCK_SIZE
+
+    def transfer(self, count):
+        """Clock `count` bytes of file data over SPI as whole blocks"""
+        if count <= 0:
+            return
+        blocks = (count + BLOCK_SIZE - 1) // BLOCK_SIZE
+        self.blocks_transferred += blocks
+        self.bytes_transferred += blocks * (BLOCK_SIZE + BLOCK_OVERHEAD)
+        self.spi.configure(baudrate=self.baudrate)
+        self.spi.readinto(bytearray(blocks * (BLOCK_SIZE + BLOCK_OVERHEAD)))
+
+    def write_busy(self):
+        simenv.advance(WRITE_BUSY)
+
+    def deinit(self):
+        pass
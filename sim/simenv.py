@@ -0,0 +1,199 @@
+# sim/simenv.py
+"""
+Shared state for the host-side simulator: the virtual clock, device path mapping
+and hooks run whenever the script sleeps.
+
+Simulated time = host time spent in the script itself + time.sleep() calls (which
+return immediately) + modeled SPI transfer time. Work done by the simulator itself
+(compositing, PNG writing) is excluded, so numbers reflect the script, not the sim.
+"""
+import builtins
+import os
+import time as _time
+
+_host_clock = _time.perf_counter
+_start = _host_clock()
+_offset = 0.0  # seconds added (sleeps, bus time) or removed (simulator overhead)
+
+# Directory that stands in for the CIRCUITPY drive, so "/fonts/x.bdf" resolves on the host
+DEVICE_ROOT = os.environ.get("SIM_DEVICE_ROOT", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Directory that stands in for the SD card mounted with storage.mount(vfs, "/sd")
+SD_ROOT = os.environ.get("SIM_SD_ROOT", os.path.join(DEVICE_ROOT, "sd"))
+
+_sleep_hooks = []
+_last_background = 0.0
+_host_open = builtins.open
+mounts = {}  # mount point -> (host directory, block device or None)
+host_write_dirs = []  # host directories tools write their output to; other absolute writes are device paths
+open_files = set()  # device files currently open through open(), to catch leaked handles
+
+
+def monotonic():
+    """Simulated seconds since the simulator started"""
+    return _host_clock() - _start + _offset
+
+
+def monotonic_ns():
+    return int(monotonic() * 1e9)
+
+
+def advance(seconds):
+    """Move simulated time forward without waiting (sleeps, modeled bus transfers)"""
+    global _offset
+    if seconds > 0:
+        _offset += seconds
+
+
+def sleep(seconds):
+    """Stand-in for time.sleep: run background work (auto refresh) then skip ahead"""
+    global _last_background
+    for hook in list(_sleep_hooks):
+        hook()
+    advance(seconds)
+    _last_background = monotonic()
+
+
+def background(interval=1 / 60):
+    """
+    Run background work (auto refresh) if `interval` simulated seconds passed since it last ran,
+    for sim modules that stand in for long Python loops the board would interrupt with it
+    """
+    global _last_background
+    if monotonic() - _last_background >= interval:
+        for hook in list(_sleep_hooks):
+            hook()
+        _last_background = monotonic()
+
+
+def on_sleep(hook):
+    """Register a callable run on every sleep, e.g. displayio auto refresh"""
+    if hook not in _sleep_hooks:
+        _sleep_hooks.append(hook)
+
+
+class excluded:
+    """Context manager hiding the host time of simulator internals from the script"""
+
+    def __enter__(self):
+        self._entered = _host_clock()
+        return self
+
+    def __exit__(self, *exc):
+        global _offset
+        _offset -= _host_clock() - self._entered
+        return False
+
+
+def _mount_for(path):
+    for point, (directory, device) in mounts.items():
+        if path == point or path.startswith(point.rstrip("/") + "/"):
+            return os.path.join(directory, path[len(point):].lstrip("/")), device
+    return None, None
+
+
+def device_path(path):
+    """Map an absolute device path (/fonts/..., /sd/...) onto DEVICE_ROOT or a mount if needed"""
+    if isinstance(path, str) and path.startswith("/"):
+        mounted, _ = _mount_for(path)
+        if mounted is not None:
+            return mounted
+        if not os.path.exists(path):
+            return os.path.join(DEVICE_ROOT, path.lstrip("/"))
+    return path
+
+
+class DeviceFile:
+    """File on a mounted block device: reads are charged to the device (SPI bytes and time)"""
+
+    def __init__(self, path, mode, device):
+        self._file = _host_open(path, mode)
+        self.name = path
+        self.device = device
+        open_files.add(self)
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        self.device.transfer(len(data))
+        return data
+
+    def readinto(self, buffer):
+        count = self._file.readinto(buffer)
+        self.device.transfer(count or 0)
+        return count
+
+    def write(self, data):
+        self.device.transfer(memoryview(data).nbytes)
+        if hasattr(self.device, "write_busy"):
+            self.device.write_busy()
+        return self._file.write(data)
+
+    def seek(self, offset, whence=0):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def close(self):
+        open_files.discard(self)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def allow_host_writes(path):
+    """Let open() write under the host directory path (a tool's output), not onto the simulated drive"""
+    host_write_dirs.append(os.path.abspath(path))
+
+
+def _host_write(path):
+    path = os.path.abspath(path)
+    return path == os.devnull or any(path == directory or path.startswith(directory.rstrip(os.sep) + os.sep) for directory in host_write_dirs)
+
+
+def _device_open(file, mode="r", *args, **kwargs):
+    if isinstance(file, str) and file.startswith("/"):
+        mounted, device = _mount_for(file)
+        if mounted is not None and device is not None and "b" in mode:
+            return DeviceFile(mounted, mode, device)
+        if mounted is None:
+            if mode[0] in "wax" or "+" in mode:
+                # Device code writing "/text_cache.bin" means the drive, whatever exists at / on the host
+                if not _host_write(file):
+                    return _host_open(os.path.join(DEVICE_ROOT, file.lstrip("/")), mode, *args, **kwargs)
+            elif not os.path.exists(file):
+                return _host_open(os.path.join(DEVICE_ROOT, file.lstrip("/")), mode, *args, **kwargs)
+            return _host_open(file, mode, *args, **kwargs)
+        return _host_open(mounted, mode, *args, **kwargs)
+    return _host_open(file, mode, *args, **kwargs)
+
+
+def install_files():
+    """Patch open() so scripts can use device paths (/fonts/..., /sd/...)"""
+    builtins.open = _device_open
+
+
+def stop_after(seconds, exception):
+    """Raise exception from the next sleep once simulated time passes `seconds`"""
+    def check():
+        if monotonic() >= seconds:
+            raise exception()
+    on_sleep(check)
+
+
+def install_time():
+    """Patch the time module so scripts see the simulated clock"""
+    _time.sleep = sleep
+    _time.monotonic = monotonic
+    _time.monotonic_ns = monotonic_ns
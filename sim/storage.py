@@ -0,0 +1,20 @@
+# sim/storage.py
+"""Simulated storage: mount() maps a VfsFat on a simulated SDCard to simenv.SD_ROOT"""
+import simenv
+
+
+class VfsFat:
+    def __init__(self, block_device):
+        self.block_device = block_device
+
+
+def mount(filesystem, mount_path, *, readonly=False):
+    simenv.mounts[mount_path] = (simenv.SD_ROOT, filesystem.block_device)
+
+
+def umount(mount):
+    simenv.mounts.pop(mount, None)
+
+
+def remount(mount_path, readonly=False, *, disable_concurrent_write_protection=False):
+    pass
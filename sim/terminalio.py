@@ -0,0 +1,5 @@
+# sim/terminalio.py
+"""Simulated terminalio: FONT is approximated with the small fonts/helvB08.bdf"""
+from adafruit_bitmap_font import bitmap_font
+
+FONT = bitmap_font.load_font("/fonts/helvB08.bdf")
@@ -0,0 +1,154 @@
+# spi_arbiter.py
+"""
+Arbitration for one SPI bus shared by the display and the SD card.
+
+displayio and sdcardio lock the bus themselves for each transfer, so the arbiter is
+a cooperative lock above them: every client takes it before starting bus work from
+Python (a display refresh, opening or reading a file), waiters are served lowest
+priority number first, and each client records how long it waited and held the bus.
+
+The arbiter only orders bus work started from Python. audiomp3.MP3Decoder refills its
+buffer from the open file in CircuitPython's background tasks, in C, while a track
+plays; those reads take the SPI lock directly and never see the arbiter, so a
+refresh can still queue behind (or delay) one of them. Keeping refreshes short and
+batched is what keeps that contention low.
+
+DisplayRefresher turns display changes into batched refreshes: changes only mark
+the screen as pending, and one refresh per interval pushes them all in one burst,
+taken through the arbiter so audio file reads go first.
+
+    bus = BusArbiter(spi)
+    sd = bus.client("sd", priority=0)
+    screen = bus.client("display", priority=1)
+    async with sd:
+        file = open("/sd/track.mp3", "rb")
+"""
+import asyncio
+import time
+
+
+class BusClient:
+    """One user of the bus; use `async with client:` in tasks or `with client:` in plain code"""
+
+    def __init__(self, arbiter, name, priority):
+        self.arbiter = arbiter
+        self.name = name
+        self.priority = priority  # lower number goes first
+        self.transactions = 0
+        self.wait_ns = 0
+        self.max_wait_ns = 0
+        self.busy_ns = 0
+        self._acquired_ns = 0
+
+    async def __aenter__(self):
+        await self.arbiter.acquire(self)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.arbiter.release(self)
+
+    def __enter__(self):
+        self.arbiter.acquire_now(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.arbiter.release(self)
+
+    def _granted(self, waited_ns):
+        self.transactions += 1
+        self.wait_ns += waited_ns
+        self.max_wait_ns = max(self.max_wait_ns, waited_ns)
+        self._acquired_ns = time.monotonic_ns()
+
+
+class BusArbiter:
+    """Owns the shared SPI object and hands it out one client at a time, by priority"""
+
+    def __init__(self, spi):
+        self.spi = spi
+        self.clients = []
+        self.owner = None
+        self._waiting = []  # (priority, arrival, client)
+        self._arrivals = 0
+
+    def client(self, name, priority=10):
+        client = BusClient(self, name, priority)
+        self.clients.append(client)
+        return client
+
+    def _first_waiting(self):
+        return min(self._waiting)[2] if self._waiting else None
+
+    async def acquire(self, client):
+        """Wait until the bus is free and no waiter with a lower priority number (or earlier arrival) is ahead"""
+        start = time.monotonic_ns()
+        entry = (client.priority, self._arrivals, client)
+        self._arrivals += 1
+        self._waiting.append(entry)
+        try:
+            while self.owner is not None or self._first_waiting() is not client:
+                await asyncio.sleep(0)
+        finally:
+            self._waiting.remove(entry)
+        self.owner = client
+        client._granted(time.monotonic_ns() - start)
+
+    def acquire_now(self, client):
+        """Take the bus from code that cannot wait (setup, the single-task parts of a script)"""
+        if self.owner is not None:
+            raise RuntimeError(f"SPI bus held by {self.owner.name}, {client.name} cannot take it")
+        self.owner = client
+        client._granted(0)
+
+    def release(self, client):
+        if self.owner is not client:
+            raise RuntimeError(f"{client.name} does not hold the SPI bus")
+        client.busy_ns += time.monotonic_ns() - client._acquired_ns
+        self.owner = None
+
+    def print_stats(self):
+        print("🚦 SPI bus (client, priority, transactions, wait ms, max wait ms, busy ms)")
+        for client in self.clients:
+            print(f"   {client.name:10} {client.priority:3} {client.transactions:6} {client.wait_ns / 1e6:9.1f} "
+                  f"{client.max_wait_ns / 1e6:9.1f} {client.busy_ns / 1e6:9.1f}")
+
+
+class DisplayRefresher:
+    """Coalesces display changes into at most one refresh per interval, taken through a bus client"""
+
+    def __init__(self, display, client, interval=0.1, refresh=None):
+        self.display = display
+        self.client = client
+        self._refresh = refresh or (lambda: display.refresh(minimum_frames_per_second=0))
+        self.interval = interval
+        self.pending = False
+        self.refreshes = 0
+        self._running = False
+
+    def request(self):
+        """Mark the screen as changed; the next refresh picks up everything changed since the last one"""
+        self.pending = True
+
+    async def run(self):
+        """Refresh task: runs until stop(), then flushes anything still pending"""
+        auto_refresh = self.display.auto_refresh
+        self.display.auto_refresh = False
+        self._running = True
+        try:
+            while self._running:
+                if self.pending:
+                    await self.flush()
+                await asyncio.sleep(self.interval)
+            if self.pending:
+                await self.flush()
+        finally:
+            self.display.auto_refresh = auto_refresh
+
+    async def flush(self):
+        async with self.client:
+            self.pending = False
+            self._refresh()
+            self.refreshes += 1
+
+    def stop(self):
+        self._running = False
@@ -0,0 +1,203 @@
+# text_cache.py
+"""
+Pre-rendered text for static screen text.
+Each (font, text) is rasterized once into a 1-bit Bitmap and kept in an LRU limited
+by a byte budget; label() hands out a positioned TileGrid (in a scaled Group when
+scale > 1) that shares the cached Bitmap and a per-color Palette, so drawing the
+same screen again costs no glyph lookups or bitmap composition. Fonts given by path
+are only loaded (through font_cache) when their text is not cached yet.
+
+Positioning follows adafruit_display_text.label.Label: y is the middle of the first
+line's ascent unless anchor_point/anchored_position are given.
+
+save() writes every entry keyed by a font path or font_key to a bundle file and
+load() reads it back, so a board with a writable drive can skip font loading after
+the first run.
+"""
+import struct
+import displayio
+import bitmaptools
+import font_cache
+
+BUNDLE_MAGIC = b"TXC1"
+# Rough per-entry bookkeeping (Bitmap object, key tuple, list) on top of pixel data
+_ENTRY_OVERHEAD = 64
+
+
+def bitmap_bytes(width, height):
+    """RAM held by a 2-value Bitmap (1 bit per pixel, rows 32-bit aligned)"""
+    return (width + 31) // 32 * 4 * height + _ENTRY_OVERHEAD
+
+
+def _ascent_descent(font):
+    if hasattr(font, "ascent"):
+        return font.ascent, font.descent
+    _, height, _, y_offset = font.get_bounding_box()
+    return height + y_offset, -y_offset
+
+
+def render(font, text, line_spacing=1.25):
+    """Rasterize text; returns [bitmap, left, top, box] with box as Label's (x, y, width, height)"""
+    ascent, descent = _ascent_descent(font)
+    if hasattr(font, "load_glyphs"):
+        font.load_glyphs(text)
+    line_height = int((ascent + descent) * line_spacing)
+    baseline_y = ascent // 2  # baseline relative to the label's y
+    placed = []  # (glyph, x, top)
+    min_x = max_x = 0
+    ink = None  # (x1, y1, x2, y2) of drawn pixels
+    baseline = 0
+    for line_number, line in enumerate(text.split("\n")):
+        cursor = 0
+        baseline = line_number * line_height
+        for char in line:
+            glyph = font.get_glyph(ord(char))
+            if glyph is None:
+                continue
+            left = cursor + glyph.dx
+            top = baseline_y + baseline - glyph.dy - glyph.height
+            placed.append((glyph, left, top))
+            min_x = min(min_x, left)
+            max_x = max(max_x, left + glyph.width, cursor + glyph.shift_x)
+            if glyph.width and glyph.height:
+                box = (left, top, left + glyph.width, top + glyph.height)
+                ink = box if ink is None else (min(ink[0], box[0]), min(ink[1], box[1]),
+                                               max(ink[2], box[2]), max(ink[3], box[3]))
+            cursor += glyph.shift_x
+    ink = ink or (0, 0, 1, 1)
+    bitmap = displayio.Bitmap(ink[2] - ink[0], ink[3] - ink[1], 2)
+    for glyph, left, top in placed:
+        if glyph.width and glyph.height:
+            x1 = glyph.tile_index * glyph.width  # built-in fonts keep every glyph in one bitmap
+            bitmaptools.blit(bitmap, glyph.bitmap, left - ink[0], top - ink[1], x1=x1, y1=0, x2=x1 + glyph.width,
+                             y2=glyph.height, skip_source_index=0)
+    box = (min_x, baseline_y - ascent, max(1, max_x - min_x), max(1, baseline + ascent + descent))
+    return [bitmap, ink[0], ink[1], box]
+
+
+class TextCache:
+    """LRU of rendered text keyed by (font, text), bounded by an approximate bitmap byte budget"""
+
+    def __init__(self, budget_bytes=24 * 1024, fonts=None):
+        self.budget_bytes = budget_bytes
+        self.fonts = fonts or font_cache.fonts
+        # Recency is a use count per entry, since MicroPython dicts do not keep insertion order
+        self._entries = {}  # (font key, text) -> [bitmap, left, top, box, bytes, last use]
+        self._uses = 0
+        self._palettes = {}  # color -> Palette with index 0 transparent
+        self.bytes_resident = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _palette(self, color):
+        palette = self._palettes.get(color)
+        if palette is None:
+            palette = displayio.Palette(2)
+            palette.make_transparent(0)
+            palette[1] = color
+            self._palettes[color] = palette
+        return palette
+
+    def get(self, font, text, font_key=None):
+        """[bitmap, left, top, box] for text in font (a font object or a path loaded through font_cache)"""
+        if font_key is None:
+            font_key = font if isinstance(font, str) else id(font)
+        key = (font_key, text)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._touch(entry)
+            return entry
+        self.misses += 1
+        if isinstance(font, str):
+            font = self.fonts.get(font, text)
+        entry = render(font, text)
+        self._add(key, entry)
+        return entry
+
+    def label(self, font, text, color=0xFFFFFF, scale=1, anchor_point=None, anchored_position=None, x=0, y=0,
+              font_key=None):
+        """TileGrid (or Group when scaled) showing cached text, positioned like a Label"""
+        bitmap, left, top, box = self.get(font, text, font_key)[:4]
+        if anchor_point is not None and anchored_position is not None:
+            x = int(anchored_position[0] - (box[0] + round(anchor_point[0] * box[2])) * scale)
+            y = int(anchored_position[1] - (box[1] + round(anchor_point[1] * box[3])) * scale)
+        if scale == 1:
+            return displayio.TileGrid(bitmap, pixel_shader=self._palette(color), x=x + left, y=y + top)
+        group = displayio.Group(scale=scale, x=x, y=y)
+        group.append(displayio.TileGrid(bitmap, pixel_shader=self._palette(color), x=left, y=top))
+        return group
+
+    def _touch(self, entry):
+        self._uses += 1
+        entry[5] = self._uses
+
+    def _add(self, key, entry):
+        size = bitmap_bytes(entry[0].width, entry[0].height)
+        entry += [size, 0]
+        self._touch(entry)
+        self._entries[key] = entry
+        self.bytes_resident += size
+        # Drop least recently used text until under budget (never the one just added)
+        while self.bytes_resident > self.budget_bytes and len(self._entries) > 1:
+            oldest = min(self._entries, key=lambda k: self._entries[k][5])
+            self.bytes_resident -= self._entries.pop(oldest)[4]
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every cached text"""
+        self._entries.clear()
+        self.bytes_resident = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Counters as a dict, handy for printing over serial"""
+        return {"texts": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "bytes_resident": self.bytes_resident, "budget_bytes": self.budget_bytes}
+
+    def save(self, path):
+        """Write entries keyed by a font path or name to a bundle; returns how many were written"""
+        entries = [(key, entry) for key, entry in self._entries.items() if isinstance(key[0], str)]
+        with open(path, "wb") as file:
+            file.write(BUNDLE_MAGIC + struct.pack("<H", len(entries)))
+            for (font_key, text), entry in entries:
+                bitmap, left, top, box = entry[:4]
+                name = (font_key + "\0" + text).encode("utf-8")
+                width, height = bitmap.width, bitmap.height
+                file.write(struct.pack("<H", len(name)) + name)
+                file.write(struct.pack("<hhHHhhHH", left, top, width, height, *box))
+                row = bytearray((width + 7) // 8)
+                for y in range(height):
+                    for i in range(len(row)):
+                        row[i] = 0
+                    for x in range(width):
+                        if bitmap[x, y]:
+                            row[x >> 3] |= 0x80 >> (x & 7)
+                    file.write(row)
+        return len(entries)
+
+    def load(self, path):
+        """Add the entries of a bundle written by save(), up to the budget; returns how many were added"""
+        added = 0
+        with open(path, "rb") as file:
+            if file.read(4) != BUNDLE_MAGIC:
+                raise ValueError(f"{path} is not a text cache bundle")
+            count = struct.unpack("<H", file.read(2))[0]
+            for _ in range(count):
+                name = file.read(struct.unpack("<H", file.read(2))[0]).decode("utf-8")
+                left, top, width, height, bx, by, bw, bh = struct.unpack("<hhHHhhHH", file.read(16))
+                if self.bytes_resident + bitmap_bytes(width, height) > self.budget_bytes:
+                    break
+                bitmap = displayio.Bitmap(width, height, 2)
+                bitmaptools.readinto(bitmap, file, 1)
+                font_key, text = name.split("\0", 1)
+                self._add((font_key, text), [bitmap, left, top, (bx, by, bw, bh)])
+                added += 1
+        return added
+
+
+# Shared cache used by the demo scripts
+texts = TextCache()
@@ -0,0 +1,122 @@
+# tools/bench_boot.py
+"""
+Time-to-first-pixel of the three scripts on the simulator, with and without the boot splash.
+
+    python tools/bench_boot.py                                # all three scripts
+    python tools/bench_boot.py big-ILI9341-demo.py --splash build/splash.565
+
+Each script runs as __main__ in a fresh Python process (so its imports are timed too)
+until boot_timer's finish() (the first screen or camera frame), once with BOOT_SPLASH
+set to None and once set to --splash (make it with tools/compile_screens.py; the camera
+script, at rotation 180, gets a copy turned around as its own frame would be). Printed:
+when the first pixel reached the simulated panel, when the first screen was up, and
+the phases boot_timer stamped. Simulated time runs with host CPU time, so imports and
+font parsing count, though not at the board's speed.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIM_DIR = os.path.join(REPO_DIR, "sim")
+SCRIPTS = ("big-ILI9341-demo.py", "ili9341_display_camera_picowbell.py", "ili9341-adalogger-cowbell-SDcard-audio-test.py")
+
+
+def turned(path):
+    """Copy of a raw RGB565 frame stored for rotation 180 (image_stream's R180 layout)"""
+    import array
+    import image_stream
+    with open(path, "rb") as file:
+        header, pixels = file.read(image_stream.RAW_HEADER), array.array("H", file.read())
+    pixels.reverse()
+    with tempfile.NamedTemporaryFile(suffix=".565", delete=False) as file:
+        file.write(image_stream.RAW_ROTATED_MAGIC + header[4:] + pixels.tobytes())
+    return file.name
+
+
+def boot_once(script, splash):
+    """Run script until its boot finishes (in this process); returns the boot stats as a dict"""
+    sys.path.insert(0, SIM_DIR)
+    sys.path.insert(1, os.path.dirname(os.path.abspath(script)))
+    import simenv
+    import run
+    simenv.install_time()
+    simenv.install_files()
+    simenv.SD_ROOT = tempfile.mkdtemp(prefix="sim-sd-")
+    with open(script) as file:
+        source = re.sub(r"^BOOT_SPLASH = .*$", f"BOOT_SPLASH = {splash!r}", file.read(), count=1, flags=re.M)
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as file:
+        file.write(source)
+    import framebuffer
+    first_pixel = []
+    write_row = framebuffer.Framebuffer.write_row
+
+    def timed_write_row(self, x, y, values):
+        if not first_pixel:
+            first_pixel.append(simenv.monotonic())
+        return write_row(self, x, y, values)
+    framebuffer.Framebuffer.write_row = timed_write_row
+
+    import boot_timer
+    finish = boot_timer.BootTimer.finish
+
+    def finish_and_stop(self, phase, first_pixel=True, log=True):
+        finish(self, phase, first_pixel, log=False)
+        raise run.SimulationDone()
+    boot_timer.BootTimer.finish = finish_and_stop
+    start = simenv.monotonic()
+    try:
+        with open(os.devnull, "w") as quiet:
+            stdout, sys.stdout = sys.stdout, quiet
+            try:
+                run.run_main(file.name, None)
+            finally:
+                sys.stdout = stdout
+    finally:
+        os.unlink(file.name)
+    stats = boot_timer.boot.stats()
+    stats["phases"] = boot_timer.boot.phases
+    stats["panel_first_pixel_ms"] = (first_pixel[0] - start) * 1000 if first_pixel else None
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boot phases and time to first pixel on the simulator")
+    parser.add_argument("scripts", nargs="*", default=SCRIPTS)
+    parser.add_argument("--splash", default=os.path.join(REPO_DIR, "scenes", "splash.565"),
+                        help="raw splash frame from tools/compile_screens.py")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(boot_once(args.scripts[0], None if args.splash == "None" else args.splash)))
+        return
+    if not os.path.exists(args.splash):
+        raise SystemExit(f"{args.splash} not found: run python tools/compile_screens.py first")
+    sys.path.insert(0, REPO_DIR)
+    print(f"{'script':48} {'splash':>6} {'first pixel ms':>15} {'first screen ms':>16}   phases (ms)")
+    for script in args.scripts:
+        path = script if os.path.exists(script) else os.path.join(REPO_DIR, script)
+        with open(path) as file:
+            rotated = re.search(r"rotation\s*=\s*180", file.read())
+        splash_path = turned(args.splash) if rotated else os.path.abspath(args.splash)
+        for splash in ("None", splash_path):
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), path, "--child", "--splash", splash],
+                                    capture_output=True, text=True)
+            if result.returncode:
+                print(result.stderr)
+                raise SystemExit(f"❌ {script} failed to boot")
+            stats = json.loads(result.stdout.splitlines()[-1])
+            phases = ", ".join(f"{name} {ms:,.0f}" for name, ms in stats["phases"])
+            print(f"{os.path.basename(path):48} {'no' if splash == 'None' else 'yes':>6} "
+                  f"{stats['panel_first_pixel_ms']:15,.0f} {stats['phases'][-1][1]:16,.0f}   {phases}")
+        if rotated:
+            os.unlink(splash_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# tools/bench_camera.py
+"""
+Measure camera-to-display throughput of camera_pipeline.py on the simulator in sim/
+for each pipeline mode and camera size.
+
+    python tools/bench_camera.py                 # all modes at QVGA and QQVGA (scaled x2)
+    python tools/bench_camera.py --frames 60 --noise 2
+    python tools/bench_camera.py --ladder --heap 200 --target-fps 12 --modes diff
+    python tools/bench_camera.py --process blur edges  # with frame_processing.py stages (needs NumPy)
+
+The simulated OV5640 produces a still test scene with one moving square (noise adds
+random low bits to every pixel), delivering a QVGA frame every 1/15 s. SPI runs at
+the FourWire default 24 MHz.
+
+--ladder runs camera_resolution.ResolutionManager instead, with frame buffers
+allocated from a modeled heap of --heap KB (MemoryError past it, mem_free() from
+it), and prints which rung it picks and where it steps down for --target-fps.
+"""
+import argparse
+import gc
+import os
+import sys
+import weakref
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+MODES = ("single", "double", "diff")
+
+
+def make_display():
+    import board
+    import busio
+    import displayio
+    import fourwire
+    import adafruit_ili9341
+    displayio.release_displays()
+    spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=board.GP16)
+    bus = fourwire.FourWire(spi, command=board.GP21, chip_select=board.GP20, reset=board.GP15)
+    return adafruit_ili9341.ILI9341(bus, width=320, height=240, rotation=180), bus
+
+
+def bench(mode, size, scale, frames, noise=0, crop=None, process=()):
+    """Run one configuration; returns a dict of per-frame averages"""
+    import adafruit_ov5640
+    from camera_pipeline import CameraPipeline
+    display, bus = make_display()
+    cam = adafruit_ov5640.OV5640(None, data_pins=(), clock=None, vsync=None, href=None, size=size, noise=noise)
+    processor = None
+    if process:
+        from frame_processing import FrameProcessor
+        processor = FrameProcessor(process)
+    pipeline = CameraPipeline(cam, display, mode=mode, scale=scale, crop=crop, processor=processor)
+    pipeline.start()
+    pipeline.step()  # first frame is always a full refresh
+    bytes_before = bus.bytes_sent
+    capture_ns = process_ns = refresh_ns = tiles = 0
+    start = simenv.monotonic()
+    for _ in range(frames):
+        pipeline.step()
+        capture_ns += pipeline.capture_ns
+        process_ns += pipeline.process_ns
+        refresh_ns += pipeline.refresh_ns
+        tiles += pipeline.dirty_tiles
+    elapsed = simenv.monotonic() - start
+    pipeline.stop()
+    return {
+        "mode": pipeline.mode,
+        "size": f"{cam.width}x{cam.height}",
+        "fps": frames / elapsed,
+        "capture_ms": capture_ns / frames / 1e6,
+        "process_ms": process_ns / frames / 1e6,
+        "refresh_ms": refresh_ns / frames / 1e6,
+        "bytes_per_frame": (bus.bytes_sent - bytes_before) // frames,
+        "dirty_tiles": tiles / frames,
+    }
+
+
+class HeapModel:
+    """Frame buffer allocator with a fixed budget, standing in for the board's heap"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+
+    def _free(self, size):
+        self.used -= size
+
+    def allocate(self, width, height, value_count):
+        import displayio
+        size = width * height * (1 if value_count <= 256 else 2)
+        if self.used + size > self.limit:
+            raise MemoryError(f"memory allocation failed, allocating {size} bytes")
+        bitmap = displayio.Bitmap(width, height, value_count)
+        self.used += size
+        weakref.finalize(bitmap, self._free, size)
+        return bitmap
+
+    def mem_free(self):
+        gc.collect()
+        return self.limit - self.used
+
+
+def bench_ladder(mode, heap_kb, target_fps, frames, noise=0, report_every=15):
+    """Run ResolutionManager on a modeled heap; returns [(rung name, mode, fps)] per report"""
+    import adafruit_ov5640
+    from camera_resolution import ResolutionManager
+    from frame_stats import FrameStats
+    display, bus = make_display()
+    cam = adafruit_ov5640.OV5640(None, data_pins=(), clock=None, vsync=None, href=None, noise=noise)
+    heap = HeapModel(heap_kb * 1024)
+    manager = ResolutionManager(cam, display, mode=mode, target_fps=target_fps, patience=1, reserve=0,
+                                allocator=heap.allocate, mem_free=heap.mem_free)
+    manager.choose().start()
+    stats = FrameStats(window=report_every, report_every=report_every, label="ladder")
+    reports = []
+    for _ in range(frames):
+        manager.pipeline.step()
+        if stats.end_frame():
+            reports.append((manager.ladder[manager.rung][0], manager.pipeline.mode, stats.fps()))
+            if manager.update(stats.fps()):
+                stats.start()
+    manager.pipeline.stop()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera pipeline throughput on the simulator")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--noise", type=int, default=0, help="random low bits per pixel (sensor noise)")
+    parser.add_argument("--modes", nargs="*", default=MODES, choices=MODES)
+    parser.add_argument("--process", nargs="*", default=(), help="frame_processing.py stages to run on every frame")
+    parser.add_argument("--ladder", action="store_true", help="run the resolution ladder on a modeled heap")
+    parser.add_argument("--heap", type=int, default=200, help="KB of heap for frame buffers (--ladder)")
+    parser.add_argument("--target-fps", type=float, default=12, help="step-down threshold (--ladder)")
+    args = parser.parse_args()
+
+    simenv.install_time()
+    if args.ladder:
+        for mode in args.modes:
+            print(f"--- {mode}, {args.heap} KB heap, target {args.target_fps} FPS")
+            for name, pipeline_mode, fps in bench_ladder(mode, args.heap, args.target_fps, args.frames * 4,
+                                                         args.noise):
+                print(f"   {name:12} {pipeline_mode:8} {fps:6.2f} FPS")
+        return
+    import adafruit_ov5640
+    sizes = ((adafruit_ov5640.OV5640_SIZE_QVGA, 1), (adafruit_ov5640.OV5640_SIZE_QQVGA, 2))
+    print(f"{'mode':8} {'size':>8} {'fps':>7} {'capture ms':>11} {'process ms':>11} {'refresh ms':>11} "
+          f"{'bytes/frame':>12} {'tiles':>6}")
+    for size, scale in sizes:
+        for mode in args.modes:
+            r = bench(mode, size, scale, args.frames, args.noise, process=args.process)
+            print(f"{r['mode']:8} {r['size']:>8} {r['fps']:7.2f} {r['capture_ms']:11.1f} {r['process_ms']:11.1f} "
+                  f"{r['refresh_ms']:11.1f} {r['bytes_per_frame']:12,} {r['dirty_tiles']:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
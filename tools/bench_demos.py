@@ -0,0 +1,213 @@
+# tools/bench_demos.py
+"""
+Benchmark every demo in run_demo() of big-ILI9341-demo.py on the simulator in sim/.
+
+For each demo it reports:
+  allocations       net Python memory blocks still allocated when the demo ends
+  peak_heap         peak bytes allocated by the script while the screen is built and shown
+  displayio_objects Bitmap/Palette/TileGrid/Group/... objects constructed
+  root_group_nodes  Groups + TileGrids reachable from display.root_group at the end
+  spi_bytes         bytes sent over the simulated SPI bus
+  first_frame_ms    simulated time from demo start to its first completed refresh
+
+    python tools/bench_demos.py                           # print table
+    python tools/bench_demos.py --json results.json       # also save JSON
+    python tools/bench_demos.py --save-baseline           # refresh tools/bench_baseline.json
+    python tools/bench_demos.py --compare                 # exit 1 if any demo regressed (tools/check_benchmarks.py)
+    python tools/bench_demos.py --warm                    # measure the second loop (caches filled)
+
+Heap numbers come from tracemalloc with the simulator's own allocations filtered
+out, so they compare screens with each other, not with the board's real heap.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIM_DIR = os.path.join(REPO_DIR, "sim")
+sys.path.insert(0, SIM_DIR)
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+DEFAULT_SCRIPT = os.path.join(REPO_DIR, "big-ILI9341-demo.py")
+DEFAULT_BASELINE = os.path.join(REPO_DIR, "tools", "bench_baseline.json")
+
+# Allowed growth before a metric counts as a regression (timing is noisier than counts)
+TOLERANCES = {
+    "allocations": 0.02,
+    "peak_heap": 0.05,
+    "displayio_objects": 0.0,
+    "root_group_nodes": 0.0,
+    "spi_bytes": 0.02,
+    "first_frame_ms": 0.50,
+}
+# Absolute slack so tiny values (a handful of blocks, a few ms) do not flap
+SLACK = {"allocations": 8, "peak_heap": 1024, "first_frame_ms": 5.0}
+
+_FILTERS = [tracemalloc.Filter(False, os.path.join(SIM_DIR, "*")),
+            tracemalloc.Filter(False, os.path.join(REPO_DIR, "tools", "*")),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+
+
+def _traced_bytes():
+    if not tracemalloc.is_tracing():
+        return 0  # the --warm pass runs untraced
+    return sum(stat.size for stat in tracemalloc.take_snapshot().filter_traces(_FILTERS).statistics("filename"))
+
+
+def count_nodes(group):
+    """Groups and TileGrids in a displayio tree"""
+    if group is None:
+        return 0
+    total = 1
+    for layer in getattr(group, "_layers", ()):
+        total += count_nodes(layer) if hasattr(layer, "_layers") else 1
+    return total
+
+
+class _Probe:
+    """Hooks the simulated display's refresh to catch first frame time and heap samples"""
+
+    def __init__(self, displayio):
+        self.displayio = displayio
+        self.original = displayio.BusDisplay.refresh
+        self.first_frame_at = None
+        self.peak = 0
+        probe = self
+
+        def refresh(display, **kwargs):
+            result = probe.original(display, **kwargs)
+            if probe.first_frame_at is None and display.last_dirty_areas:
+                probe.first_frame_at = simenv.monotonic()
+            with simenv.excluded():
+                probe.peak = max(probe.peak, _traced_bytes())
+            return result
+
+        displayio.BusDisplay.refresh = refresh
+
+    def reset(self):
+        self.first_frame_at = None
+        self.peak = 0
+
+
+def run_benchmarks(script=DEFAULT_SCRIPT, warm=False):
+    """Run each demo once on the simulator and return {demo name: metrics}"""
+    import run
+    simenv.install_time()
+    simenv.install_files()
+    sys.path.insert(1, os.path.dirname(os.path.abspath(script)))
+    module_globals = run.load_script(script)
+    import displayio
+    probe = _Probe(displayio)
+    names = run.demo_functions(module_globals)
+    if warm:
+        # Untimed pass fills caches shared across cycles (fonts, gradients), like the board's second loop
+        for name in names:
+            module_globals[name]()
+    results = {}
+    for name in names:
+        gc.collect()
+        created_before = sum(displayio.created.values())
+        bytes_before = run.bus_totals()[0]
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        probe.reset()
+        start = simenv.monotonic()
+        module_globals[name]()
+        if run.current_display().auto_refresh:
+            run.current_display().refresh()  # flush what auto refresh would still send
+        end_snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        probe.peak = max(probe.peak, sum(s.size for s in end_snapshot.statistics("filename")))
+        allocations = sum(diff.count_diff for diff in end_snapshot.compare_to(baseline, "filename")
+                          if diff.count_diff > 0)
+        tracemalloc.stop()
+        first_frame = probe.first_frame_at
+        results[name] = {
+            "allocations": allocations,
+            "peak_heap": probe.peak,
+            "displayio_objects": sum(displayio.created.values()) - created_before,
+            "root_group_nodes": count_nodes(run.current_display().root_group),
+            "spi_bytes": run.bus_totals()[0] - bytes_before,
+            "first_frame_ms": round((first_frame - start) * 1000, 1) if first_frame is not None else None,
+        }
+    return results
+
+
+def compare(results, baseline):
+    """List of regression messages for metrics that grew past their tolerance"""
+    problems = []
+    for demo, metrics in baseline.items():
+        current = results.get(demo)
+        if current is None:
+            problems.append(f"{demo}: missing from results")
+            continue
+        for metric, old in metrics.items():
+            new = current.get(metric)
+            if old is None or new is None:
+                continue
+            limit = old * (1 + TOLERANCES.get(metric, 0.1)) + SLACK.get(metric, 0)
+            if new > limit:
+                problems.append(f"{demo}: {metric} {old} -> {new} (limit {limit:.0f})")
+    return problems
+
+
+def print_table(results, baseline=None):
+    columns = list(TOLERANCES)
+    print(f"{'demo':24}" + "".join(f"{c:>19}" for c in columns))
+    for demo, metrics in results.items():
+        cells = []
+        for column in columns:
+            value = metrics[column]
+            old = (baseline or {}).get(demo, {}).get(column)
+            text = "-" if value is None else f"{value:,}"
+            if old not in (None, 0) and value is not None:
+                text += f" ({100 * (value - old) / old:+.0f}%)"
+            cells.append(f"{text:>19}")
+        print(f"{demo:24}" + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each demo of run_demo() on the simulator")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT)
+    parser.add_argument("--warm", action="store_true", help="run every demo once before measuring")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--compare", action="store_true", help="fail if any demo regressed against the baseline")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.script, args.warm)
+    for path in (args.json, args.save_baseline and args.baseline):
+        if path:
+            simenv.allow_host_writes(os.path.dirname(os.path.abspath(path)))
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_table(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=1)
+        print(f"✅ Baseline saved to {args.baseline}")
+    if args.compare:
+        if baseline is None:
+            raise SystemExit(f"❌ No baseline at {args.baseline}")
+        problems = compare(results, baseline)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            raise SystemExit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# tools/bench_images.py
+"""
+Compare ways of putting a full-screen image on the simulated ILI9341 (sim/):
+
+  ondisk      displayio.OnDiskBitmap in a TileGrid, shown with one refresh
+  stream-bmp  image_stream.blit() of the BMP, converted band by band
+  stream-raw  image_stream.blit() of the same image pre-converted to raw RGB565
+
+    python tools/bench_images.py                   # campus.bmp
+    python tools/bench_images.py --image other.bmp --band-rows 16
+
+Columns: file size, time until the image is on the glass, peak RAM held by the
+script while drawing (tracemalloc, simulator excluded), SPI bytes, and file bytes
+read for the first draw / for every later refresh that redraws the image.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIM_DIR = os.path.join(REPO_DIR, "sim")
+sys.path.insert(0, SIM_DIR)
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+_FILTERS = [tracemalloc.Filter(False, os.path.join(SIM_DIR, "*")),
+            tracemalloc.Filter(False, os.path.join(REPO_DIR, "tools", "*")),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+
+
+class _PeakProbe:
+    """Samples the script's traced memory every time something is sent to the display"""
+
+    def __init__(self, bus):
+        self.peak = 0
+        original = bus.send
+        probe = self
+
+        def send(command, data, **kwargs):
+            with simenv.excluded():
+                snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+                probe.peak = max(probe.peak, sum(stat.size for stat in snapshot.statistics("filename")))
+            return original(command, data, **kwargs)
+
+        bus.send = send
+
+
+def make_display():
+    import board
+    import busio
+    import displayio
+    import fourwire
+    import adafruit_ili9341
+    displayio.release_displays()
+    spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=board.GP16)
+    bus = fourwire.FourWire(spi, command=board.GP21, chip_select=board.GP20, reset=board.GP15)
+    return adafruit_ili9341.ILI9341(bus, width=320, height=240), bus
+
+
+def draw(method, path, band_rows, traced=False):
+    """Draw once on a fresh display; returns (seconds, peak RAM or None, SPI bytes, bytes read first, later)"""
+    import displayio
+    import image_stream
+    display, bus = make_display()
+    bytes_before = bus.bytes_sent
+    probe = None
+    if traced:
+        tracemalloc.start()
+        probe = _PeakProbe(bus)
+    start = simenv.monotonic()
+    first_read = later_read = None
+    if method == "ondisk":
+        bitmap = displayio.OnDiskBitmap(path)
+        group = displayio.Group()
+        group.append(displayio.TileGrid(bitmap, pixel_shader=bitmap.pixel_shader))
+        display.root_group = group
+        display.refresh()
+        first_read = bitmap.bytes_read
+        seconds = simenv.monotonic() - start
+        sent = bus.bytes_sent - bytes_before
+        display.root_group = displayio.Group()
+        display.root_group = group
+        display.refresh()
+        later_read = bitmap.bytes_read - first_read
+    else:
+        image_stream.blit(display, bus, path, band_rows=band_rows)
+        seconds = simenv.monotonic() - start
+        sent = bus.bytes_sent - bytes_before
+        first_read = os.path.getsize(path)
+        later_read = 0
+    if traced:
+        tracemalloc.stop()
+    return seconds, probe.peak if probe else None, sent, first_read, later_read
+
+
+def measure(method, path, band_rows):
+    """Time an untraced draw, then take peak RAM from a traced one (tracing slows the script down)"""
+    seconds, _, sent, first_read, later_read = draw(method, path, band_rows)
+    peak = draw(method, path, band_rows, traced=True)[1]
+    return {
+        "method": method,
+        "file_bytes": os.path.getsize(path),
+        "ms": seconds * 1000,
+        "peak_ram": peak,
+        "spi_bytes": sent,
+        "read_first": first_read,
+        "read_later": later_read,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OnDiskBitmap with streamed BMP/raw RGB565 blits")
+    parser.add_argument("--image", default=os.path.join(REPO_DIR, "campus.bmp"))
+    parser.add_argument("--band-rows", type=int, default=8)
+    args = parser.parse_args()
+
+    simenv.install_time()
+    simenv.install_files()
+    import image_stream
+    with tempfile.TemporaryDirectory() as tmp:
+        simenv.allow_host_writes(tmp)
+        raw_path = os.path.join(tmp, os.path.splitext(os.path.basename(args.image))[0] + ".565")
+        image_stream.save_raw(args.image, raw_path)
+        runs = [("ondisk", args.image), ("stream-bmp", args.image), ("stream-raw", raw_path)]
+        print(f"{'method':12} {'file bytes':>11} {'ms':>8} {'peak RAM':>9} {'SPI bytes':>10} {'read first':>11} "
+              f"{'read later':>11}")
+        for method, path in runs:
+            r = measure(method, path, args.band_rows)
+            print(f"{r['method']:12} {r['file_bytes']:>11,} {r['ms']:8.1f} {r['peak_ram']:>9,} {r['spi_bytes']:>10,} "
+                  f"{r['read_first']:>11,} {r['read_later']:>11,}")
+
+
+if __name__ == "__main__":
+    main()
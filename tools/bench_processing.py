@@ -0,0 +1,114 @@
+# tools/bench_processing.py
+"""
+Time frame_processing.py per stage at QVGA and QCIF and check it against per-pixel Python.
+
+    python tools/bench_processing.py                       # every stage, RGB565 and L8 frames
+    python tools/bench_processing.py --stages blur edges --frames 20 --no-reference
+
+Frames come from the simulated OV5640 (the test scene with its moving square and
+--noise). For each size, colorspace and stage the processor runs --frames times on
+fresh captures and the mean ms per frame is printed, next to the same stage written
+as a per-pixel Python loop (the reference): both must leave identical pixels in the
+frame. Times are host NumPy and host Python; on the board ulab runs the same array
+code, so compare the ratio rather than the ms. Needs NumPy (pip install numpy).
+"""
+import argparse
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+STAGES = ("gray", "blur", "edges", "threshold", "motion")
+
+
+def reference(stage, pixels, width, height, rgb, previous, threshold=96, motion_threshold=24):
+    """Process a flat list of pixels in place with per-pixel loops, as FrameProcessor does with arrays"""
+    if rgb:
+        level = [(((v >> 3) & 0x1F) * 77 + (((v & 0x07) << 3) | (v >> 13)) * 75 + ((v >> 8) & 0x1F) * 29) >> 5
+                 for v in pixels]
+    else:
+        level = list(pixels)
+    source = list(level)
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            i = y * width + x
+            if stage == "blur":
+                level[i] = sum(source[i + dy * width + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) // 9
+            elif stage == "edges":
+                gx = (source[i - width + 1] + 2 * source[i + 1] + source[i + width + 1]
+                      - source[i - width - 1] - 2 * source[i - 1] - source[i + width - 1])
+                gy = (source[i + width - 1] + 2 * source[i + width] + source[i + width + 1]
+                      - source[i - width - 1] - 2 * source[i - width] - source[i - width + 1])
+                level[i] = min(255, (abs(gx) + abs(gy)) >> 2)
+    if stage == "threshold":
+        level = [255 if v > threshold else 0 for v in level]
+    elif stage == "motion":
+        last = previous[:] or level
+        previous[:] = level
+        level = [255 if abs(v - p) > motion_threshold else 0 for v, p in zip(level, last)]
+    for i, v in enumerate(level):
+        pixels[i] = (v & 0xF8) | (v >> 5) | ((v & 0x1C) << 11) | ((v >> 3) << 8) if rgb else v
+
+
+def bench(size, rgb, stage, frames, noise, check):
+    """(processor ms per frame, reference ms per frame or None, frames that differ)"""
+    import adafruit_ov5640
+    import displayio
+    from frame_processing import FrameProcessor
+    cam = adafruit_ov5640.OV5640(None, data_pins=(), clock=None, vsync=None, href=None, size=size, noise=noise)
+    if not rgb:
+        cam.colorspace = adafruit_ov5640.OV5640_COLOR_GRAYSCALE
+    bitmap = displayio.Bitmap(cam.width, cam.height, 65535 if rgb else 256)
+    processor = FrameProcessor((stage,))
+    previous = []
+    reference_ns = wrong = 0
+    for _ in range(frames):
+        cam.capture(bitmap)
+        expected = list(bitmap) if check else None
+        processor.process(bitmap)
+        if check:
+            start = time.perf_counter_ns()
+            reference(stage, expected, cam.width, cam.height, rgb, previous)
+            reference_ns += time.perf_counter_ns() - start
+            wrong += list(bitmap) != expected
+    return processor.total_ns / frames / 1e6, reference_ns / frames / 1e6 if check else None, wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame processing stages: array code vs per-pixel Python")
+    parser.add_argument("--stages", nargs="*", default=STAGES, choices=STAGES)
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--noise", type=int, default=2, help="random low bits per pixel (sensor noise)")
+    parser.add_argument("--no-reference", action="store_true", help="skip the per-pixel loops and the check")
+    args = parser.parse_args()
+
+    simenv.install_time()
+    import adafruit_ov5640
+    from frame_processing import np
+    print(f"array module: {np.__name__} {getattr(np, '__version__', '')}")
+    sizes = (("QVGA", adafruit_ov5640.OV5640_SIZE_QVGA), ("QCIF", adafruit_ov5640.OV5640_SIZE_QCIF))
+    print(f"{'size':5} {'pixels':6} {'stage':10} {'array ms':>9} {'per-pixel ms':>13} {'speedup':>8} {'check':>6}")
+    failed = False
+    for name, size in sizes:
+        for rgb in (True, False):
+            for stage in args.stages:
+                ms, reference_ms, wrong = bench(size, rgb, stage, args.frames, args.noise, not args.no_reference)
+                failed |= bool(wrong)
+                speedup = f"{reference_ms / ms:7.0f}x" if reference_ms else ""
+                print(f"{name:5} {'RGB565' if rgb else 'L8':6} {stage:10} {ms:9.2f} "
+                      f"{f'{reference_ms:.1f}' if reference_ms else '-':>13} {speedup:>8} "
+                      f"{'-' if args.no_reference else 'ok' if not wrong else f'{wrong} bad':>6}")
+    if failed:
+        print("❌ array stages differ from the per-pixel reference")
+        sys.exit(1)
+    if not args.no_reference:
+        print("✅ array stages match the per-pixel reference")
+
+
+if __name__ == "__main__":
+    main()
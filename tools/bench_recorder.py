@@ -0,0 +1,138 @@
+# tools/bench_recorder.py
+"""
+Record the simulated camera to a file-backed SD card with frame_recorder.py and check
+the recording plays back frame for frame.
+
+    python tools/bench_recorder.py                         # double and diff modes, 4 KB writes
+    python tools/bench_recorder.py --frames 120 --write-bytes 512 4096 16384 --noise 1
+    python tools/bench_recorder.py --keep /tmp/sd          # keep the recordings in /tmp/sd
+
+Runs camera_pipeline.CameraPipeline at QVGA on the simulator in sim/ once without and
+once with a FrameRecorder on /sd (sdcardio.SDCard at 8 MHz on its own SPI bus, every
+write also waiting for the card to program it), and prints the preview FPS both ways,
+the recording's size and key frames, its sustained write throughput over the recording
+and the throughput while writing. Each recorded frame's pixels are hashed as it is
+added; playback through FramePlayer must give the same hashes, in order and when
+seeking to every seventh frame.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+sys.path.insert(2, os.path.dirname(os.path.abspath(__file__)))
+
+import simenv  # noqa: E402
+
+MODES = ("single", "double", "diff")
+
+
+def digest(bitmap):
+    with simenv.excluded():
+        return hashlib.sha1(memoryview(bitmap)).digest()
+
+
+def mount_sd():
+    import board
+    import busio
+    import sdcardio
+    import storage
+    spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=board.GP16)
+    sdcard = sdcardio.SDCard(spi, board.GP17)
+    storage.mount(storage.VfsFat(sdcard), "/sd")
+    return sdcard
+
+
+def run(mode, frames, noise, recorder=None):
+    """Preview frames with an optional recorder; returns (fps, frame hashes as recorded)"""
+    import adafruit_ov5640
+    from bench_camera import make_display
+    from camera_pipeline import CameraPipeline
+    display, _ = make_display()
+    cam = adafruit_ov5640.OV5640(None, data_pins=(), clock=None, vsync=None, href=None, noise=noise)
+    pipeline = CameraPipeline(cam, display, mode=mode, recorder=recorder)
+    hashes = []
+    if recorder is not None:
+        add = recorder.add
+
+        def hashing_add(bitmap, rows=None):
+            hashes.append(digest(bitmap))
+            return add(bitmap, rows)
+        recorder.add = hashing_add
+    start = simenv.monotonic()
+    pipeline.run(frames)
+    fps = frames / (simenv.monotonic() - start)
+    if recorder is not None:
+        recorder.close()
+    return fps, hashes
+
+
+def verify(path, hashes):
+    """Number of frames FramePlayer gets wrong, played in order and seeking backwards"""
+    import displayio
+    from frame_recorder import FramePlayer
+    wrong = 0
+    with FramePlayer(path) as player:
+        bitmap = displayio.Bitmap(player.width, player.height, 65535 if player.bytes_per_pixel == 2 else 256)
+        if len(player) != len(hashes):
+            return abs(len(player) - len(hashes)) + len(hashes)
+        for index in range(len(player)):
+            player.read(index, bitmap)
+            wrong += digest(bitmap) != hashes[index]
+        for index in range(len(player) - 1, -1, -7):
+            player.read(index, bitmap)
+            wrong += digest(bitmap) != hashes[index]
+    return wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera recording to a simulated SD card")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--noise", type=int, default=0, help="random low bits per pixel (sensor noise)")
+    parser.add_argument("--modes", nargs="*", default=("double", "diff"), choices=MODES)
+    parser.add_argument("--write-bytes", nargs="*", type=int, default=[4096])
+    parser.add_argument("--ring-bytes", type=int, default=16 * 1024)
+    parser.add_argument("--keep", help="directory for the SD card files (default: a temporary one)")
+    args = parser.parse_args()
+
+    simenv.install_time()
+    simenv.install_files()
+    simenv.SD_ROOT = args.keep or tempfile.mkdtemp(prefix="sim-sd-")
+    os.makedirs(simenv.SD_ROOT, exist_ok=True)
+    sdcard = mount_sd()
+    from frame_recorder import FrameRecorder
+
+    print(f"{'mode':8} {'write':>6} {'live fps':>9} {'rec fps':>8} {'bytes':>12} {'key':>5} {'sustained KB/s':>15} "
+          f"{'writing KB/s':>13} {'check':>6}")
+    failed = False
+    try:
+        for mode in args.modes:
+            live_fps, _ = run(mode, args.frames, args.noise)
+            for write_bytes in args.write_bytes:
+                path = f"/sd/{mode}-{write_bytes}.rec"
+                recorder = FrameRecorder(path, ring_bytes=max(args.ring_bytes, write_bytes), write_bytes=write_bytes,
+                                         log=False)
+                fps, hashes = run(mode, args.frames, args.noise, recorder)
+                stats = recorder.stats()
+                wrong = verify(path, hashes)
+                failed |= bool(wrong)
+                print(f"{mode:8} {write_bytes:>6} {live_fps:9.2f} {fps:8.2f} {stats['bytes_written']:12,} "
+                      f"{stats['key_frames']:>5} {stats['sustained_bytes_per_second'] / 1024:15.1f} "
+                      f"{stats['write_bytes_per_second'] / 1024:13.1f} {'ok' if not wrong else f'{wrong} bad':>6}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(simenv.SD_ROOT, ignore_errors=True)
+    print(f"\n{sdcard.blocks_transferred:,} SD blocks transferred")
+    if failed:
+        print("❌ playback differs from what was recorded")
+        sys.exit(1)
+    print("✅ every recording plays back as recorded")
+
+
+if __name__ == "__main__":
+    main()
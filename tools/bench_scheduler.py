@@ -0,0 +1,113 @@
+# tools/bench_scheduler.py
+"""
+Run the demo loop of big-ILI9341-demo.py through its DemoScheduler (demo_scheduler.py)
+on the simulator in sim/, with preloading off and on, and compare the transitions.
+
+    python tools/bench_scheduler.py
+    python tools/bench_scheduler.py --cycles 3 --budget 24 --heap 96
+
+Per demo and cycle: simulated ms from the start of the demo to its first frame, with
+the screen built when the demo starts (budget 0) and prepared during the previous demo
+(--budget KB), and the lowest free heap the scheduler saw. The heap is modeled as
+--heap KB minus the Python memory the script holds (tracemalloc, simulator excluded),
+so free bytes compare configurations with each other, not with the board.
+
+Every configuration runs in its own processes so font, text and gradient caches start
+cold in each: once untraced for the timing (tracing slows the host code the simulated
+clock is charged for) and once traced for the heap.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+DEFAULT_SCRIPT = os.path.join(REPO_DIR, "big-ILI9341-demo.py")
+
+
+def run_loop(script, budget_bytes, heap_bytes, cycles, traced):
+    """Run the scheduler loop on the simulator; returns the scheduler's record for every demo run"""
+    import run
+    from bench_demos import _traced_bytes
+    simenv.install_time()
+    simenv.install_files()
+    sys.path.insert(1, os.path.dirname(os.path.abspath(script)))
+    module_globals = run.load_script(script)
+    scheduler = module_globals["scheduler"]
+
+    def mem_free():
+        with simenv.excluded():
+            return heap_bytes - _traced_bytes()
+
+    # run_demo() fills in the demo list and loops forever: stop it after the last demo
+    records = []
+    run_next = scheduler.run_next
+
+    def counted_run_next():
+        records.append(run_next())
+        if len(records) == cycles * len(scheduler.demos):
+            raise KeyboardInterrupt
+
+    scheduler.run_next = counted_run_next
+    scheduler.budget_bytes = budget_bytes
+    scheduler.mem_free = mem_free if traced else None
+    scheduler.log = False
+    if traced:
+        tracemalloc.start()
+    module_globals["run_demo"]()
+    if traced:
+        tracemalloc.stop()
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare demo transitions with and without preloading")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT)
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--budget", type=int, default=32, help="KB the prepared screen may hold")
+    parser.add_argument("--heap", type=int, default=160, help="KB of modeled heap")
+    parser.add_argument("--run-budget", type=int, help=argparse.SUPPRESS)  # one configuration, JSON out
+    parser.add_argument("--traced", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_budget is not None:
+        sys.stdout = sys.stderr  # the demo's prints; JSON goes to the real stdout
+        records = run_loop(args.script, args.run_budget, args.heap * 1024, args.cycles, args.traced)
+        sys.__stdout__.write(json.dumps(records) + "\n")
+        return
+
+    def configuration(budget, traced):
+        command = [sys.executable, __file__, "--script", args.script, "--cycles", str(args.cycles),
+                   "--heap", str(args.heap), "--run-budget", str(budget)] + (["--traced"] if traced else [])
+        output = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout
+        return json.loads(output.decode().strip().splitlines()[-1])
+
+    results = []
+    for budget in (0, args.budget * 1024):
+        timing = configuration(budget, False)
+        for record, traced in zip(timing, configuration(budget, True)):
+            record["lowest_free"] = traced["lowest_free"]
+        results.append(timing)
+
+    def ms(record):
+        return f"{record['first_frame_ms']:.1f}" if record["first_frame_ms"] is not None else "-"
+
+    def free(record):
+        return f"{record['lowest_free']:,}" if record["lowest_free"] is not None else "-"
+
+    print(f"{'demo':26} {'cycle':>5} {'first frame ms':>15} {'prepared':>12} {'lowest free':>19}")
+    per_cycle = len(results[0]) // args.cycles
+    for i, (off, on) in enumerate(zip(*results)):
+        print(f"{off['demo']:26} {i // per_cycle:5} {f'{ms(off)} -> {ms(on)}':>15} "
+              f"{'yes' if on['prepared'] else 'no':>12} {f'{free(off)} -> {free(on)}':>19}")
+
+
+if __name__ == "__main__":
+    main()
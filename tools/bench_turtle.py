@@ -0,0 +1,109 @@
+# tools/bench_turtle.py
+"""
+Compare the turtle demo's drawing on the simulated ILI9341 (sim/) with adafruit_turtle
+and with the batched turtle (turtle_batch.py).
+
+    python tools/bench_turtle.py
+    python tools/bench_turtle.py --refresh-interval 0.05   # batched, refreshing while it draws
+
+Both draw the demo's 4 patterns of 21 rotated hexagons without its pauses. Columns:
+simulated draw time split into bus time (SPI bytes at the display baudrate) and the
+rest, Python-level drawing steps (pixels plotted by adafruit_turtle's loop, lines
+handed to bitmaptools.draw_line by the batched turtle), refreshes, SPI bytes and
+pixels lit on the panel (the two line algorithms round a few pixels differently).
+
+The simulator runs Python at host speed, many times faster than the board, so the
+CPU column understates adafruit_turtle's per-pixel loop; the step counts show
+how much Python work each does.
+"""
+import argparse
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+PATTERNS = [(0, 0, 50), (-80, -50, 30), (80, 50, 40), (0, -80, 25)]
+
+
+def make_display():
+    import board
+    import busio
+    import displayio
+    import fourwire
+    import adafruit_ili9341
+    displayio.release_displays()
+    spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=board.GP16)
+    bus = fourwire.FourWire(spi, command=board.GP21, chip_select=board.GP20, reset=board.GP15)
+    return adafruit_ili9341.ILI9341(bus, width=320, height=240), bus
+
+
+def draw(backend, refresh_interval=None):
+    """Draw the demo's patterns; returns {"ms", "bus_ms", "steps", "refreshes", "spi_bytes", "lit"}"""
+    display, bus = make_display()
+    if backend == "batched":
+        from turtle_batch import BatchTurtle, Color
+        pen = BatchTurtle(display, refresh_interval=refresh_interval)
+    else:
+        from adafruit_turtle import turtle, Color
+        pen = turtle(display)
+        plot = pen._plot
+        pen.steps = 0
+
+        def counted_plot(x, y, c):
+            pen.steps += 1
+            plot(x, y, c)
+
+        pen._plot = counted_plot
+    colors = [Color.RED, Color.ORANGE, Color.YELLOW, Color.GREEN, Color.BLUE, Color.PURPLE, Color.PINK]
+    pen.bgcolor(Color.BLACK)
+    pen.speed(0)
+    pen.pensize(1)
+    display.refresh()  # blank canvas on screen first, so only the drawing is counted
+    refreshes, sent = display.refresh_count, bus.bytes_sent
+    start = simenv.monotonic()
+    for pattern_x, pattern_y, pattern_size in PATTERNS:
+        pen.penup()
+        pen.goto(pattern_x, pattern_y)
+        pen.pendown()
+        for i in range(21):
+            pen.pencolor(colors[i % len(colors)])
+            for _ in range(6):
+                pen.forward(pattern_size)
+                pen.right(61)
+            pen.right(11.1111)
+        if backend == "batched":
+            pen.flush()
+        else:
+            display.refresh()  # what auto refresh still had to send
+    elapsed = simenv.monotonic() - start
+    if backend != "batched":
+        pen.hideturtle()
+        display.refresh()
+    with simenv.excluded():
+        lit = display.panel.framebuffer.count_nonzero()
+    sent = bus.bytes_sent - sent
+    return {"ms": elapsed * 1000, "bus_ms": sent * 8 / bus.baudrate * 1000,
+            "steps": pen.lines if backend == "batched" else pen.steps, "refreshes": display.refresh_count - refreshes,
+            "spi_bytes": sent, "lit": lit}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare adafruit_turtle with the batched turtle")
+    parser.add_argument("--refresh-interval", type=float, help="batched turtle: refresh every N seconds of drawing")
+    args = parser.parse_args()
+
+    simenv.install_time()
+    print(f"{'backend':15} {'ms':>8} {'CPU ms':>8} {'bus ms':>8} {'steps':>7} {'refreshes':>10} {'SPI bytes':>10} "
+          f"{'lit pixels':>11}")
+    for backend in ("adafruit_turtle", "batched"):
+        r = draw(backend, args.refresh_interval)
+        print(f"{backend:15} {r['ms']:8.1f} {r['ms'] - r['bus_ms']:8.1f} {r['bus_ms']:8.1f} {r['steps']:>7,} "
+              f"{r['refreshes']:>10} {r['spi_bytes']:>10,} {r['lit']:>11,}")
+
+
+if __name__ == "__main__":
+    main()
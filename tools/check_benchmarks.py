@@ -0,0 +1,72 @@
+# tools/check_benchmarks.py
+"""
+Fail when a demo of big-ILI9341-demo.py regressed against tools/bench_baseline.json.
+
+    python tools/check_benchmarks.py                   # exit 1 on any regression
+    python tools/check_benchmarks.py --baseline other.json
+
+Runs every demo once on the simulator with bench_demos.py and compares the counts
+with the baseline within bench_demos.TOLERANCES and SLACK (a few blocks and a few
+hundred bytes; displayio objects and root_group nodes must not grow at all). It first
+checks that compare() itself catches a regression just past each count's limit, so
+a loosened tolerance cannot pass silently. After an intended change, refresh the
+baseline with python tools/bench_demos.py --save-baseline and commit it.
+"""
+import argparse
+import json
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+sys.path.insert(2, os.path.dirname(os.path.abspath(__file__)))
+
+import bench_demos  # noqa: E402
+
+COUNTS = ("allocations", "peak_heap", "displayio_objects", "root_group_nodes", "spi_bytes")
+
+
+def check_compare(baseline):
+    """Metrics where compare() lets a value one past its limit through (should be none)"""
+    missed = []
+    for demo, metrics in baseline.items():
+        for metric in COUNTS:
+            old = metrics.get(metric)
+            if old is None:
+                continue
+            limit = old * (1 + bench_demos.TOLERANCES[metric]) + bench_demos.SLACK.get(metric, 0)
+            regressed = {demo: dict(metrics, **{metric: int(limit) + 1})}
+            if not bench_demos.compare(regressed, {demo: metrics}):
+                missed.append(f"{demo}: {metric}")
+            if bench_demos.compare({demo: dict(metrics)}, {demo: metrics}):
+                missed.append(f"{demo}: {metric} fails against itself")
+    return missed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if any demo regressed against the benchmark baseline")
+    parser.add_argument("--script", default=bench_demos.DEFAULT_SCRIPT)
+    parser.add_argument("--baseline", default=bench_demos.DEFAULT_BASELINE)
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    missed = check_compare(baseline)
+    for problem in missed:
+        print(f"❌ compare() misses a regression in {problem}")
+    if missed:
+        raise SystemExit(1)
+
+    results = bench_demos.run_benchmarks(args.script)
+    bench_demos.print_table(results, baseline)
+    problems = bench_demos.compare(results, baseline)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        raise SystemExit(f"❌ {len(problems)} regressions against {os.path.basename(args.baseline)}")
+    print(f"✅ {len(results)} demos within tolerance of the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# tools/check_compositor.py
+"""
+Check compositor.py against the simulated ILI9341 framebuffer (sim/) and report what
+its refreshes cost.
+
+    python tools/check_compositor.py                   # every demo of big-ILI9341-demo.py
+    python tools/check_compositor.py --cycles 2
+    python tools/check_compositor.py --camera --frames 20
+
+After every Compositor.refresh() the panel framebuffer is compared with a full redraw
+of the display's root group; a refresh that sent too little (a damaged area the
+compositor missed) shows up as a mismatch. --camera runs camera_pipeline.py through
+a compositor in each pipeline mode, with the simulated OV5640's moving square.
+
+Columns per demo or mode: refreshes sent, of them full-screen repaints, refreshes
+skipped for lack of damage, merged damaged pixels, SPI bytes, and mismatches.
+"""
+import argparse
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+
+class Checker:
+    """Wraps Compositor.refresh to compare the panel with a full redraw after each refresh"""
+
+    def __init__(self):
+        import compositor
+        self.original = compositor.Compositor.refresh
+        self.reset()
+        checker = self
+
+        def refresh(comp, area=None):
+            rects = checker.original(comp, area)
+            with simenv.excluded():
+                checker.calls += 1
+                checker.damaged_px += sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rects)
+                if rects and not checker.matches(comp.display):
+                    checker.mismatches += 1
+            return rects
+
+        compositor.Compositor.refresh = refresh
+
+    def reset(self):
+        self.calls = 0
+        self.damaged_px = 0
+        self.mismatches = 0
+
+    @staticmethod
+    def matches(display):
+        import displayio
+        screen = (0, 0, display.width, display.height)
+        layers = displayio._collect_layers(display.root_group) if display.root_group is not None else []
+        _, pixels = display._to_panel(screen, display._render(screen, layers))
+        return pixels.tobytes() == bytes(display.panel.framebuffer.pixels)
+
+
+def _row(name, checker, stats, sent):
+    return (name, stats["refreshes"], stats["full_refreshes"], stats["skipped"], checker.damaged_px, sent,
+            checker.mismatches)
+
+
+def check_demos(script, cycles):
+    import run
+    simenv.install_files()
+    sys.path.insert(1, os.path.dirname(os.path.abspath(script)))
+    checker = Checker()
+    module_globals = run.load_script(script)
+    comp = module_globals["compositor"]
+    rows = []
+    for cycle in range(cycles):
+        for name in run.demo_functions(module_globals):
+            before, sent = comp.stats(), run.bus_totals()[0]
+            checker.reset()
+            module_globals[name]()
+            stats = {key: value - before[key] for key, value in comp.stats().items()}
+            rows.append(_row(f"{cycle}:{name}", checker, stats, run.bus_totals()[0] - sent))
+    return rows
+
+
+def check_camera(frames):
+    import adafruit_ov5640
+    from bench_camera import make_display, MODES
+    from camera_pipeline import CameraPipeline
+    from compositor import Compositor
+    checker = Checker()
+    rows = []
+    for mode in MODES:
+        display, bus = make_display()
+        comp = Compositor(display)
+        cam = adafruit_ov5640.OV5640(None, data_pins=(), clock=None, vsync=None, href=None,
+                                     size=adafruit_ov5640.OV5640_SIZE_QQVGA)
+        pipeline = CameraPipeline(cam, display, mode=mode, scale=2, compositor=comp)
+        checker.reset()
+        sent = bus.bytes_sent
+        for _ in range(frames):
+            pipeline.step()
+        pipeline.stop()
+        rows.append(_row(f"camera {pipeline.mode}", checker, comp.stats(), bus.bytes_sent - sent))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check compositor refreshes against full redraws on the simulator")
+    parser.add_argument("--script", default=os.path.join(REPO_DIR, "big-ILI9341-demo.py"))
+    parser.add_argument("--cycles", type=int, default=1)
+    parser.add_argument("--camera", action="store_true", help="check camera_pipeline.py instead of the demos")
+    parser.add_argument("--frames", type=int, default=20, help="camera frames per mode (--camera)")
+    args = parser.parse_args()
+
+    simenv.install_time()
+    sys.path.insert(1, os.path.join(REPO_DIR, "tools"))
+    rows = check_camera(args.frames) if args.camera else check_demos(args.script, args.cycles)
+    print(f"{'demo':30} {'refreshes':>9} {'full':>5} {'skipped':>7} {'damaged px':>11} {'SPI bytes':>10} "
+          f"{'mismatches':>10}")
+    for name, refreshes, full, skipped, damaged, sent, mismatches in rows:
+        print(f"{name:30} {refreshes:9} {full:5} {skipped:7} {damaged:11,} {sent:10,} {mismatches:10}")
+    if any(row[-1] for row in rows):
+        raise SystemExit("❌ the panel differs from a full redraw after some refreshes")
+    print("✅ every refresh matches a full redraw")
+
+
+if __name__ == "__main__":
+    main()
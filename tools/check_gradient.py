@@ -0,0 +1,85 @@
+# tools/check_gradient.py
+"""
+Check the demo's two banded gradients (gradient.py) against the per-row strips they replaced.
+
+    python tools/check_gradient.py
+
+The splash screen's black-to-gray background had one gray step every 4 rows (gray
+y // 4) and the font screen's dark blue one a blue step every 8 rows (0x000020 + y // 8),
+each drawn as 240 one-row Bitmaps. For both, gradient_tilegrid() must make a Palette
+with that many bands (60 and 30), give every row the color its strip had, and draw
+it: after a refresh on the simulated ILI9341 every pixel of row y must be that color
+in RGB565.
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+# name, gradient_tilegrid() arguments, bands, color of row y in the original demo
+GRADIENTS = (
+    ("splash black to gray", (0x000000, 0x3B3B3B), 60, lambda y: (y // 4) * 0x010101),
+    ("fonts dark blue", (0x000020, 0x00003D), 30, lambda y: 0x000020 + y // 8),
+)
+
+
+def make_display():
+    import board
+    import busio
+    import displayio
+    import fourwire
+    import adafruit_ili9341
+    displayio.release_displays()
+    spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=board.GP16)
+    bus = fourwire.FourWire(spi, command=board.GP21, chip_select=board.GP20, reset=board.GP15)
+    return adafruit_ili9341.ILI9341(bus, width=320, height=240, rotation=0)
+
+
+def check(display, colors, bands, expected):
+    """Problems with one gradient, as messages"""
+    import displayio
+    from gradient import gradient_tilegrid
+    problems = []
+    grid = gradient_tilegrid(*colors, bands=bands)
+    palette, bitmap = grid.pixel_shader, grid.bitmap
+    if len(palette) != bands:
+        problems.append(f"{len(palette)} palette entries, expected {bands}")
+    used = {bitmap[0, y] for y in range(bitmap.height)}
+    if len(used) != bands:
+        problems.append(f"{len(used)} bands used, expected {bands}")
+    wrong_rows = [y for y in range(240) if palette[bitmap[0, y]] != expected(y)]
+    if wrong_rows:
+        y = wrong_rows[0]
+        problems.append(f"{len(wrong_rows)} rows with the wrong palette color, first row {y}: "
+                        f"{palette[bitmap[0, y]]:06x}, expected {expected(y):06x}")
+    group = displayio.Group()
+    group.append(grid)
+    display.root_group = group
+    display.refresh()
+    framebuffer = display.panel.framebuffer
+    wrong_pixels = sum(framebuffer.get(x, y) != displayio._rgb888_to_565(expected(y))
+                       for y in range(240) for x in range(320))
+    if wrong_pixels:
+        problems.append(f"{wrong_pixels:,} pixels on the panel differ from the original strips")
+    return problems
+
+
+def main():
+    simenv.install_time()
+    display = make_display()
+    failed = False
+    for name, colors, bands, expected in GRADIENTS:
+        problems = check(display, colors, bands, expected)
+        print(f"{'❌' if problems else '✅'} {name}: {bands} bands" + "".join(f"\n   {p}" for p in problems))
+        failed |= bool(problems)
+    if failed:
+        raise SystemExit("❌ gradients differ from the per-row strips")
+    print("✅ both gradients match the per-row strips")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# tools/check_ladder.py
+"""
+Check camera_resolution.ResolutionManager's ladder against a mocked frame buffer allocator.
+
+    python tools/check_ladder.py
+
+Frame buffers come from bench_camera.HeapModel, a fixed budget that raises
+MemoryError past it and reports what is left as mem_free(). For each heap size the
+manager must pick the expected rung and pipeline mode (falling back to single
+buffering, or raising MemoryError when nothing fits), also when mem_free() is not
+available and only MemoryError tells it a rung does not fit; afterwards the modeled
+heap must hold exactly the chosen rung's buffers. Stepping down on slow FPS reports
+must walk to smaller frames, free the old ones first and stop at the bottom.
+"""
+import gc
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+sys.path.insert(2, os.path.dirname(os.path.abspath(__file__)))
+
+import simenv  # noqa: E402
+
+# heap KB, requested mode, whether mem_free() is known, expected (rung, mode) or None for MemoryError
+CHOICES = (
+    (400, "double", True, ("QVGA", "double")),
+    (200, "double", True, ("HQVGA", "double")),
+    (200, "double", False, ("HQVGA", "double")),
+    (100, "diff", True, ("QQVGA", "diff")),
+    (60, "double", True, ("QQVGA gray", "double")),
+    (30, "double", True, ("96x96 gray", "single")),
+    (30, "double", False, ("96x96 gray", "double")),  # no reserve is kept without mem_free()
+    (20, "single", True, None),
+)
+# Rungs stepped through from QVGA single on a roomy heap while every report is too slow
+STEPS = ("QVGA", "HQVGA", "QVGA gray", "QCIF", "QQVGA", "QCIF gray", "QQVGA gray", "96x96 gray")
+
+
+def manager(heap, mode, known_free=True, target_fps=None):
+    import adafruit_ov5640
+    from bench_camera import make_display
+    from camera_resolution import ResolutionManager
+    display, _ = make_display()
+    cam = adafruit_ov5640.OV5640(None, data_pins=(), clock=None, vsync=None, href=None)
+    return ResolutionManager(cam, display, mode=mode, target_fps=target_fps, patience=2, allocator=heap.allocate,
+                             mem_free=heap.mem_free if known_free else None)
+
+
+def held(heap, resolution):
+    """Problem when the modeled heap holds more or less than the running rung's buffers"""
+    gc.collect()
+    expected = resolution.buffer_bytes(resolution.rung, resolution.pipeline.mode)
+    if heap.used != expected:
+        return f"heap holds {heap.used:,} bytes, the {resolution.ladder[resolution.rung][0]} buffers {expected:,}"
+    return None
+
+
+def check_choices():
+    from bench_camera import HeapModel
+    problems = []
+    for heap_kb, mode, known_free, expected in CHOICES:
+        heap = HeapModel(heap_kb * 1024)
+        resolution = manager(heap, mode, known_free)
+        case = f"{heap_kb} KB {mode}{'' if known_free else ' without mem_free()'}"
+        try:
+            pipeline = resolution.choose()
+        except MemoryError:
+            if expected is not None:
+                problems.append(f"{case}: MemoryError, expected {expected[0]} {expected[1]}")
+            continue
+        got = (resolution.ladder[resolution.rung][0], pipeline.mode)
+        if got != expected:
+            problems.append(f"{case}: {got[0]} {got[1]}, expected " +
+                            (f"{expected[0]} {expected[1]}" if expected else "MemoryError"))
+        problem = held(heap, resolution)
+        if problem:
+            problems.append(f"{case}: {problem}")
+    return problems
+
+
+def check_steps():
+    from bench_camera import HeapModel
+    problems = []
+    heap = HeapModel(400 * 1024)
+    resolution = manager(heap, "single", target_fps=12)
+    resolution.choose()
+    rungs = [resolution.ladder[resolution.rung][0]]
+    while True:
+        if resolution.update(5):
+            problems.append(f"{rungs[-1]}: stepped down after one slow report, patience is 2")
+        if not resolution.update(5):
+            break
+        rungs.append(resolution.ladder[resolution.rung][0])
+        problem = held(heap, resolution)
+        if problem:
+            problems.append(f"{rungs[-1]}: {problem}")
+    if tuple(rungs) != STEPS:
+        problems.append(f"stepped through {', '.join(rungs)}, expected {', '.join(STEPS)}")
+    if resolution.update(20) or resolution.update(5) or resolution.update(5):
+        problems.append("stepped past the bottom of the ladder")
+    return problems
+
+
+def main():
+    simenv.install_time()
+    failed = False
+    for name, check in (("rung choice", check_choices), ("step down", check_steps)):
+        with open(os.devnull, "w") as quiet:
+            stdout, sys.stdout = sys.stdout, quiet
+            try:
+                problems = check()
+            finally:
+                sys.stdout = stdout
+        print(f"{'❌' if problems else '✅'} {name}" + "".join(f"\n   {p}" for p in problems))
+        failed |= bool(problems)
+    if failed:
+        raise SystemExit("❌ the resolution ladder misbehaves")
+    print("✅ the resolution ladder picks and steps as expected")
+
+
+if __name__ == "__main__":
+    main()
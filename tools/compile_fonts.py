@@ -0,0 +1,484 @@
+# tools/compile_fonts.py
+"""
+Host-side font compiler for the fonts/ directory (run with desktop Python, not on the board).
+Reads the BDF and PCF fonts, keeps only the glyphs the demo scripts draw, and writes
+compact binary PCF files that adafruit_bitmap_font loads faster than text BDF.
+A manifest.json records what was kept, and a benchmark prints parse time and size
+before/after for every font.
+
+    python tools/compile_fonts.py                      # all fonts, strings scanned from *.py
+    python tools/compile_fonts.py --text "0123456789"  # extra characters to keep
+    python tools/compile_fonts.py --all-glyphs         # convert only, no subsetting
+
+Copy the output directory to the board and point the demo font paths at it.
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import struct
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# PCF table types
+PCF_PROPERTIES = 1 << 0
+PCF_ACCELERATORS = 1 << 1
+PCF_METRICS = 1 << 2
+PCF_BITMAPS = 1 << 3
+PCF_INK_METRICS = 1 << 4
+PCF_BDF_ENCODINGS = 1 << 5
+PCF_SWIDTHS = 1 << 6
+PCF_GLYPH_NAMES = 1 << 7
+PCF_BDF_ACCELERATORS = 1 << 8
+
+# PCF format bits
+PCF_GLYPH_PAD_MASK = 3 << 0
+PCF_BYTE_MASK = 1 << 2
+PCF_BIT_MASK = 1 << 3
+PCF_COMPRESSED_METRICS = 0x100
+PCF_ACCEL_W_INKBOUNDS = 0x100
+
+# Same layout as the ForkAwesome files shipped in fonts/ (and what adafruit_bitmap_font
+# expects): big-endian bytes, most significant bit first, rows padded to 4 bytes.
+OUTPUT_FORMAT = PCF_BYTE_MASK | PCF_BIT_MASK | 2
+
+
+class Glyph:
+    """One glyph: advance, bounding box and rows of bits (MSB is the leftmost pixel)"""
+
+    def __init__(self, codepoint, dwidth, width, height, x_offset, y_offset, rows, name=None):
+        self.codepoint = codepoint
+        self.dwidth = dwidth
+        self.width = width
+        self.height = height
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.rows = rows
+        self.name = name
+
+
+class Font:
+    """Font-wide metrics, properties and glyphs keyed by codepoint"""
+
+    def __init__(self, ascent, descent, properties=None, glyphs=None, default_char=None):
+        self.ascent = ascent
+        self.descent = descent
+        self.properties = properties or {}
+        self.glyphs = glyphs or {}
+        self.default_char = default_char
+
+    def subset(self, codepoints):
+        """Copy of the font holding only glyphs whose codepoint is in codepoints"""
+        glyphs = {cp: g for cp, g in self.glyphs.items() if cp in codepoints}
+        return Font(self.ascent, self.descent, dict(self.properties), glyphs, self.default_char)
+
+
+# --- BDF reading ---
+def read_bdf(path):
+    """Parse a text BDF file"""
+    properties = {}
+    glyphs = {}
+    ascent = descent = None
+    bbox = (0, 0, 0, 0)
+    with open(path, "r", encoding="latin-1") as bdf:
+        lines = iter(bdf.read().splitlines())
+    for line in lines:
+        keyword, _, rest = line.partition(" ")
+        if keyword == "FONTBOUNDINGBOX":
+            bbox = tuple(int(v) for v in rest.split())
+        elif keyword == "STARTPROPERTIES":
+            for prop in lines:
+                if prop.startswith("ENDPROPERTIES"):
+                    break
+                name, _, value = prop.partition(" ")
+                value = value.strip()
+                if value.startswith('"'):
+                    properties[name] = value[1:-1].replace('""', '"')
+                else:
+                    try:
+                        properties[name] = int(value)
+                    except ValueError:
+                        properties[name] = value
+        elif keyword == "STARTCHAR":
+            glyph = _read_bdf_glyph(rest.strip(), lines)
+            if glyph.codepoint >= 0:
+                glyphs[glyph.codepoint] = glyph
+    ascent = properties.get("FONT_ASCENT", bbox[1] + bbox[3])
+    descent = properties.get("FONT_DESCENT", -bbox[3])
+    return Font(ascent, descent, properties, glyphs, properties.get("DEFAULT_CHAR"))
+
+
+def _read_bdf_glyph(name, lines):
+    codepoint, dwidth, box = -1, 0, (0, 0, 0, 0)
+    rows = []
+    for line in lines:
+        keyword, _, rest = line.partition(" ")
+        if keyword == "ENCODING":
+            codepoint = int(rest.split()[0])
+        elif keyword == "DWIDTH":
+            dwidth = int(rest.split()[0])
+        elif keyword == "BBX":
+            box = tuple(int(v) for v in rest.split())
+        elif keyword == "BITMAP":
+            for row in lines:
+                if row.startswith("ENDCHAR"):
+                    break
+                row = row.strip()
+                rows.append(int(row, 16) >> (len(row) * 4 - box[0]) if box[0] else 0)
+            break
+    return Glyph(codepoint, dwidth, box[0], box[1], box[2], box[3], rows, name)
+
+
+# --- PCF reading ---
+def read_pcf(path):
+    """Parse a binary PCF file (any byte/bit order and padding)"""
+    with open(path, "rb") as pcf:
+        data = pcf.read()
+    if data[:4] != b"\x01fcp":
+        raise ValueError(f"{path} is not a PCF file")
+    (table_count,) = struct.unpack_from("<I", data, 4)
+    tables = {}
+    for i in range(table_count):
+        table_type, fmt, size, offset = struct.unpack_from("<4I", data, 8 + 16 * i)
+        tables[table_type] = (fmt, offset)
+
+    properties = _read_pcf_properties(data, *tables[PCF_PROPERTIES]) if PCF_PROPERTIES in tables else {}
+    metrics = _read_pcf_metrics(data, *tables[PCF_METRICS])
+    bitmaps = _read_pcf_bitmaps(data, metrics, *tables[PCF_BITMAPS])
+    encoding, default_char = _read_pcf_encodings(data, *tables[PCF_BDF_ENCODINGS])
+    names = _read_pcf_names(data, *tables[PCF_GLYPH_NAMES]) if PCF_GLYPH_NAMES in tables else {}
+    accel = tables.get(PCF_BDF_ACCELERATORS) or tables[PCF_ACCELERATORS]
+    ascent, descent = _read_pcf_accel(data, *accel)
+
+    glyphs = {}
+    for codepoint, index in encoding.items():
+        left, right, dwidth, glyph_ascent, glyph_descent = metrics[index]
+        glyphs[codepoint] = Glyph(codepoint, dwidth, right - left, glyph_ascent + glyph_descent, left,
+                                  -glyph_descent, bitmaps[index], names.get(index))
+    return Font(ascent, descent, properties, glyphs, default_char)
+
+
+def _order(fmt):
+    return ">" if fmt & PCF_BYTE_MASK else "<"
+
+
+def _read_pcf_properties(data, fmt, offset):
+    order = _order(fmt)
+    (count,) = struct.unpack_from(order + "i", data, offset + 4)
+    pos = offset + 8
+    raw = []
+    for _ in range(count):
+        raw.append(struct.unpack_from(order + "iBi", data, pos))
+        pos += 9
+    if count & 3:
+        pos += 4 - (count & 3)
+    (string_size,) = struct.unpack_from(order + "i", data, pos)
+    strings = data[pos + 4:pos + 4 + string_size]
+
+    def string_at(start):
+        return strings[start:strings.index(b"\0", start)].decode("latin-1")
+
+    return {string_at(name): string_at(value) if is_string else value for name, is_string, value in raw}
+
+
+def _read_pcf_metrics(data, fmt, offset):
+    order = _order(fmt)
+    metrics = []
+    if fmt & PCF_COMPRESSED_METRICS:
+        (count,) = struct.unpack_from(order + "h", data, offset + 4)
+        pos = offset + 6
+        for _ in range(count):
+            metrics.append(tuple(b - 0x80 for b in data[pos:pos + 5]))
+            pos += 5
+    else:
+        (count,) = struct.unpack_from(order + "i", data, offset + 4)
+        pos = offset + 8
+        for _ in range(count):
+            metrics.append(struct.unpack_from(order + "5h", data, pos))
+            pos += 12
+    return metrics
+
+
+def _read_pcf_bitmaps(data, metrics, fmt, offset):
+    order = _order(fmt)
+    pad = 1 << (fmt & PCF_GLYPH_PAD_MASK)
+    (count,) = struct.unpack_from(order + "i", data, offset + 4)
+    offsets = struct.unpack_from(order + f"{count}i", data, offset + 8)
+    start = offset + 8 + 4 * count + 16
+    msb_bit = fmt & PCF_BIT_MASK
+    glyph_rows = []
+    for index, glyph_offset in enumerate(offsets):
+        left, right, _, glyph_ascent, glyph_descent = metrics[index]
+        width, height = right - left, glyph_ascent + glyph_descent
+        stride = (width + pad * 8 - 1) // (pad * 8) * pad
+        pos = start + glyph_offset
+        rows = []
+        for _ in range(max(0, height)):
+            row_bytes = data[pos:pos + stride]
+            if not msb_bit:
+                row_bytes = bytes(int(f"{b:08b}"[::-1], 2) for b in row_bytes)
+            # Byte order only swaps bytes within each scan unit; scan unit 1 is all we need here
+            value = int.from_bytes(row_bytes, "big")
+            rows.append(value >> (stride * 8 - width) if width else 0)
+            pos += stride
+        glyph_rows.append(rows)
+    return glyph_rows
+
+
+def _read_pcf_encodings(data, fmt, offset):
+    order = _order(fmt)
+    min_byte2, max_byte2, min_byte1, max_byte1, default_char = struct.unpack_from(order + "4hH", data, offset + 4)
+    columns = max_byte2 - min_byte2 + 1
+    count = columns * (max_byte1 - min_byte1 + 1)
+    indices = struct.unpack_from(order + f"{count}H", data, offset + 14)
+    encoding = {}
+    for i, index in enumerate(indices):
+        if index != 0xFFFF:
+            encoding[((min_byte1 + i // columns) << 8) | (min_byte2 + i % columns)] = index
+    return encoding, default_char
+
+
+def _read_pcf_names(data, fmt, offset):
+    order = _order(fmt)
+    (count,) = struct.unpack_from(order + "i", data, offset + 4)
+    offsets = struct.unpack_from(order + f"{count}i", data, offset + 8)
+    strings_start = offset + 8 + 4 * count + 4
+    names = {}
+    for index, name_offset in enumerate(offsets):
+        start = strings_start + name_offset
+        names[index] = data[start:data.index(b"\0", start)].decode("latin-1")
+    return names
+
+
+def _read_pcf_accel(data, fmt, offset):
+    order = _order(fmt)
+    return struct.unpack_from(order + "ii", data, offset + 4 + 8)
+
+
+# --- PCF writing ---
+def _pack_properties(font):
+    props = dict(font.properties)
+    props["FONT_ASCENT"] = font.ascent
+    props["FONT_DESCENT"] = font.descent
+    strings = bytearray()
+    offsets = {}
+
+    def add_string(text):
+        if text not in offsets:
+            offsets[text] = len(strings)
+            strings.extend(text.encode("latin-1", "replace") + b"\0")
+        return offsets[text]
+
+    body = bytearray(struct.pack(">i", len(props)))
+    for name, value in props.items():
+        if isinstance(value, int):
+            body += struct.pack(">iBi", add_string(name), 0, value)
+        else:
+            body += struct.pack(">iBi", add_string(name), 1, add_string(str(value)))
+    if len(props) & 3:
+        body += bytes(4 - (len(props) & 3))
+    body += struct.pack(">i", len(strings)) + strings
+    return OUTPUT_FORMAT, bytes(body)
+
+
+def _glyph_metrics(glyph):
+    return (glyph.x_offset, glyph.x_offset + glyph.width, glyph.dwidth, glyph.y_offset + glyph.height,
+            -glyph.y_offset)
+
+
+def _pack_uncompressed_metric(metric):
+    return struct.pack(">5hH", *metric, 0)
+
+
+def _pack_accelerators(font, glyphs):
+    metrics = [_glyph_metrics(g) for g in glyphs] or [(0, 0, 0, 0, 0)]
+    minbounds = tuple(min(m[i] for m in metrics) for i in range(5))
+    maxbounds = tuple(max(m[i] for m in metrics) for i in range(5))
+    constant_width = int(len({m[2] for m in metrics}) == 1)
+    max_overlap = max(m[1] - m[2] for m in metrics)
+    flags = struct.pack(">8B", int(max_overlap <= 0), 0, 0, constant_width, 0, 0, 0, 0)
+    body = (flags + struct.pack(">iii", font.ascent, font.descent, max_overlap) +
+            _pack_uncompressed_metric(minbounds) + _pack_uncompressed_metric(maxbounds))
+    return OUTPUT_FORMAT, body
+
+
+def _pack_metrics(glyphs):
+    metrics = [_glyph_metrics(g) for g in glyphs]
+    if all(-128 <= v <= 127 for m in metrics for v in m):
+        body = bytearray(struct.pack(">h", len(metrics)))
+        for metric in metrics:
+            body += bytes(v + 0x80 for v in metric)
+        return OUTPUT_FORMAT | PCF_COMPRESSED_METRICS, bytes(body)
+    body = struct.pack(">i", len(metrics)) + b"".join(_pack_uncompressed_metric(m) for m in metrics)
+    return OUTPUT_FORMAT, body
+
+
+def _pack_bitmaps(glyphs):
+    offsets = []
+    data = bytearray()
+    for glyph in glyphs:
+        offsets.append(len(data))
+        stride = (glyph.width + 31) // 32 * 4
+        for row in glyph.rows:
+            data += (row << (stride * 8 - glyph.width)).to_bytes(stride, "big")
+    # bitmapSizes holds the data size for each of the 4 possible paddings; only ours is meaningful
+    sizes = [0, 0, len(data), 0]
+    body = struct.pack(f">i{len(glyphs)}i4i", len(glyphs), *offsets, *sizes) + data
+    return OUTPUT_FORMAT, body
+
+
+def _pack_encodings(font, glyphs):
+    codepoints = [g.codepoint for g in glyphs] or [0]
+    min_byte1, max_byte1 = min(cp >> 8 for cp in codepoints), max(cp >> 8 for cp in codepoints)
+    min_byte2, max_byte2 = min(cp & 0xFF for cp in codepoints), max(cp & 0xFF for cp in codepoints)
+    columns = max_byte2 - min_byte2 + 1
+    indices = [0xFFFF] * (columns * (max_byte1 - min_byte1 + 1))
+    for index, glyph in enumerate(glyphs):
+        indices[((glyph.codepoint >> 8) - min_byte1) * columns + (glyph.codepoint & 0xFF) - min_byte2] = index
+    default_char = font.default_char
+    if default_char not in font.glyphs:
+        default_char = 32 if 32 in font.glyphs else codepoints[0]
+    body = struct.pack(f">4hH{len(indices)}H", min_byte2, max_byte2, min_byte1, max_byte1, default_char, *indices)
+    return OUTPUT_FORMAT, body
+
+
+def write_pcf(font, path):
+    """Write font as a PCF file laid out for adafruit_bitmap_font; returns bytes written"""
+    glyphs = [font.glyphs[cp] for cp in sorted(font.glyphs)]
+    accelerators = _pack_accelerators(font, glyphs)
+    tables = [
+        (PCF_PROPERTIES, _pack_properties(font)),
+        (PCF_ACCELERATORS, accelerators),
+        (PCF_METRICS, _pack_metrics(glyphs)),
+        (PCF_BITMAPS, _pack_bitmaps(glyphs)),
+        (PCF_BDF_ENCODINGS, _pack_encodings(font, glyphs)),
+        (PCF_BDF_ACCELERATORS, accelerators),
+    ]
+    header = bytearray(b"\x01fcp" + struct.pack("<i", len(tables)))
+    offset = 8 + 16 * len(tables)
+    blobs = []
+    for table_type, (fmt, body) in tables:
+        blob = struct.pack("<i", fmt) + body
+        blob += bytes(-len(blob) % 4)
+        header += struct.pack("<4i", table_type, fmt, len(blob), offset)
+        offset += len(blob)
+        blobs.append(blob)
+    with open(path, "wb") as pcf:
+        pcf.write(header)
+        for blob in blobs:
+            pcf.write(blob)
+    return offset
+
+
+# --- Glyph selection ---
+def scan_strings(paths):
+    """Every character appearing in a string literal of the given Python files"""
+    chars = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as source:
+            tree = ast.parse(source.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                chars.update(node.value)
+    return chars
+
+
+def _is_private_use(codepoint):
+    return 0xE000 <= codepoint <= 0xF8FF
+
+
+def select_codepoints(font, codepoints):
+    """
+    Narrow codepoints to the kind of glyphs the font is for. Icon fonts (mostly Private
+    Use Area glyphs) drop plain text and text fonts drop icons, since a stray glyph at
+    the far end of the range bloats the PCF encoding table, which is indexed by a
+    (high byte, low byte) grid.
+    """
+    icons = sum(1 for cp in font.glyphs if _is_private_use(cp))
+    icon_font = icons * 2 > len(font.glyphs)
+    return {cp for cp in codepoints if _is_private_use(cp) == icon_font}
+
+
+def read_font(path):
+    """Load a BDF or PCF file based on its extension"""
+    return read_pcf(path) if path.lower().endswith(".pcf") else read_bdf(path)
+
+
+def time_parse(path, repeat=3):
+    """Best-of-n parse time in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read_font(path)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def compile_fonts(font_paths, out_dir, codepoints=None, repeat=3):
+    """Compile every font into out_dir, write manifest.json and return its entries"""
+    os.makedirs(out_dir, exist_ok=True)
+    entries = []
+    for path in font_paths:
+        font = read_font(path)
+        compact = font if codepoints is None else font.subset(select_codepoints(font, codepoints))
+        out_name = os.path.splitext(os.path.basename(path))[0] + ".pcf"
+        out_path = os.path.join(out_dir, out_name)
+        write_pcf(compact, out_path)
+        entries.append({
+            "source": os.path.relpath(path, REPO_DIR),
+            "output": os.path.relpath(out_path, REPO_DIR),
+            "glyphs_before": len(font.glyphs),
+            "glyphs_after": len(compact.glyphs),
+            "codepoints": sorted(compact.glyphs),
+            "bytes_before": os.path.getsize(path),
+            "bytes_after": os.path.getsize(out_path),
+            "parse_ms_before": round(time_parse(path, repeat), 2),
+            "parse_ms_after": round(time_parse(out_path, repeat), 2),
+        })
+    with open(os.path.join(out_dir, "manifest.json"), "w") as manifest:
+        json.dump({"subset": codepoints is not None, "fonts": entries}, manifest, indent=1)
+    return entries
+
+
+def print_report(entries):
+    print(f"{'font':28} {'glyphs':>11} {'bytes before':>13} {'bytes after':>12} {'parse ms':>17}")
+    for e in entries:
+        print(f"{os.path.basename(e['source']):28} {e['glyphs_before']:>5}->{e['glyphs_after']:<5} "
+              f"{e['bytes_before']:>13,} {e['bytes_after']:>12,} "
+              f"{e['parse_ms_before']:>8.1f}->{e['parse_ms_after']:<7.1f}")
+    before = sum(e["bytes_before"] for e in entries)
+    after = sum(e["bytes_after"] for e in entries)
+    print(f"Total {before:,} -> {after:,} bytes ({100 * after / max(1, before):.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subset and compile fonts/ to compact PCF")
+    parser.add_argument("fonts", nargs="*", help="font files (default: every .bdf/.pcf in fonts/)")
+    parser.add_argument("--out", default=os.path.join(REPO_DIR, "fonts", "compact"), help="output directory")
+    parser.add_argument("--scan", nargs="*", help="Python files to scan for strings (default: repo *.py)")
+    parser.add_argument("--text", default="", help="extra characters to keep")
+    parser.add_argument("--no-ascii", action="store_true", help="do not always keep printable ASCII")
+    parser.add_argument("--all-glyphs", action="store_true", help="keep every glyph, only convert")
+    parser.add_argument("--repeat", type=int, default=3, help="parse timing repetitions")
+    args = parser.parse_args()
+
+    font_paths = args.fonts or sorted(glob.glob(os.path.join(REPO_DIR, "fonts", "*.bdf")) +
+                                      glob.glob(os.path.join(REPO_DIR, "fonts", "*.pcf")))
+    codepoints = None
+    if not args.all_glyphs:
+        scan = args.scan if args.scan is not None else glob.glob(os.path.join(REPO_DIR, "*.py"))
+        chars = scan_strings(scan) | set(args.text)
+        if not args.no_ascii:
+            chars.update(chr(c) for c in range(32, 127))
+        codepoints = {ord(c) for c in chars}
+
+    entries = compile_fonts(font_paths, args.out, codepoints, args.repeat)
+    print_report(entries)
+    print(f"✅ Wrote {len(entries)} fonts and manifest.json to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
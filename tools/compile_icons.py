@@ -0,0 +1,149 @@
+# tools/compile_icons.py
+"""
+Build icon atlases (icon_atlas.py) for the ForkAwesome screen of big-ILI9341-demo.py.
+
+    python tools/compile_icons.py                         # icons/forkawesome-{24,32,42}.icn
+    python tools/compile_icons.py --sizes 32 --bench      # also compare with drawing labels
+
+Renders the icons of the demo's FORKAWESOME_ICONS from fonts/forkawesome-<size>.pcf
+into one 1-bit sprite sheet per size. Copy the output directory to /icons/ on the
+board; the demo then draws each icon from the largest atlas there, at the same spot
+as its label, instead of loading the font. Rebuild after changing FORKAWESOME_ICONS.
+
+--bench compares, per size, the demo's label approach (the font loaded through a cold
+font cache, one cached text Bitmap and TileGrid per icon) with loading the atlas and
+making a TileGrid per icon: simulated ms (host time; flash reads are not charged),
+displayio objects, size of the file each reads from, Python memory held on the host
+(tracemalloc), the bitmap bytes the board would hold, with bits packed as the board
+stores them (the label approach counts the glyphs the font cache keeps, not the rest
+of the font), and whether both draw the same pixels.
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+DEFAULT_SCRIPT = os.path.join(REPO_DIR, "big-ILI9341-demo.py")
+_ENTRY_OVERHEAD = 64
+
+
+def board_bytes(bitmap):
+    """RAM a Bitmap holds on the board: values packed into 32-bit aligned rows, plus object overhead"""
+    from scene_file import bits_per_value
+    return (bitmap.width * bits_per_value(bitmap.value_count) + 31) // 32 * 4 * bitmap.height + _ENTRY_OVERHEAD
+
+
+def _positions(icons):
+    """(char, color, x, y) of each icon at the demo's 75x53 pitch"""
+    for i, (char, color) in enumerate(icons):
+        row, col = i // 4, i % 4
+        yield char, color, 20 + col * 75, 48 + row * 47 + (6 * row if row else 0)
+
+
+def draw_labels(font_path, icons):
+    """The demo's label approach with cold caches; returns (group, board bytes)"""
+    import displayio
+    from font_cache import FontCache
+    from text_cache import TextCache
+    texts = TextCache(fonts=FontCache())
+    group = displayio.Group()
+    for char, color, x, y in _positions(icons):
+        group.append(texts.label(font_path, char, color, x=x, y=y))
+    return group, texts.bytes_resident + texts.fonts.bytes_resident
+
+
+def draw_atlas(path, icons):
+    """Load the atlas and place its icons as the demo does; returns (group, board bytes)"""
+    import displayio
+    import icon_atlas
+    atlas = icon_atlas.load(path)
+    group = displayio.Group()
+    for char, color, x, y in _positions(icons):
+        group.append(atlas.icon(char, color, x=x, y=y))
+    return group, board_bytes(atlas.bitmap)
+
+
+def pixels(group):
+    """Hash of a 320x240 panel showing group"""
+    import hashlib
+    from bench_camera import make_display
+    display, _ = make_display()
+    display.root_group = group
+    display.refresh()
+    with simenv.excluded():
+        return hashlib.sha1(bytes(display.panel.framebuffer.pixels)).hexdigest()
+
+
+def measure(function):
+    """(simulated ms, displayio objects, board bytes) of a run, then the Python memory it holds, traced"""
+    import displayio
+    gc.collect()
+    created = sum(displayio.created.values())
+    start = simenv.monotonic()
+    _, board = function()
+    ms = (simenv.monotonic() - start) * 1000
+    objects = sum(displayio.created.values()) - created
+    gc.collect()
+    tracemalloc.start()
+    with simenv.excluded():
+        before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    with simenv.excluded():
+        held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return ms, objects, board, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build ForkAwesome icon atlases for the demo")
+    parser.add_argument("--sizes", nargs="*", default=["24", "32", "42"])
+    parser.add_argument("--script", default=DEFAULT_SCRIPT)
+    parser.add_argument("--out", default=os.path.join(REPO_DIR, "icons"))
+    parser.add_argument("--bench", action="store_true", help="compare the atlas with drawing labels")
+    args = parser.parse_args()
+
+    import run
+    simenv.install_time()
+    simenv.install_files()
+    sys.path.insert(1, os.path.dirname(os.path.abspath(args.script)))
+    icons = run.load_script(args.script)["FORKAWESOME_ICONS"]
+    from adafruit_bitmap_font import bitmap_font
+    import icon_atlas
+
+    os.makedirs(args.out, exist_ok=True)
+    simenv.allow_host_writes(args.out)
+    built = []
+    for size in args.sizes:
+        font_path = f"/fonts/forkawesome-{size}.pcf"
+        atlas = icon_atlas.build(bitmap_font.load_font(font_path), [char for char, _ in icons])
+        path = os.path.join(args.out, f"forkawesome-{size}.icn")
+        count = icon_atlas.save(path, atlas)
+        print(f"✅ {size} px: {count} icons in {atlas.tile_width}x{atlas.tile_height} tiles, "
+              f"{os.path.getsize(path):,} bytes -> {path}")
+        built.append((size, font_path, path))
+    if not args.bench:
+        return
+
+    print(f"\n{'size':>4} {'ms':>15} {'objects':>9} {'file bytes':>19} {'host held bytes':>19} "
+          f"{'board bytes':>17} {'pixels':>7}   (labels -> atlas)")
+    sys.path.insert(2, os.path.dirname(os.path.abspath(__file__)))
+    for size, font_path, path in built:
+        labels = measure(lambda: draw_labels(font_path, icons))
+        atlas = measure(lambda: draw_atlas(path, icons))
+        font_bytes = os.path.getsize(simenv.device_path(font_path))
+        same = pixels(draw_labels(font_path, icons)[0]) == pixels(draw_atlas(path, icons)[0])
+        print(f"{size:>4} {f'{labels[0]:.1f} -> {atlas[0]:.1f}':>15} {f'{labels[1]} -> {atlas[1]}':>9} "
+              f"{f'{font_bytes:,} -> {os.path.getsize(path):,}':>19} {f'{labels[3]:,} -> {atlas[3]:,}':>19} "
+              f"{f'{labels[2]:,} -> {atlas[2]:,}':>17} {'same' if same else 'differ':>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# tools/compile_screens.py
+"""
+Precompile the static screens of big-ILI9341-demo.py into scene files (scene_file.py).
+
+    python tools/compile_screens.py                          # the static screens into scenes/
+    python tools/compile_screens.py --out build demo_color_bars
+    python tools/compile_screens.py --bench                  # also compare building with loading
+
+Each screen function runs once on the simulator in sim/ with show() replaced, so the
+Group it would have shown is captured and saved together with how long it is shown.
+Copy the output directory to /scenes/ on the board; the demo loads a screen's scene
+instead of building it when the file is there. Recompile after changing a screen.
+The splash screen is also rendered to splash.565, the raw RGB565 frame the three
+scripts stream onto the panel at boot (BOOT_SPLASH) before their heavy imports.
+
+--bench compares, per screen: simulated time to build it on the first cycle and again
+with the font, text and gradient caches warm, against loading its scene file; the
+displayio objects each creates (first build / warm build -> load; a warm build takes
+its text Bitmaps from the text cache, a load creates them from the file); the Python memory the finished screen holds; and
+whether both draw the same pixels.
+"""
+import argparse
+import gc
+import hashlib
+import os
+import sys
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIM_DIR = os.path.join(REPO_DIR, "sim")
+sys.path.insert(0, SIM_DIR)
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+DEFAULT_SCRIPT = os.path.join(REPO_DIR, "big-ILI9341-demo.py")
+SCREENS = ("demo_splash_screen", "demo_fonts_and_text", "demo_forkawesome_icons", "demo_color_bars")
+_FILTERS = [tracemalloc.Filter(False, os.path.join(SIM_DIR, "*")),
+            tracemalloc.Filter(False, os.path.join(REPO_DIR, "tools", "*")),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+
+
+def capture(module_globals, name):
+    """Run a screen function with show() replaced; returns the (group, seconds) it would have shown"""
+    shown = []
+    show, scene_dir = module_globals["show"], module_globals.get("SCENE_DIR")
+    module_globals["show"] = lambda group, seconds: shown.append((group, seconds))
+    module_globals["SCENE_DIR"] = None  # build the screen even if an old scene file exists
+    try:
+        module_globals[name]()
+    finally:
+        module_globals["show"], module_globals["SCENE_DIR"] = show, scene_dir
+    if len(shown) != 1:
+        raise SystemExit(f"{name} showed {len(shown)} screens; only screens shown once with show() can be compiled")
+    return shown[0]
+
+
+def _traced_bytes():
+    return sum(stat.size for stat in tracemalloc.take_snapshot().filter_traces(_FILTERS).statistics("filename"))
+
+
+def timed(function):
+    """(result, simulated ms, displayio objects created) of one run"""
+    import displayio
+    gc.collect()
+    created = sum(displayio.created.values())
+    start = simenv.monotonic()
+    result = function()
+    return result, (simenv.monotonic() - start) * 1000, sum(displayio.created.values()) - created
+
+
+def held_bytes(function):
+    """Python memory still allocated by a traced run while its result is alive (tracing slows the run down)"""
+    gc.collect()
+    tracemalloc.start()
+    with simenv.excluded():
+        before = _traced_bytes()
+    result = function()
+    with simenv.excluded():
+        held = _traced_bytes() - before
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def pixels(display, group):
+    """Hash of the panel after showing group"""
+    display.root_group = group
+    display.refresh()
+    with simenv.excluded():
+        return hashlib.sha1(bytes(display.panel.framebuffer.pixels)).hexdigest()
+
+
+def save_splash(display, group, path):
+    """Render group on the panel and write it as a raw RGB565 frame for image_stream.blit()"""
+    import struct
+    import image_stream
+    display.root_group = group
+    display.refresh()
+    framebuffer = display.panel.framebuffer
+    with open(path, "wb") as file:
+        file.write(image_stream.RAW_MAGIC + struct.pack("<HH", framebuffer.width, framebuffer.height))
+        for y in range(framebuffer.height):
+            row = [framebuffer.get(x, y) for x in range(framebuffer.width)]
+            file.write(struct.pack(f">{framebuffer.width}H", *row))
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile static demo screens into scene files")
+    parser.add_argument("screens", nargs="*", default=list(SCREENS))
+    parser.add_argument("--script", default=DEFAULT_SCRIPT)
+    parser.add_argument("--out", default=os.path.join(REPO_DIR, "scenes"))
+    parser.add_argument("--bench", action="store_true", help="compare building and loading each screen")
+    args = parser.parse_args()
+
+    import run
+    simenv.install_time()
+    simenv.install_files()
+    sys.path.insert(1, os.path.dirname(os.path.abspath(args.script)))
+    module_globals = run.load_script(args.script)
+    display = run.current_display()
+    import scene_file
+
+    os.makedirs(args.out, exist_ok=True)
+    simenv.allow_host_writes(args.out)
+    rows = []
+    for name in args.screens:
+        (group, seconds), cold_ms, cold_objects = timed(lambda: capture(module_globals, name))
+        path = os.path.join(args.out, name + ".scn")
+        count = scene_file.save(path, group, seconds)
+        print(f"✅ {name}: {count} objects, {os.path.getsize(path):,} bytes -> {path}")
+        rows.append((name, path, cold_ms, cold_objects))
+        if name == "demo_splash_screen":
+            splash_path = os.path.join(args.out, "splash.565")
+            print(f"✅ boot splash: {save_splash(display, group, splash_path):,} bytes -> {splash_path}")
+    if not args.bench:
+        return
+
+    print(f"\n{'screen':24} {'file bytes':>10} {'build ms':>9} {'warm ms':>8} {'load ms':>8} {'objects':>17} "
+          f"{'held bytes':>17} {'pixels':>7}")
+    pool = module_globals["shapes"]  # the demo loads scenes with its rect pool too
+    for name, path, cold_ms, cold_objects in rows:
+        (built, _), warm_ms, warm_objects = timed(lambda: capture(module_globals, name))
+        (loaded, _), load_ms, load_objects = timed(lambda: scene_file.load(path, pool=pool))
+        built_held = held_bytes(lambda: capture(module_globals, name))
+        loaded_held = held_bytes(lambda: scene_file.load(path, pool=pool))
+        same = pixels(display, built) == pixels(display, loaded)
+        print(f"{name:24} {os.path.getsize(path):>10,} {cold_ms:9.1f} {warm_ms:8.1f} {load_ms:8.1f} "
+              f"{f'{cold_objects}/{warm_objects} -> {load_objects}':>17} {f'{built_held:,} -> {loaded_held:,}':>17} "
+              f"{'same' if same else 'DIFFER':>7}")
+
+
+if __name__ == "__main__":
+    main()
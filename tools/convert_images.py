@@ -0,0 +1,444 @@
+# tools/convert_images.py
+"""
+Convert images into display-native assets for the ILI9341 demos.
+
+    python tools/convert_images.py photo.jpg --out assets/          # every format
+    python tools/convert_images.py photo.png --format raw565 bmp8 --dither
+    python tools/convert_images.py splash.png --format raw565 --rotation 180   # for the camera script
+    python tools/convert_images.py --report                         # campus.bmp in each format
+
+Each image is resized to 320x240 (--fit letterbox, fill crops, stretch), then written as:
+  raw565   <name>.565       big-endian RGB565 with an 8-byte header, the RGB565_SWAPPED layout
+                            the camera script uses; image_stream.blit() sends it unconverted
+                            (--rotation 180 stores it turned around for displays at rotation 180)
+  bmp16    <name>-16.bmp    16-bit 565 BMP (OnDiskBitmap and image_stream)
+  bmp8     <name>-8.bmp     256-colour palette BMP (OnDiskBitmap and image_stream)
+  bmp4     <name>-4.bmp     16-colour palette BMP (OnDiskBitmap and image_stream)
+  rle8     <name>-rle8.bmp  256-colour palette BMP with RLE8 compression (image_stream only)
+
+Palettes come from median cut over the image; --dither spreads the quantization
+error with Floyd-Steinberg. PIL is used to read any image format when it is
+installed; without it BMP and PNG files are read directly.
+
+--report converts campus.bmp into every format and compares file size with the
+time image_stream.blit() takes to draw each one on the simulator in sim/.
+"""
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+FORMATS = ("raw565", "bmp16", "bmp8", "bmp4", "rle8")
+SUFFIXES = {"raw565": ".565", "bmp16": "-16.bmp", "bmp8": "-8.bmp", "bmp4": "-4.bmp", "rle8": "-rle8.bmp"}
+
+
+class RGBImage:
+    """Width, height and a flat list of (r, g, b) tuples, top row first"""
+
+    def __init__(self, width, height, pixels):
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+
+
+# --- Readers ---
+def read_bmp(data):
+    offset, header_size = struct.unpack_from("<II", data, 10)
+    width, height, _, bpp, compression = struct.unpack_from("<iiHHI", data, 18)
+    if compression not in (0, 3) or bpp not in (1, 4, 8, 16, 24, 32):
+        raise ValueError(f"Unsupported BMP: {bpp} bits, compression {compression}")
+    stride = (width * bpp + 31) // 32 * 4
+    palette = []
+    if bpp <= 8:
+        count = struct.unpack_from("<I", data, 46)[0] or (1 << bpp)
+        for i in range(count):
+            b, g, r = data[14 + header_size + 4 * i:14 + header_size + 4 * i + 3]
+            palette.append((r, g, b))
+    rows = abs(height)
+    pixels = []
+    for y in range(rows):
+        row = offset + (rows - 1 - y if height > 0 else y) * stride
+        for x in range(width):
+            if bpp <= 8:
+                bit = x * bpp
+                pixels.append(palette[(data[row + bit // 8] >> (8 - bpp - bit % 8)) & ((1 << bpp) - 1)])
+            elif bpp == 16:
+                value = data[row + 2 * x] | (data[row + 2 * x + 1] << 8)
+                if compression != 3:
+                    value = ((value & 0x7FE0) << 1) | (value & 0x1F)
+                r, g, b = value >> 11, (value >> 5) & 0x3F, value & 0x1F
+                pixels.append(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)))
+            else:
+                b, g, r = data[row + bpp // 8 * x:row + bpp // 8 * x + 3]
+                pixels.append((r, g, b))
+    return RGBImage(width, rows, pixels)
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def read_png(data):
+    """8-bit, non-interlaced PNG (grayscale, RGB, palette, with or without alpha)"""
+    pos = 8
+    header = palette = None
+    idat = b""
+    while pos < len(data):
+        length, kind = struct.unpack_from(">I4s", data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = [tuple(body[i:i + 3]) for i in range(0, len(body), 3)]
+        elif kind == b"IDAT":
+            idat += body
+        elif kind == b"IEND":
+            break
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or interlace:
+        raise ValueError("Only 8-bit non-interlaced PNG files are supported without PIL")
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    raw = zlib.decompress(idat)
+    stride = width * channels
+    previous = bytearray(stride)
+    pixels = []
+    for y in range(height):
+        start = y * (stride + 1)
+        kind, line = raw[start], bytearray(raw[start + 1:start + 1 + stride])
+        for i in range(stride):
+            left = line[i - channels] if i >= channels else 0
+            up = previous[i]
+            if kind == 1:
+                line[i] = (line[i] + left) & 0xFF
+            elif kind == 2:
+                line[i] = (line[i] + up) & 0xFF
+            elif kind == 3:
+                line[i] = (line[i] + ((left + up) >> 1)) & 0xFF
+            elif kind == 4:
+                line[i] = (line[i] + _paeth(left, up, previous[i - channels] if i >= channels else 0)) & 0xFF
+        for x in range(width):
+            px = line[x * channels:(x + 1) * channels]
+            if color_type == 3:
+                pixels.append(palette[px[0]])
+            elif color_type in (0, 4):
+                pixels.append((px[0], px[0], px[0]))
+            else:
+                pixels.append((px[0], px[1], px[2]))
+        previous = line
+    return RGBImage(width, height, pixels)
+
+
+def load_image(path):
+    if Image is not None:
+        with Image.open(path) as image:
+            image = image.convert("RGB")
+            return RGBImage(image.width, image.height, list(image.getdata()))
+    with open(path, "rb") as image_file:
+        data = image_file.read()
+    if data[:2] == b"BM":
+        return read_bmp(data)
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return read_png(data)
+    raise ValueError(f"{path}: only BMP and PNG can be read without PIL (pip install pillow)")
+
+
+# --- Resizing ---
+def resize(image, width=320, height=240, fit="letterbox", background=(0, 0, 0)):
+    """Box-filter resize to width x height; letterbox keeps the aspect ratio, fill crops, stretch distorts"""
+    if (image.width, image.height) == (width, height):
+        return image
+    scale_x, scale_y = width / image.width, height / image.height
+    if fit == "letterbox":
+        scale_x = scale_y = min(scale_x, scale_y)
+    elif fit == "fill":
+        scale_x = scale_y = max(scale_x, scale_y)
+    out_w, out_h = round(image.width * scale_x), round(image.height * scale_y)
+    left, top = (width - out_w) // 2, (height - out_h) // 2
+    src = image.pixels
+    pixels = [background] * (width * height)
+    for y in range(max(0, top), min(height, top + out_h)):
+        sy1 = (y - top) / scale_y
+        sy2 = max(sy1 + 1, (y - top + 1) / scale_y) if scale_y < 1 else sy1 + 1
+        rows = range(int(sy1), min(image.height, max(int(sy1) + 1, int(sy2))))
+        for x in range(max(0, left), min(width, left + out_w)):
+            sx1 = (x - left) / scale_x
+            sx2 = (x - left + 1) / scale_x if scale_x < 1 else sx1 + 1
+            cols = range(int(sx1), min(image.width, max(int(sx1) + 1, int(sx2))))
+            r = g = b = 0
+            for sy in rows:
+                base = sy * image.width
+                for sx in cols:
+                    pr, pg, pb = src[base + sx]
+                    r += pr
+                    g += pg
+                    b += pb
+            count = len(rows) * len(cols)
+            pixels[y * width + x] = (r // count, g // count, b // count)
+    return RGBImage(width, height, pixels)
+
+
+# --- Quantizing ---
+def median_cut(pixels, colors):
+    """Palette of up to `colors` (r, g, b) from median cut over a 5-6-5 histogram"""
+    histogram = {}
+    for r, g, b in pixels:
+        key = (r >> 3, g >> 2, b >> 3)
+        histogram[key] = histogram.get(key, 0) + 1
+    boxes = [list(histogram.items())]
+    while len(boxes) < colors:
+        best = None
+        for i, box in enumerate(boxes):
+            if len(box) < 2:
+                continue
+            ranges = [max(c[0][k] for c in box) - min(c[0][k] for c in box) for k in range(3)]
+            axis = ranges.index(max(ranges))
+            weight = max(ranges) * sum(count for _, count in box)
+            if best is None or weight > best[0]:
+                best = (weight, i, axis)
+        if best is None:
+            break
+        _, i, axis = best
+        box = sorted(boxes.pop(i), key=lambda c: c[0][axis])
+        total = sum(count for _, count in box)
+        running = 0
+        for split, (_, count) in enumerate(box):
+            running += count
+            if running * 2 >= total:
+                break
+        split = max(1, min(len(box) - 1, split + 1))
+        boxes += [box[:split], box[split:]]
+    palette = []
+    for box in boxes:
+        total = sum(count for _, count in box)
+        r = sum(key[0] * count for key, count in box) * 255 // (31 * total)
+        g = sum(key[1] * count for key, count in box) * 255 // (63 * total)
+        b = sum(key[2] * count for key, count in box) * 255 // (31 * total)
+        palette.append((r, g, b))
+    return palette
+
+
+class _Nearest:
+    """Nearest palette entry, cached per 5-6-5 colour"""
+
+    def __init__(self, palette):
+        self.palette = palette
+        self.cache = {}
+
+    def __call__(self, r, g, b):
+        key = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+        index = self.cache.get(key)
+        if index is None:
+            best = None
+            for i, (pr, pg, pb) in enumerate(self.palette):
+                distance = 2 * (r - pr) ** 2 + 4 * (g - pg) ** 2 + 3 * (b - pb) ** 2
+                if best is None or distance < best:
+                    best, index = distance, i
+            self.cache[key] = index
+        return index
+
+
+def quantize(image, colors=256, dither=False):
+    """(palette, indices) for the image; dither spreads the error with Floyd-Steinberg"""
+    palette = median_cut(image.pixels, colors)
+    nearest = _Nearest(palette)
+    width, height = image.width, image.height
+    if not dither:
+        return palette, [nearest(*pixel) for pixel in image.pixels]
+    work = [list(pixel) for pixel in image.pixels]
+    indices = [0] * (width * height)
+    for y in range(height):
+        for x in range(width):
+            i = y * width + x
+            r, g, b = (min(255, max(0, int(v))) for v in work[i])
+            index = nearest(r, g, b)
+            indices[i] = index
+            pr, pg, pb = palette[index]
+            error = (r - pr, g - pg, b - pb)
+            for dx, dy, share in ((1, 0, 7), (-1, 1, 3), (0, 1, 5), (1, 1, 1)):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and ny < height:
+                    target = work[ny * width + nx]
+                    for k in range(3):
+                        target[k] += error[k] * share / 16
+    return palette, indices
+
+
+# --- Writers ---
+def _rgb565(r, g, b):
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def encode_raw565(image, rotation=0):
+    out = bytearray((b"R180" if rotation == 180 else b"R565") + struct.pack("<HH", image.width, image.height))
+    for r, g, b in (image.pixels[::-1] if rotation == 180 else image.pixels):
+        out += struct.pack(">H", _rgb565(r, g, b))
+    return bytes(out)
+
+
+def _bmp(width, height, bpp, pixel_data, palette=(), compression=0, masks=None):
+    extra = struct.pack("<III", *masks) if masks else b""
+    colors = b"".join(struct.pack("<BBBB", b, g, r, 0) for r, g, b in palette)
+    offset = 14 + 40 + len(extra) + len(colors)
+    info = struct.pack("<IiiHHIIiiII", 40, width, height, 1, bpp, compression, len(pixel_data), 2835, 2835,
+                       len(palette), 0)
+    return b"BM" + struct.pack("<IHHI", offset + len(pixel_data), 0, 0, offset) + info + extra + colors + pixel_data
+
+
+def encode_bmp16(image):
+    stride = (image.width * 16 + 31) // 32 * 4
+    data = bytearray()
+    for y in range(image.height - 1, -1, -1):
+        row = bytearray(stride)
+        for x, (r, g, b) in enumerate(image.pixels[y * image.width:(y + 1) * image.width]):
+            struct.pack_into("<H", row, 2 * x, _rgb565(r, g, b))
+        data += row
+    return _bmp(image.width, image.height, 16, bytes(data), compression=3, masks=(0xF800, 0x07E0, 0x001F))
+
+
+def encode_palettized(image, palette, indices, bpp):
+    stride = (image.width * bpp + 31) // 32 * 4
+    data = bytearray()
+    for y in range(image.height - 1, -1, -1):
+        row = bytearray(stride)
+        for x in range(image.width):
+            bit = x * bpp
+            row[bit // 8] |= indices[y * image.width + x] << (8 - bpp - bit % 8)
+        data += row
+    return _bmp(image.width, image.height, bpp, bytes(data), palette)
+
+
+def encode_rle8(image, palette, indices):
+    """BMP RLE8: runs of 3 or more as (count, index), the rest as absolute runs"""
+    width = image.width
+    data = bytearray()
+    for y in range(image.height - 1, -1, -1):
+        row = indices[y * width:(y + 1) * width]
+        x = 0
+        literal = []
+        while x < width:
+            run = 1
+            while x + run < width and run < 255 and row[x + run] == row[x]:
+                run += 1
+            if run >= 3:
+                _flush_literal(data, literal)
+                data += bytes((run, row[x]))
+                x += run
+            else:
+                literal.append(row[x])
+                x += 1
+                if len(literal) == 255:
+                    _flush_literal(data, literal)
+        _flush_literal(data, literal)
+        data += b"\x00\x00"  # end of line
+    data += b"\x00\x01"  # end of bitmap
+    return _bmp(width, image.height, 8, bytes(data), palette, compression=1)
+
+
+def _flush_literal(data, literal):
+    if len(literal) >= 3:
+        data += bytes((0, len(literal))) + bytes(literal) + (b"\x00" if len(literal) & 1 else b"")
+    else:
+        for index in literal:
+            data += bytes((1, index))
+    literal.clear()
+
+
+def convert(image, formats, colors=256, dither=False, rotation=0):
+    """{format: file bytes} for the 320x240 image"""
+    outputs = {}
+    quantized = {}
+    for fmt in formats:
+        if fmt == "raw565":
+            outputs[fmt] = encode_raw565(image, rotation)
+        elif fmt == "bmp16":
+            outputs[fmt] = encode_bmp16(image)
+        else:
+            count = 16 if fmt == "bmp4" else min(colors, 256)
+            if count not in quantized:
+                quantized[count] = quantize(image, count, dither)
+            palette, indices = quantized[count]
+            if fmt == "rle8":
+                outputs[fmt] = encode_rle8(image, palette, indices)
+            else:
+                outputs[fmt] = encode_palettized(image, palette, indices, 4 if fmt == "bmp4" else 8)
+    return outputs
+
+
+def write_outputs(path, outputs, out_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    written = []
+    for fmt, data in outputs.items():
+        target = os.path.join(out_dir, name + SUFFIXES[fmt])
+        with open(target, "wb") as out:
+            out.write(data)
+        written.append((fmt, target, len(data)))
+    return written
+
+
+def report(path, band_rows=8, dither=True):
+    """Convert path into every format and time image_stream.blit() of each on the simulator"""
+    sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+    sys.path.insert(0, os.path.join(REPO_DIR, "tools"))
+    import simenv
+    import bench_images
+    simenv.install_time()
+    simenv.install_files()
+    start = time.perf_counter()
+    outputs = convert(resize(load_image(path)), FORMATS, dither=dither)
+    print(f"Converted {os.path.basename(path)} in {time.perf_counter() - start:.1f} s")
+    print(f"{'format':12} {'file bytes':>11} {'blit ms':>8} {'peak RAM':>9} {'OnDiskBitmap':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        simenv.allow_host_writes(tmp)
+        runs = [("bmp24", path)] + [(fmt, target) for fmt, target, _ in write_outputs(path, outputs, tmp)]
+        for fmt, target in runs:
+            r = bench_images.measure("stream", target, band_rows)
+            ondisk = "yes" if fmt not in ("raw565", "rle8") else "no"
+            print(f"{fmt:12} {r['file_bytes']:>11,} {r['ms']:8.1f} {r['peak_ram']:>9,} {ondisk:>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert images to display-native RGB565/palettized assets")
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--out", default=".", help="output directory")
+    parser.add_argument("--format", nargs="+", default=list(FORMATS), choices=FORMATS)
+    parser.add_argument("--colors", type=int, default=256, help="palette size for bmp8/rle8")
+    parser.add_argument("--dither", action="store_true", help="Floyd-Steinberg dithering for palettized formats")
+    parser.add_argument("--fit", default="letterbox", choices=("letterbox", "fill", "stretch"))
+    parser.add_argument("--size", default="320x240", help="output size, WIDTHxHEIGHT")
+    parser.add_argument("--rotation", type=int, default=0, choices=(0, 180), help="display rotation for raw565")
+    parser.add_argument("--report", action="store_true", help="compare every format for campus.bmp (or images)")
+    args = parser.parse_args()
+
+    if args.report:
+        for path in args.images or [os.path.join(REPO_DIR, "campus.bmp")]:
+            report(path)
+        return
+    if not args.images:
+        parser.error("no images given")
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    os.makedirs(args.out, exist_ok=True)
+    for path in args.images:
+        image = resize(load_image(path), width, height, args.fit)
+        outputs = convert(image, args.format, args.colors, args.dither, args.rotation)
+        for fmt, target, size in write_outputs(path, outputs, args.out):
+            print(f"✅ {fmt:7} {target} ({size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
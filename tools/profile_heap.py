@@ -0,0 +1,49 @@
+# tools/profile_heap.py
+"""
+Print the demo's heap profile (heap_profiler.py) from the simulator in sim/.
+
+    python tools/profile_heap.py
+    python tools/profile_heap.py --cycles 2 --no-collect
+
+Runs every demo of big-ILI9341-demo.py with its HeapProfiler switched on, as
+PROFILE_HEAP = True does on the board, and prints the table after each cycle. On the
+host the profiler measures with tracemalloc (simulated Bitmap buffers included) and
+counts displayio objects with the simulator's constructor counter.
+"""
+import argparse
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "sim"))
+sys.path.insert(1, REPO_DIR)
+
+import simenv  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heap profile of the demo's functions on the simulator")
+    parser.add_argument("--script", default=os.path.join(REPO_DIR, "big-ILI9341-demo.py"))
+    parser.add_argument("--cycles", type=int, default=1)
+    parser.add_argument("--no-collect", action="store_true", help="skip gc.collect() around profiled calls")
+    args = parser.parse_args()
+
+    import run
+    simenv.install_time()
+    simenv.install_files()
+    sys.path.insert(1, os.path.dirname(os.path.abspath(args.script)))
+    module_globals = run.load_script(args.script)
+    heap = module_globals["heap"]
+    heap.enabled = True
+    heap.collect = not args.no_collect
+    for cycle in range(args.cycles):
+        for name in run.demo_functions(module_globals):
+            with heap.measure(name):
+                module_globals[name]()
+        print(f"--- cycle {cycle}")
+        heap.print_table()
+        heap.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# turtle_batch.py
+"""
+Batched turtle graphics: the adafruit_turtle calls the demo uses, drawn for speed.
+
+adafruit_turtle steps every line in Python, one Bitmap pixel at a time, while auto
+refresh pushes the screen out in the background. BatchTurtle draws each line with one
+bitmaptools.draw_line() call (integer Bresenham in C) into a single 4-bit canvas and
+turns auto refresh off: nothing is sent until flush(), or every refresh_interval
+seconds if one is given, and then displayio sends only the union of the areas drawn
+since the last refresh.
+
+Turns by the same angle reuse one precomputed rotation (cos, sin), so a pattern of
+fixed turns computes its trig once per distinct angle instead of once per line.
+Lines are 1 pixel wide (wider pens draw parallel lines), without anti-aliasing: the
+canvas is palettized, so there is nothing to blend into.
+
+    pen = BatchTurtle(display)
+    pen.pencolor(Color.RED)
+    for _ in range(6):
+        pen.forward(50)
+        pen.right(60)
+    pen.flush()
+"""
+import math
+import time
+import displayio
+import bitmaptools
+
+
+class Color:
+    """Same constants as adafruit_turtle.Color"""
+    WHITE = 0xFFFFFF
+    BLACK = 0x000000
+    RED = 0xFF0000
+    ORANGE = 0xFFA500
+    YELLOW = 0xFFEE00
+    GREEN = 0x00C000
+    BLUE = 0x0000FF
+    PURPLE = 0x8040C0
+    PINK = 0xFF40C0
+    LIGHT_GRAY = 0xAAAAAA
+    GRAY = 0x444444
+    BROWN = 0xCA801D
+    DARK_GREEN = 0x008700
+    TURQUOISE = 0x00C0C0
+    DARK_BLUE = 0x0000AA
+    DARK_RED = 0x800000
+
+    colors = (BLACK, WHITE, RED, YELLOW, GREEN, ORANGE, BLUE, PURPLE, PINK, GRAY, LIGHT_GRAY, BROWN, DARK_GREEN,
+              TURQUOISE, DARK_BLUE, DARK_RED)
+
+
+_rotations = {}  # turn angle in degrees -> (cos, sin), shared by every BatchTurtle
+
+
+def _rotation(angle):
+    rotation = _rotations.get(angle)
+    if rotation is None:
+        radians = math.radians(angle)
+        rotation = _rotations[angle] = (math.cos(radians), math.sin(radians))
+    return rotation
+
+
+class BatchTurtle:
+    """Turtle that draws whole lines into one canvas and refreshes in batches; 15 pen colors"""
+
+    def __init__(self, display, refresh_interval=None, colors=16):
+        self.display = display
+        self.refresh_interval = refresh_interval
+        self.lines = 0
+        self.refreshes = 0
+        self._width, self._height = display.width, display.height
+        self._x, self._y = 0.0, 0.0  # turtle coordinates: origin in the center, y up
+        self._heading = 0.0
+        self._dx, self._dy = 1.0, 0.0  # unit vector of the heading
+        self._down = True
+        self._pensize = 1
+        self._palette = displayio.Palette(colors)
+        self._palette[0] = Color.BLACK  # background
+        self._color_index = {}  # pen color -> palette index
+        self._pen = self._index(Color.WHITE)
+        self._canvas = displayio.Bitmap(self._width, self._height, colors)
+        self._group = displayio.Group()
+        self._group.append(displayio.TileGrid(self._canvas, pixel_shader=self._palette))
+        self._last_refresh = time.monotonic()
+        display.auto_refresh = False
+        display.root_group = self._group
+
+    def _index(self, color):
+        index = self._color_index.get(color)
+        if index is None:
+            index = len(self._color_index) + 1
+            if index >= len(self._palette):
+                raise ValueError(f"BatchTurtle has room for {len(self._palette) - 1} pen colors")
+            self._palette[index] = color
+            self._color_index[color] = index
+        return index
+
+    def _line(self, x0, y0, x1, y1):
+        """Draw from turtle coordinates (x0, y0) to (x1, y1)"""
+        cx, cy = self._width // 2, self._height // 2
+        sx0, sy0, sx1, sy1 = int(cx + x0), int(cy - y0), int(cx + x1), int(cy - y1)
+        if self._pensize == 1:
+            bitmaptools.draw_line(self._canvas, sx0, sy0, sx1, sy1, self._pen)
+        else:
+            # Parallel lines across the minor axis
+            steep = abs(sy1 - sy0) > abs(sx1 - sx0)
+            for offset in range(-(self._pensize // 2), (self._pensize + 1) // 2):
+                ox, oy = (offset, 0) if steep else (0, offset)
+                bitmaptools.draw_line(self._canvas, sx0 + ox, sy0 + oy, sx1 + ox, sy1 + oy, self._pen)
+        self.lines += 1
+        if self.refresh_interval is not None and time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.flush()
+
+    def flush(self):
+        """Send everything drawn since the last refresh in one refresh"""
+        self.display.refresh(minimum_frames_per_second=0)
+        self.refreshes += 1
+        self._last_refresh = time.monotonic()
+
+    def goto(self, x, y=None):
+        if y is None:
+            x, y = x
+        if self._down:
+            self._line(self._x, self._y, x, y)
+        self._x, self._y = x, y
+
+    setpos = setposition = goto
+
+    def forward(self, distance):
+        self.goto(self._x + self._dx * distance, self._y + self._dy * distance)
+
+    fd = forward
+
+    def backward(self, distance):
+        self.forward(-distance)
+
+    bk = back = backward
+
+    def left(self, angle):
+        cos, sin = _rotation(angle)
+        self._dx, self._dy = self._dx * cos - self._dy * sin, self._dx * sin + self._dy * cos
+        self._heading = (self._heading + angle) % 360
+
+    lt = left
+
+    def right(self, angle):
+        self.left(-angle)
+
+    rt = right
+
+    def setheading(self, to_angle):
+        self._heading = to_angle % 360
+        self._dx, self._dy = _rotation(self._heading)
+
+    seth = setheading
+
+    def heading(self):
+        return self._heading
+
+    def pos(self):
+        return self._x, self._y
+
+    position = pos
+
+    def penup(self):
+        self._down = False
+
+    pu = up = penup
+
+    def pendown(self):
+        self._down = True
+
+    pd = down = pendown
+
+    def isdown(self):
+        return self._down
+
+    def pensize(self, width=None):
+        if width is not None:
+            self._pensize = max(1, int(width))
+        return self._pensize
+
+    width = pensize
+
+    def pencolor(self, color=None):
+        if color is None:
+            return self._palette[self._pen]
+        self._pen = self._index(color)
+
+    def bgcolor(self, color=None):
+        if color is None:
+            return self._palette[0]
+        self._palette[0] = color
+
+    def speed(self, speed=None):
+        """Accepted for adafruit_turtle compatibility; drawing is always as fast as it goes"""
+        return 0
+
+    def clear(self):
+        self._canvas.fill(0)